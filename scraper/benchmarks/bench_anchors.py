@@ -0,0 +1,89 @@
+"""多数のモデルを載せたページでの抽出: モデルごとのアンカー走査 vs 1 回の一括走査。
+
+OpenAI の仕様（specs/openai.toml のパターンテンプレート）で 100 超のモデルを
+作り、それらの価格表を含む合成ページから全モデルの入力・出力価格を抽出する。
+可視テキスト化と埋め込み JSON の索引化は計測前に済ませる。
+ページサイズを変えて、所要時間がモデル数 × ページサイズではなく
+ページサイズに比例して増えることを確認する。
+
+Usage:
+    cd scraper && uv run python benchmarks/bench_anchors.py [--models 120] [--mb 1]
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import time
+
+from scraper import engine
+from scraper.browser import PageText, expect_anchors, extract_price
+
+
+def _model_names(count: int) -> list[str]:
+    names = [
+        f"GPT-{major}.{minor} {suffix}".strip()
+        for major in range(3, 30)
+        for minor in range(10)
+        for suffix in ("", "mini", "nano", "pro")
+    ]
+    return names[:count]
+
+
+def _models(count: int) -> tuple[engine.ModelSpec, ...]:
+    doc = engine._read_doc("openai")
+    doc["models"] = [{"name": name, "price": [1.0, 2.0]} for name in _model_names(count)]
+    return engine._parse_models(doc)
+
+
+def _synthetic_page(names: list[str], size_mb: float, seed: int = 0) -> str:
+    """各モデルの価格行が散在する料金ページを作る。"""
+    rng = random.Random(seed)
+    filler = "<div class='row'><span>lorem ipsum dolor sit amet</span></div>\n"
+    chunks: list[str] = []
+    size = 0
+    while size < size_mb * 1_000_000:
+        if rng.random() < 0.02:
+            chunk = (f"<tr><td>{rng.choice(names)}</td><td>$1.25 / 1M tokens input</td>"
+                     "<td>output $10.00</td></tr>\n")
+        else:
+            chunk = filler
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks)
+
+
+def _run(html: str, models: tuple[engine.ModelSpec, ...], batched: bool) -> tuple[float, int]:
+    page = PageText(html, "bench://openai")
+    page.visible, page.structured  # 抽出以外の前処理は計測から外す
+    start = time.perf_counter()
+    if batched:
+        expect_anchors(page, [m.anchor for m in models])
+    found = 0
+    for m in models:
+        for field in ("input", "output"):
+            found += extract_price(
+                page, m.patterns[field], anchor=m.anchor, model=m.name, field=field,
+            ) is not None
+    return time.perf_counter() - start, found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", type=int, default=120, help="モデル数")
+    parser.add_argument("--mb", type=float, default=1.0, help="ページサイズ (MB)")
+    args = parser.parse_args()
+
+    models = _models(args.models)
+    names = [m.name for m in models]
+    print(f"models: {len(models)}")
+    print(f"{'page':>7}  {'モデルごと':>10}  {'一括走査':>10}")
+    for size_mb in (args.mb / 4, args.mb / 2, args.mb):
+        html = _synthetic_page(names, size_mb)
+        t_each, found_each = _run(html, models, batched=False)
+        t_once, found_once = _run(html, models, batched=True)
+        assert found_each == found_once, (found_each, found_once)
+        print(f"{len(html) / 1e6:5.2f}MB  {t_each * 1000:8.1f} ms  {t_once * 1000:8.1f} ms"
+              f"  (x{t_each / t_once:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""AWS Bedrock の価格参照: モデルごとの全 SKU 走査 vs SKU 索引。
+
+50k SKU の合成オファー（パース済み）に対し、従来の
+「モデル数 × 全 products × キーワード」の走査と、1 回の走査で作る
+_SkuIndex からの参照の所要時間を、対象モデル数を変えて比較する。
+
+Usage:
+    cd scraper && uv run python benchmarks/bench_aws_index.py [--skus 50000] [--models 2 20 80]
+"""
+
+from __future__ import annotations
+import argparse
+import time
+from typing import Any
+
+from scraper.providers import aws
+
+_REGIONS = ("USE1", "USW2", "EUC1", "APN1")
+
+
+def _synthetic_offer(n_skus: int, n_families: int = 200) -> dict[str, Any]:
+    products: dict[str, Any] = {}
+    on_demand: dict[str, Any] = {}
+    for i in range(n_skus):
+        sku = f"SKU{i:08d}"
+        family = i % n_families
+        direction = "input" if i % 2 else "output"
+        products[sku] = {"sku": sku, "attributes": {
+            "model": f"Model {family}",
+            "modelId": f"vendor.model-{family}-v1",
+            "usagetype": f"{_REGIONS[i // 2 % len(_REGIONS)]}-Model{family}-{direction}-tokens",
+        }}
+        on_demand[sku] = {f"{sku}.T": {"priceDimensions": {f"{sku}.T.D": {
+            "description": f"$0.001 per 1K {direction} tokens",
+            "pricePerUnit": {"USD": "0.0010000000"},
+        }}}}
+    return {"products": products, "terms": {"OnDemand": on_demand}}
+
+
+def _legacy(offer: dict[str, Any], keywords: dict[str, list[str]]) -> dict[str, list[aws._PriceDim]]:
+    """従来の走査: モデルごとに全 products を小文字化してキーワード照合する。"""
+    products = offer["products"]
+    terms = offer["terms"]["OnDemand"]
+    result: dict[str, list[aws._PriceDim]] = {}
+    for model_name, kws in keywords.items():
+        rows: list[aws._PriceDim] = []
+        for sku, product in products.items():
+            attrs = product.get("attributes", {})
+            desc = attrs.get("modelId", "") + " " + attrs.get("model", "")
+            if not any(kw.lower() in desc.lower() for kw in kws):
+                continue
+            usage_type = attrs.get("usagetype", "").lower()
+            for term in terms.get(sku, {}).values():
+                for pd in term.get("priceDimensions", {}).values():
+                    rows.append(aws._PriceDim(
+                        usage_type, pd.get("description", "").lower(),
+                        float(pd["pricePerUnit"]["USD"]),
+                    ))
+        result[model_name] = rows
+    return result
+
+
+def _indexed(offer: dict[str, Any], keywords: dict[str, list[str]]) -> dict[str, list[aws._PriceDim]]:
+    index = aws._SkuIndex(keywords)
+    for sku, product in offer["products"].items():
+        index.add_product(sku, product)
+    for sku, sku_terms in offer["terms"]["OnDemand"].items():
+        index.add_terms(sku, sku_terms)
+    return {model: index.prices(model) for model in keywords}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=50_000)
+    parser.add_argument("--models", type=int, nargs="+", default=[2, 20, 80])
+    args = parser.parse_args()
+
+    offer = _synthetic_offer(args.skus)
+    print(f"offer: {args.skus} SKU")
+    for n in args.models:
+        keywords = {f"Model {i}": [f"Model {i} ", f"vendor.model-{i}-"] for i in range(n)}
+        timings = []
+        for fn in (_legacy, _indexed):
+            start = time.perf_counter()
+            rows = fn(offer, keywords)
+            timings.append(time.perf_counter() - start)
+        assert sum(map(len, rows.values())) == n * args.skus // 200
+        print(f"models {n:4d}: 全 SKU 走査 {timings[0] * 1000:9.1f} ms / 索引 {timings[1] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""AWS Bedrock オファーファイルのパース: 全体 json.loads vs ストリーム処理。
+
+実物に近い構造の合成オファーファイルを作り、チャンク列として与えたときの
+ピークメモリ（tracemalloc）と所要時間を比較する。チャンク列自体は
+計測前に用意するので、どちらの値にも含まれない（実際の取得では
+ダウンロード全体をメモリに持たない分、差はさらに大きい）。
+
+Usage:
+    cd scraper && uv run python benchmarks/bench_aws_offer.py [--skus 50000]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from scraper.providers import aws
+
+_CHUNK = 64 * 1024
+
+
+def _synthetic_offer(n_skus: int) -> str:
+    products: dict[str, Any] = {}
+    on_demand: dict[str, Any] = {}
+    for i in range(n_skus):
+        sku = f"SKU{i:08d}"
+        model = "Nova Pro" if i % 5000 == 0 else f"Model {i % 97}"
+        products[sku] = {
+            "sku": sku,
+            "productFamily": "Amazon Bedrock",
+            "attributes": {
+                "servicecode": "AmazonBedrock",
+                "location": "US East (N. Virginia)",
+                "regionCode": "us-east-1",
+                "model": model,
+                "usagetype": f"USE1-Model{i % 97}-input-tokens",
+            },
+        }
+        on_demand[sku] = {f"{sku}.JRTCKXETXF": {
+            "offerTermCode": "JRTCKXETXF",
+            "sku": sku,
+            "effectiveDate": "2025-01-01T00:00:00Z",
+            "priceDimensions": {f"{sku}.JRTCKXETXF.6YS6EN2CT7": {
+                "unit": "1K tokens",
+                "description": "$0.0008 per 1K input tokens",
+                "pricePerUnit": {"USD": "0.0008000000"},
+            }},
+        }}
+    return json.dumps({
+        "formatVersion": "v1.0",
+        "offerCode": "AmazonBedrock",
+        "products": products,
+        "terms": {"OnDemand": on_demand},
+    })
+
+
+def _measure(fn: Callable[[], Any]) -> tuple[float, float]:
+    """(ピークメモリ MB, 秒) を返す。tracemalloc は遅いので時間は別に計る。"""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=50_000, help="合成オファーファイルの SKU 数")
+    args = parser.parse_args()
+
+    text = _synthetic_offer(args.skus)
+    chunks = [text[i:i + _CHUNK] for i in range(0, len(text), _CHUNK)]
+    del text
+
+    def whole() -> None:
+        data = json.loads("".join(chunks))
+        data["products"], data["terms"]["OnDemand"]
+
+    def streaming() -> None:
+        aws._parse_offer(iter(chunks))
+
+    size_mb = sum(len(c) for c in chunks) / 1e6
+    print(f"offer: {size_mb:.1f} MB, {args.skus} SKU")
+    for label, fn in (("json.loads 全体", whole), ("ストリーム", streaming)):
+        peak, elapsed = _measure(fn)
+        print(f"{label:16s} peak {peak:8.1f} MB  {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
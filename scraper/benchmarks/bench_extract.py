@@ -0,0 +1,77 @@
+"""extract_price のワーストケース計測（全文探索 vs アンカー窓探索）。
+
+数 MB の HTML に対象モデル名が散在し、価格が見つからない（全パターンがミスする）
+ケースで、全文探索とアンカー窓探索の所要時間を比較する。
+全文探索はページサイズに対してほぼ二乗で増える（0.3 MB で約 10 秒）ため、
+既定のサイズは小さめにしてある。
+
+Usage:
+    cd scraper && uv run python benchmarks/bench_extract.py [--mb 0.25] [--repeat 3]
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import time
+
+from scraper.browser import PageText, extract_price
+from scraper.engine import load_spec
+
+_SPEC = load_spec("openai")
+
+
+def _synthetic_page(size_mb: float, seed: int = 0) -> str:
+    """モデル名を含むが価格表記のない巨大 HTML を作る。"""
+    rng = random.Random(seed)
+    names = [m.name for m in _SPEC.models]
+    filler = "<div class='row'><span>lorem ipsum dolor sit amet</span></div>\n"
+    chunks: list[str] = []
+    size = 0
+    while size < size_mb * 1_000_000:
+        if rng.random() < 0.01:
+            chunk = f"<p>{rng.choice(names)} output tokens input cached</p>\n"
+        else:
+            chunk = filler
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks)
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=0.25, help="ページサイズ (MB)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    html = _synthetic_page(args.mb)
+
+    def full() -> None:
+        page = PageText(html, "bench://openai")
+        for m in _SPEC.models:
+            extract_price(page, m.patterns["input"])
+            extract_price(page, m.patterns["output"])
+
+    def anchored() -> None:
+        page = PageText(html, "bench://openai")  # アンカー位置はページごとにメモ化される
+        for m in _SPEC.models:
+            extract_price(page, m.patterns["input"], anchor=m.anchor)
+            extract_price(page, m.patterns["output"], anchor=m.anchor)
+
+    t_full = _time(full, args.repeat)
+    t_anchored = _time(anchored, args.repeat)
+    print(f"page: {len(html) / 1e6:.1f} MB, models: {len(_SPEC.models)}")
+    print(f"全文探索:     {t_full * 1000:9.1f} ms")
+    print(f"アンカー窓:   {t_anchored * 1000:9.1f} ms  (x{t_full / t_anchored:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""pricing.json の読み込み・書き出し: dict 経由 vs Pydantic の JSON 直接処理。
+
+モデル数を変えた合成カタログで、
+  - 読み込み: json.loads + model_validate  vs  model_validate_json（_load_existing）
+  - 書き出し: model_dump + json.dumps      vs  model_dump_json（_write_output）
+の 1 回あたりの所要時間を比較し、両者の出力が同じバイト列であることも確かめる
+（合成カタログの値は 1e-4 以上。それ未満の浮動小数点数は両者で表記が異なる）。
+
+Usage:
+    cd scraper && uv run python benchmarks/bench_pricing_json.py [--models 100 1000 10000]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from scraper.models import ApiModel, PricingData, SubTool
+
+
+def _catalog(n_models: int) -> PricingData:
+    """n_models 件の API モデル（とその 1/10 のツール）を持つカタログ。"""
+    api_models = [
+        ApiModel(
+            provider=f"Provider {i % 40}", name=f"Model {i}", tag="最新", cls="tag-bal",
+            price_in=round(0.05 + (i % 997) * 0.013, 6), price_out=round(0.2 + (i % 991) * 0.052, 6),
+            sub_ja="バランス最適 / 200K", sub_en="Optimal balance / 200K ctx",
+            scrape_status="success" if i % 3 else "fallback",
+            scraped_at="2026-01-01T00:00:00+00:00" if i % 3 else None,
+        )
+        for i in range(n_models)
+    ]
+    sub_tools = [
+        SubTool(
+            group=f"Tool {i % 20}", name=f"Plan {i}", monthly=float(10 + i % 50),
+            annual=float(8 + i % 40) if i % 2 else None, tag="Pro", cls="tag-bal",
+            note_ja="月額プラン", note_en="Monthly plan", scrape_status="success",
+        )
+        for i in range(max(1, n_models // 10))
+    ]
+    return PricingData(
+        generated_at="2026-01-01", jpy_rate=150.0, jpy_rate_date="2026-01-01",
+        api_models=api_models, sub_tools=sub_tools,
+    )
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat, loops)) / loops
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'モデル数':>8} {'サイズ':>9}  {'読込 dict':>10} {'読込 JSON':>10}  {'書出 dict':>10} {'書出 JSON':>10}")
+    for n in args.models:
+        data = _catalog(n)
+        payload = data.model_dump_json(indent=2).encode("utf-8")
+        legacy = json.dumps(data.model_dump(), ensure_ascii=False, indent=2).encode("utf-8")
+        assert payload == legacy, "1e-4 以上の値で model_dump_json の出力が json.dumps と一致しない"
+
+        load_dict = _time(lambda: PricingData.model_validate(json.loads(payload)), args.repeat)
+        load_json = _time(lambda: PricingData.model_validate_json(payload), args.repeat)
+        dump_dict = _time(
+            lambda: json.dumps(data.model_dump(), ensure_ascii=False, indent=2).encode("utf-8"), args.repeat,
+        )
+        dump_json = _time(lambda: data.model_dump_json(indent=2).encode("utf-8"), args.repeat)
+        print(
+            f"{n:>8} {len(payload) / 1e6:>7.2f}MB  {load_dict * 1e3:>8.2f}ms {load_json * 1e3:>8.2f}ms"
+            f"  {dump_dict * 1e3:>8.2f}ms {dump_json * 1e3:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
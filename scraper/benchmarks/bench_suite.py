@@ -0,0 +1,417 @@
+"""オフラインのベンチマーク一式（料金ページのスナップショットを使う）。
+
+benchmarks/fixtures/pages/<仕様名>.html を get_page_text() の代わりに返し、
+ネットワークに出ずに次の 1 回あたりの所要時間（repeat 回の最小値）を計る。
+
+- extract/<名前>: そのページの全モデル・プランの extract_price()
+  （PageText の作成から。可視テキスト化・アンカー走査を含む）
+- scrape/<名前>: providers.* / tools.* の scrape()。AWS は合成オファーファイル
+  （実行時に一時ファイルへ生成）を http_client.stream() の代わりにストリームで渡す
+- write_output: 全スクレイパーの結果に対する main._write_output()（一時ディレクトリへ）。
+  内容が同じで書き込みを省略する場合と、write_output/changed（出力先を消してから書く場合）
+- load_existing: その出力に対する main._load_existing()
+  （カタログを大きくした場合の読み書きは bench_pricing_json.py）
+
+--save で結果を JSON に保存し、--compare で保存済みの基準値と比べて
+--threshold を超えて遅くなった項目を報告する（回帰があれば終了コード 1）。
+
+同梱のスナップショットは仕様（specs/*.toml）の価格から --synthesize で作った合成ページ。
+--capture で実際のページから取り直せる（ネットワークと Chromium が必要）。
+
+Usage:
+    cd scraper && uv run python benchmarks/bench_suite.py [--repeat 5] [--save base.json]
+    cd scraper && uv run python benchmarks/bench_suite.py --compare base.json [--threshold 0.2]
+    cd scraper && uv run python benchmarks/bench_suite.py --synthesize | --capture
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from unittest.mock import patch
+
+from scraper import main as scraper_main
+from scraper.browser import PageText, browser_session, expect_anchors, extract_price, get_page_text
+from scraper.engine import PageSpec, scrape_models, scrape_plans
+from scraper.models import ApiModel, PricingData, SubTool
+from scraper.providers import aws
+
+_FIXTURES = Path(__file__).parent / "fixtures" / "pages"
+_CHUNK = 64 * 1024
+_AWS_SKUS = 20_000
+
+# 回帰判定で無視する差（これより小さい悪化は計測の揺らぎとみなす）
+_NOISE_FLOOR_S = 0.0005
+
+
+def _scraper_modules() -> list[tuple[str, ModuleType]]:
+    """(スクレイパー名, モジュール) を main の定義順で返す。"""
+    fns = [fn for fn, _ in [*scraper_main._API_SCRAPERS, *scraper_main._TOOL_SCRAPERS]]
+    return [(scraper_main._scraper_name(fn), sys.modules[fn.__module__]) for fn in fns]
+
+
+def _page_specs() -> list[tuple[ModuleType, PageSpec]]:
+    return [(module, module._SPEC) for _, module in _scraper_modules() if hasattr(module, "_SPEC")]
+
+
+def _fixture(spec: PageSpec) -> str:
+    return (_FIXTURES / f"{spec.name}.html").read_text(encoding="utf-8")
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    """1 回あたりの秒数（repeat 回計った最小値）。
+
+    短い処理は 1 回の計測が 0.2 秒以上になるまでまとめて実行し、揺らぎを抑える。
+    """
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat, loops)) / loops
+
+
+# ---------------------------------------------------------------------------
+# 合成 AWS オファーファイル
+
+
+def _write_synthetic_offer(path: Path, n_skus: int, seed: int = 0) -> None:
+    """対象モデルの標準料金行と、大量の無関係な SKU を含むオファーファイルを書く。"""
+    rng = random.Random(seed)
+    products: dict[str, Any] = {}
+    on_demand: dict[str, Any] = {}
+
+    def add(sku: str, model: str, usage_type: str, usd: float, desc: str) -> None:
+        products[sku] = {"sku": sku, "productFamily": "Amazon Bedrock", "attributes": {
+            "servicecode": "AmazonBedrock", "regionCode": "us-east-1",
+            "model": model, "usagetype": usage_type,
+        }}
+        on_demand[sku] = {f"{sku}.JRTCKXETXF": {
+            "offerTermCode": "JRTCKXETXF", "sku": sku,
+            "priceDimensions": {f"{sku}.JRTCKXETXF.6YS6EN2CT7": {
+                "unit": "1K tokens", "description": desc,
+                "pricePerUnit": {"USD": f"{usd:.10f}"},
+            }},
+        }}
+
+    for i in range(n_skus):
+        family = rng.randrange(200)
+        direction = rng.choice(("input", "output"))
+        add(f"SKU{i:08d}", f"Model {family}", f"USE1-Model{family}-{direction}-tokens",
+            rng.uniform(0.0001, 0.01), f"${rng.uniform(0.0001, 0.01):.4f} per 1K {direction} tokens")
+    for model, (fb_in, fb_out) in aws._FALLBACKS.items():
+        short = model.removeprefix("Amazon ").replace(" ", "")
+        for direction, price in (("input", fb_in), ("output", fb_out)):
+            add(f"{short}-{direction}", model.removeprefix("Amazon "),
+                f"USE1-{short}-{direction}-tokens", price / 1000,
+                f"${price / 1000:.6f} per 1K {direction} tokens")
+            add(f"{short}-{direction}-batch", model.removeprefix("Amazon "),
+                f"USE1-{short}-{direction}-tokens-batch", price / 2000,
+                f"${price / 2000:.6f} per 1K {direction} tokens (batch)")
+    path.write_text(json.dumps({
+        "formatVersion": "v1.0", "offerCode": "AmazonBedrock",
+        "products": products, "terms": {"OnDemand": on_demand},
+    }), encoding="utf-8")
+
+
+class _OfferResponse:
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self.num_bytes_downloaded = 0
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_text(self) -> Iterator[str]:
+        with self._path.open(encoding="utf-8") as f:
+            while chunk := f.read(_CHUNK):
+                self.num_bytes_downloaded += len(chunk)
+                yield chunk
+
+
+@contextmanager
+def _offline(offer: Path) -> Iterator[None]:
+    """get_page_text() をスナップショット、AWS のオファー取得を合成ファイルに差し替える。"""
+    def fixture_fetch(spec: PageSpec) -> Callable[..., str]:
+        html = _fixture(spec)
+        return lambda url, **kwargs: PageText(html, url)
+
+    @contextmanager
+    def stream(method: str, url: str, **kwargs: Any) -> Iterator[_OfferResponse]:
+        yield _OfferResponse(offer)
+
+    with ExitStack() as stack:
+        for module, spec in _page_specs():
+            stack.enter_context(patch.object(module, "get_page_text", fixture_fetch(spec)))
+        stack.enter_context(patch.object(
+            aws, "_locate_regional_offer", lambda: ("bench://offer", "bench", "2026-01-01"),
+        ))
+        stack.enter_context(patch("scraper.http_client.stream", stream))
+        aws.configure_offer_state(None)
+        yield
+
+
+# ---------------------------------------------------------------------------
+# 計測
+
+
+def _extract_all(spec: PageSpec, html: str) -> None:
+    page = PageText(html, spec.url)
+    expect_anchors(page, [m.anchor for m in spec.models if m.patterns is not None])
+    for m in spec.models:
+        if m.patterns is not None:
+            extract_price(page, m.patterns["input"], anchor=m.anchor, model=m.name, field="input")
+            extract_price(page, m.patterns["output"], anchor=m.anchor, model=m.name, field="output")
+    for p in spec.plans:
+        if p.patterns:
+            extract_price(page, p.patterns, model=p.name)
+
+
+def run(repeat: int, aws_skus: int) -> dict[str, Any]:
+    timings: dict[str, float] = {}
+    rows: dict[str, list[int]] = {}
+    for _, spec in _page_specs():
+        html = _fixture(spec)
+        timings[f"extract/{spec.name}"] = _time(lambda: _extract_all(spec, html), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        offer = Path(tmp) / "aws_offer.json"
+        _write_synthetic_offer(offer, aws_skus)
+        api_models: list[ApiModel] = []
+        sub_tools: list[SubTool] = []
+        with _offline(offer):
+            for name, module in _scraper_modules():
+                result: list[Any] = []
+
+                def scrape() -> None:
+                    result[:] = module.scrape(None)
+
+                timings[f"scrape/{name}"] = _time(scrape, repeat)
+                rows[f"scrape/{name}"] = [
+                    len(result), sum(1 for r in result if r.scrape_status == "success"),
+                ]
+                (api_models if result and isinstance(result[0], ApiModel) else sub_tools).extend(result)
+
+        data = PricingData(
+            generated_at="2026-01-01", jpy_rate=150.0, jpy_rate_date="2026-01-01",
+            api_models=api_models, sub_tools=sub_tools,
+        )
+        output = Path(tmp) / "pricing.json"
+        web = Path(tmp) / "web" / "pricing.json"
+        web.parent.mkdir()
+
+        def write_changed() -> None:
+            output.unlink(missing_ok=True)
+            web.unlink(missing_ok=True)
+            scraper_main._write_output(data, output)
+
+        with patch.object(scraper_main, "_WEB_DATA_PATH", web):
+            timings["write_output"] = _time(lambda: scraper_main._write_output(data, output), repeat)
+            timings["write_output/changed"] = _time(write_changed, repeat)
+        timings["load_existing"] = _time(lambda: scraper_main._load_existing(output), repeat)
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "timings_s": timings,
+        "rows": rows,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """threshold（割合）を超えて遅くなった項目名を返し、比較表を出力する。"""
+    regressions: list[str] = []
+    base = baseline.get("timings_s", {})
+    print(f"{'項目':<28} {'基準 ms':>10} {'今回 ms':>10} {'変化':>8}")
+    for name, now in current["timings_s"].items():
+        before = base.get(name)
+        if before is None:
+            print(f"{name:<28} {'-':>10} {now * 1e3:>10.2f} {'(新規)':>8}")
+            continue
+        change = now / before - 1 if before else 0.0
+        regressed = change > threshold and now - before > _NOISE_FLOOR_S
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<28} {before * 1e3:>10.2f} {now * 1e3:>10.2f} {change:>+8.1%}"
+            f"{'  ← 回帰' if regressed else ''}"
+        )
+    return regressions
+
+
+def _print(result: dict[str, Any]) -> None:
+    print(f"{'項目':<28} {'ms':>10}   行 (success)")
+    for name, seconds in result["timings_s"].items():
+        counts = result["rows"].get(name)
+        suffix = f"   {counts[0]} ({counts[1]})" if counts else ""
+        print(f"{name:<28} {seconds * 1e3:>10.2f}{suffix}")
+
+
+# ---------------------------------------------------------------------------
+# スナップショットの作成
+
+
+_MODEL_ROWS = (
+    "<tr><td>{name}</td><td>Input ${price_in} / MTok</td><td>Output ${price_out} / MTok</td></tr>",
+    "<div class='card'><h3>{name}</h3><p>${price_in} / 1M input tokens</p>"
+    "<p>Output ${price_out} / 1M tokens</p></div>",
+    "<div class='card'><h3>{name}</h3><p>${price_in} / 1M input tokens</p></div>"
+    "<div class='card'><h3>{name} output</h3><p>${price_out} / 1M tokens</p></div>",
+)
+_PLAN_ROWS = (
+    "<div class='plan'><h3>{name}</h3><p class='price'>${price} / month</p></div>",
+    "<div class='plan'><h3>{name}</h3><p class='price'>${price} / user / month</p></div>",
+    "<div class='plan'><h3>{name}</h3><p class='price'>${price} / mo</p></div>",
+    "<div class='plan'><p class='price'>${price}</p><h3>{name}</h3></div>",
+)
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat"
+).split()
+
+
+def _fmt(value: float) -> str:
+    return f"{value:g}"
+
+
+def _model_row(m: Any) -> str:
+    """その行だけで仕様のパターンが仕様の価格を返す書式を選ぶ。"""
+    values = {"name": m.name, "price_in": _fmt(m.price_in), "price_out": _fmt(m.price_out)}
+    for template in _MODEL_ROWS:
+        row = template.format(**values)
+        if m.patterns is None or (
+            extract_price(row, m.patterns["input"], anchor=m.anchor) == m.price_in
+            and extract_price(row, m.patterns["output"], anchor=m.anchor) == m.price_out
+        ):
+            return row
+    return _MODEL_ROWS[0].format(**values)
+
+
+def _plan_row(p: Any) -> str:
+    values = {"name": p.name, "price": _fmt(p.monthly)}
+    for template in _PLAN_ROWS:
+        row = template.format(**values)
+        if not p.patterns or extract_price(row, p.patterns) == p.monthly:
+            return row
+    return _PLAN_ROWS[0].format(**values)
+
+
+def _filler(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _synthetic_page(spec: PageSpec) -> str:
+    """実際の料金ページに近い構成（ナビ・スクリプト・埋め込み JSON・FAQ）の合成ページ。"""
+    rng = random.Random(spec.name)
+    bundle = ";".join(
+        f"function f{i}(a,b){{return a.{rng.choice(_WORDS)}(b)+{rng.randrange(10**6)}}}"
+        for i in range(600)
+    )
+    next_data = json.dumps({"props": {"pageProps": {"sections": [
+        {"id": f"s{i}", "heading": _filler(rng, 6), "body": _filler(rng, 40)} for i in range(60)
+    ]}}, "page": "/pricing", "buildId": f"{rng.getrandbits(64):x}"})
+    icons = "".join(
+        f"<svg viewBox='0 0 24 24'><path d='M{rng.randrange(24)} {rng.randrange(24)}"
+        f"l{rng.randrange(24)} {rng.randrange(24)}z'/></svg>"
+        for _ in range(80)
+    )
+    rows = [_model_row(m) for m in spec.models] + [_plan_row(p) for p in spec.plans]
+    faq = "".join(
+        f"<details><summary>{_filler(rng, 8)}?</summary><p>{_filler(rng, 80)}</p></details>"
+        for _ in range(30)
+    )
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+        f"<title>{spec.label} pricing</title><style>.card{{padding:1rem}}</style>"
+        f"<script>{bundle}</script></head><body>"
+        f"<nav>{icons}<a href='/'>Home</a> <a href='/docs'>Docs</a> <a href='/blog'>Blog</a></nav>"
+        f"<main><h1>{spec.label}</h1><p>{_filler(rng, 60)}</p>"
+        f"<section class='pricing'><table>{''.join(rows)}</table></section>"
+        f"<section class='faq'>{faq}</section></main>"
+        f"<footer><p>{_filler(rng, 40)}</p></footer>"
+        f"<script id='__NEXT_DATA__' type='application/json'>{next_data}</script>"
+        "</body></html>\n"
+    )
+
+
+def _verify(spec: PageSpec, html: str) -> tuple[int, int]:
+    """(行数, success 件数) を返す。"""
+    fetch = lambda url, **kwargs: PageText(html, url)  # noqa: E731
+    rows: list[Any] = (
+        scrape_models(spec, fetch=fetch) if spec.models else scrape_plans(spec, fetch=fetch)
+    )
+    return len(rows), sum(1 for r in rows if r.scrape_status == "success")
+
+
+def synthesize() -> None:
+    _FIXTURES.mkdir(parents=True, exist_ok=True)
+    for _, spec in _page_specs():
+        html = _synthetic_page(spec)
+        (_FIXTURES / f"{spec.name}.html").write_text(html, encoding="utf-8")
+        total, success = _verify(spec, html)
+        print(f"{spec.name:<16} {len(html) / 1024:7.1f} KB  success {success}/{total}")
+
+
+async def _capture_all() -> None:
+    async with browser_session():
+        for _, spec in _page_specs():
+            html = await asyncio.to_thread(
+                get_page_text, spec.url, timeout_ms=spec.timeout_ms, policy=spec.policy, probe=spec.probe,
+            )
+            (_FIXTURES / f"{spec.name}.html").write_text(html, encoding="utf-8")
+            total, success = _verify(spec, html)
+            print(f"{spec.name:<16} {len(html) / 1024:7.1f} KB  success {success}/{total}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--aws-skus", type=int, default=_AWS_SKUS, help="合成オファーファイルの SKU 数")
+    parser.add_argument("--save", type=Path, metavar="PATH", help="結果を JSON で保存する")
+    parser.add_argument("--compare", type=Path, metavar="PATH", help="保存済みの基準値と比較する")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="回帰とみなす悪化の割合（デフォルト: 0.2 = 20%%）",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--synthesize", action="store_true", help="仕様から合成スナップショットを作り直す")
+    mode.add_argument("--capture", action="store_true", help="実際のページからスナップショットを取り直す")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize()
+        return 0
+    if args.capture:
+        _FIXTURES.mkdir(parents=True, exist_ok=True)
+        asyncio.run(_capture_all())
+        return 0
+
+    logging.disable(logging.CRITICAL)
+    result = run(args.repeat, args.aws_skus)
+    logging.disable(logging.NOTSET)
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"\n回帰 {len(regressions)} 件 (> {args.threshold:.0%}): {', '.join(regressions)}")
+            return 1
+        return 0
+    _print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
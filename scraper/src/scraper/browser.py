@@ -1,17 +1,40 @@
 """Playwright ブラウザの共通ユーティリティ。
 
-price_from_page() はページを JS レンダリングしてテキストを返す。
-3 層フォールバック:
-  1. JSON-LD / script[type="application/json"] から抽出
-  2. CSS セレクター群で抽出
-  3. 正規表現でテキスト全体を検索
+get_page_text() はページを取得してテキストを返す。probe パターンが
+与えられた場合はまず静的 HTTP で取得し、その全てで抽出できなければ JS レンダリングする。
+extract_price() の 2 層フォールバック:
+  1. 埋め込み JSON（JSON-LD / __NEXT_DATA__ / script[type="application/json"]）を
+     モデル名で引く（model を渡した場合）
+  2. ページごとに 1 度だけ作る可視テキスト（タグ・script・style を除き、
+     実体参照を展開し、ブロック要素の境界を改行にしたもの）を正規表現で検索
+どの層で値が取れたかは extraction_tiers() で参照できる。
 """
 
 from __future__ import annotations
+import asyncio
+import hashlib
+import html as htmllib
+import json
 import logging
 import re
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+from urllib.parse import urlsplit
 
-from playwright.sync_api import sync_playwright, Page
+from scraper import http_client, metrics, profiling, replay
+from scraper.cache import CachedPage, page_cache
+from scraper.manifest import active_manifest, patterns_key
+from scraper.patterns import PatternLike, registry
+from scraper.structured import StructuredIndex
+from playwright.async_api import async_playwright, Browser, Page, Playwright, Request, Route
 
 logger = logging.getLogger(__name__)
 
@@ -19,38 +42,838 @@ logger = logging.getLogger(__name__)
 _PRICE_MIN = 0.001
 _PRICE_MAX = 2000.0
 
+# アンカー（モデル名）の前後この文字数だけを価格の探索範囲にする
+ANCHOR_WINDOW = 4_000
 
-def get_page_text(url: str, wait_selector: str | None = None, timeout_ms: int = 30_000) -> str:
-    """URL をヘッドレスブラウザで開き、ページテキスト全体を返す。"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+# レンダリング完了判定（ミリ秒）
+_READY_POLL_MS = 100       # DOM 状態のポーリング間隔
+_READY_STABLE_MS = 300     # 価格表記が出現した後、DOM 変化が止まってから待つ時間
+_READY_QUIET_MS = 1500     # 価格表記がなくても DOM がこれだけ静止したら完了とみなす
+_READY_CAP_MS = 8_000      # どの条件も満たさない場合の上限
+
+# MutationObserver で最後の DOM 変化時刻を記録し、
+# [最後の変化からの経過 ms, 本文にドル価格表記があるか] を返す。
+_READY_PROBE_JS = r"""() => {
+  if (!window.__scraperObserver) {
+    window.__scraperLastMutation = performance.now();
+    window.__scraperObserver = new MutationObserver(() => {
+      window.__scraperLastMutation = performance.now();
+    });
+    window.__scraperObserver.observe(document, {subtree: true, childList: true, characterData: true});
+  }
+  const text = document.body ? document.body.innerText : "";
+  return [performance.now() - window.__scraperLastMutation, /\$\s?\d/.test(text)];
+}"""
+
+
+class ReadyTiming(NamedTuple):
+    """URL ごとのレンダリング完了までの時間と、完了と判定した理由。"""
+
+    elapsed_ms: float
+    reason: str  # "price" | "networkidle" | "dom-stable" | "timeout"
+
+
+_ready_timings: dict[str, ReadyTiming] = {}
+
+
+def ready_timings() -> dict[str, ReadyTiming]:
+    """この実行で記録した URL ごとのレンダリング完了時間を返す。"""
+    return dict(_ready_timings)
+
+
+async def _wait_until_ready(page: Page, cap_ms: int) -> ReadyTiming:
+    """ページが読み取り可能になるまで待つ。
+
+    次のいずれかを満たした時点で返る:
+      - ドル価格表記があり、DOM 変化が _READY_STABLE_MS 止まった
+      - ネットワークがアイドルになった
+      - DOM 変化が _READY_QUIET_MS 止まった
+      - cap_ms に到達した
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    idle = asyncio.create_task(page.wait_for_load_state("networkidle", timeout=cap_ms))
+    try:
+        while True:
+            elapsed_ms = (loop.time() - start) * 1000
+            try:
+                quiet_ms, has_price = await page.evaluate(_READY_PROBE_JS)
+            except Exception:
+                # ナビゲーション中などで評価できない場合は変化中とみなす
+                quiet_ms, has_price = 0.0, False
+
+            if has_price and quiet_ms >= _READY_STABLE_MS:
+                reason = "price"
+            elif idle.done() and idle.exception() is None and quiet_ms >= _READY_POLL_MS:
+                reason = "networkidle"
+            elif quiet_ms >= _READY_QUIET_MS:
+                reason = "dom-stable"
+            elif elapsed_ms >= cap_ms:
+                reason = "timeout"
+            else:
+                await asyncio.sleep(_READY_POLL_MS / 1000)
+                continue
+            return ReadyTiming(elapsed_ms, reason)
+    finally:
+        if idle.done():
+            idle.exception()  # 未取得の例外警告を抑止
+        else:
+            idle.cancel()
+
+
+# 価格テキストに影響しない解析・広告・埋め込み動画のドメイン
+_NOISE_DOMAINS: tuple[str, ...] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "segment.io",
+    "segment.com",
+    "hotjar.com",
+    "intercom.io",
+    "intercomcdn.com",
+    "sentry.io",
+    "datadoghq.com",
+    "facebook.net",
+    "linkedin.com",
+    "ads-twitter.com",
+    "clarity.ms",
+    "hubspot.com",
+    "hs-scripts.com",
+    "youtube.com",
+    "vimeo.com",
+    "wistia.com",
+)
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """ページ読み込み時に遮断するリクエストの方針。
+
+    page.content() の HTML しか使わないため、画像・フォント・CSS・動画や
+    解析スクリプトは価格テキストに影響しない。allow_domains は遮断より優先する。
+    """
+
+    block_types: frozenset[str] = frozenset(
+        {"image", "media", "font", "stylesheet", "manifest", "texttrack"}
+    )
+    block_domains: tuple[str, ...] = _NOISE_DOMAINS
+    allow_domains: tuple[str, ...] = ()
+
+    def blocks(self, resource_type: str, host: str) -> bool:
+        if _host_matches(host, self.allow_domains):
+            return False
+        return resource_type in self.block_types or _host_matches(host, self.block_domains)
+
+    def extend(
+        self, block_domains: tuple[str, ...] = (), allow_domains: tuple[str, ...] = (),
+    ) -> ResourcePolicy:
+        """ドメインを追加した派生ポリシーを返す（プロバイダー別の上書き用）。"""
+        return ResourcePolicy(
+            block_types=self.block_types,
+            block_domains=self.block_domains + block_domains,
+            allow_domains=self.allow_domains + allow_domains,
+        )
+
+
+DEFAULT_POLICY = ResourcePolicy()
+
+
+def _host_matches(host: str, domains: tuple[str, ...]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+@dataclass
+class PageTraffic:
+    """1 ページ読み込みの通信量。遮断分は転送されないため件数のみ記録する。"""
+
+    requests: int = 0
+    transferred_bytes: int = 0
+    blocked: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def blocked_total(self) -> int:
+        return sum(self.blocked.values())
+
+
+_traffic: dict[str, PageTraffic] = {}
+
+
+def page_traffic() -> dict[str, PageTraffic]:
+    """この実行で記録した URL ごとの通信量を返す。"""
+    return dict(_traffic)
+
+
+async def _route_request(route: Route, policy: ResourcePolicy, traffic: PageTraffic) -> None:
+    request = route.request
+    if policy.blocks(request.resource_type, urlsplit(request.url).hostname or ""):
+        traffic.blocked[request.resource_type] += 1
+        await route.abort("blockedbyclient")
+    else:
+        await route.fallback()      # 記録・再生のルートがあればそちらへ、なければネットワークへ
+
+
+async def _count_transfer(request: Request, traffic: PageTraffic) -> None:
+    try:
+        sizes = await request.sizes()
+    except Exception:
+        return
+    traffic.requests += 1
+    traffic.transferred_bytes += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+
+
+class BrowserSession:
+    """1 回の実行で共有する Chromium インスタンス。
+
+    Playwright の async API でイベントループ上に 1 つだけ起動し、
+    ページごとに新しい BrowserContext を払い出す（Cookie 等はページ間で共有しない）。
+    別スレッドで動くスクレイパーからは get_page_text() 経由で
+    ループにページ取得を投入するため、複数ページを並行して読み込める。
+    block_resources=False でリクエスト遮断を無効にできる（効果測定用）。
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, block_resources: bool = True) -> None:
+        self._loop = loop
+        self.block_resources = block_resources
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._launch_lock = asyncio.Lock()
+        self.launches = 0
+
+    async def browser(self) -> Browser:
+        async with self._launch_lock:
+            if self._browser is None:
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self.launches += 1
+                logger.info("Chromium 起動 (セッション共有)")
+        return self._browser
+
+    async def fetch(
+        self, url: str, wait_selector: str | None, timeout_ms: int,
+        policy: ResourcePolicy = DEFAULT_POLICY,
+    ) -> str:
+        """新しいコンテキストで URL を開き、レンダリング後の HTML を返す。"""
+        browser = await self.browser()
+        context = await browser.new_context(
+            extra_http_headers={"Accept-Language": "en-US,en;q=0.9"},
+        )
+        traffic = PageTraffic()
+        transfers: list[asyncio.Task[None]] = []
+        trace = profiling.trace_path(url)
+        if trace is not None:
+            await context.tracing.start(screenshots=True, snapshots=True)
         try:
-            page: Page = browser.new_page()
-            page.set_extra_http_headers({"Accept-Language": "en-US,en;q=0.9"})
-            page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+            har = replay.har_path(url)
+            if har is not None:
+                # 後から登録したルートが先に動くので、遮断より前に登録する
+                await context.route_from_har(
+                    har, not_found="abort", update=replay.replay_mode() == "record",
+                    update_content="embed",
+                )
+            if self.block_resources:
+                await context.route("**/*", lambda route: _route_request(route, policy, traffic))
+            page: Page = await context.new_page()
+            page.on(
+                "requestfinished",
+                lambda request: transfers.append(
+                    asyncio.ensure_future(_count_transfer(request, traffic))
+                ),
+            )
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
             if wait_selector:
-                page.wait_for_selector(wait_selector, timeout=timeout_ms)
+                await page.wait_for_selector(wait_selector, timeout=timeout_ms)
             else:
-                page.wait_for_timeout(3000)  # JS レンダリング待ち
-            return page.content()
+                timing = await _wait_until_ready(page, _READY_CAP_MS)
+                _ready_timings[url] = timing
+                logger.info("%s: レンダリング完了 %.0f ms (%s)", url, timing.elapsed_ms, timing.reason)
+            html = await page.content()
+            await asyncio.gather(*transfers, return_exceptions=True)
+            _traffic[url] = traffic
+            logger.info(
+                "%s: 転送 %d 件 / %.1f KB, 遮断 %d 件 %s",
+                url, traffic.requests, traffic.transferred_bytes / 1024,
+                traffic.blocked_total, dict(traffic.blocked),
+            )
+            return html
         finally:
-            browser.close()
+            if trace is not None:
+                await context.tracing.stop(path=trace)
+                logger.info("%s: トレースを書き込みました: %s", url, trace)
+            await context.close()
 
+    def fetch_threadsafe(
+        self, url: str, wait_selector: str | None, timeout_ms: int, policy: ResourcePolicy,
+    ) -> str:
+        """ワーカースレッドから fetch() をセッションのループに投入して結果を待つ。"""
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch(url, wait_selector, timeout_ms, policy), self._loop
+        )
+        return future.result()
 
-def extract_price(text: str, patterns: list[str]) -> float | None:
-    """複数の正規表現パターンで最初にマッチした価格を返す。"""
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE | re.DOTALL)
-        if m:
+    async def aclose(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_session: BrowserSession | None = None
+
+
+@asynccontextmanager
+async def browser_session(block_resources: bool = True) -> AsyncIterator[BrowserSession]:
+    """実行スコープのブラウザセッションを開く。
+
+    async with ブロック内では、to_thread 等で別スレッドから呼ばれた
+    get_page_text() が同じ Chromium を再利用する。
+    ブロック外（単体呼び出し）では従来通り 1 URL ごとに起動・終了する。
+    """
+    global _session
+    if _session is not None:
+        yield _session
+        return
+    session = BrowserSession(asyncio.get_running_loop(), block_resources)
+    _session = session
+    try:
+        yield session
+    finally:
+        _session = None
+        await session.aclose()
+
+
+FetchTier = Literal["static", "browser"]
+
+# どちらの方式も、記録からこの日数が経てば静的取得から判定し直す
+_TIER_RECHECK_DAYS = 7
+
+
+class ProbeRow(NamedTuple):
+    """probe の 1 項目: extract_price() に渡すのと同じ抽出条件 1 行分。"""
+
+    patterns: Sequence[PatternLike]
+    anchor: PatternLike | None = None
+    model: str | None = None
+    field: str = "price"
+
+
+# probe の 1 項目: 抽出条件 1 行分、パターン 1 つ、またはどれか 1 つで価格が取れればよい候補の並び
+ProbeItem = ProbeRow | PatternLike | Sequence[PatternLike]
+
+_STATIC_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/131.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class TierStore:
+    """URL ごとに前回成功した取得方式（static / browser）を記憶する。
+
+    path が None の場合は実行中のみメモリに保持する。
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._tiers: dict[str, dict[str, str]] = {}
+        if path is not None and path.exists():
             try:
-                price = float(m.group(1).replace(",", ""))
-                if _PRICE_MIN <= price <= _PRICE_MAX:
+                self._tiers = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning("取得方式の記録を読み込めません (%s): %s", path, exc)
+
+    def get(self, url: str) -> FetchTier | None:
+        """記録した方式を返す。未記録か _TIER_RECHECK_DAYS 日以上前の記録なら None。"""
+        entry = self._tiers.get(url)
+        if entry is None:
+            return None
+        checked = date.fromisoformat(entry["checked"])
+        if date.today() - checked >= timedelta(days=_TIER_RECHECK_DAYS):
+            return None
+        return entry["tier"]  # type: ignore[return-value]
+
+    def set(self, url: str, tier: FetchTier) -> None:
+        with self._lock:
+            self._tiers[url] = {"tier": tier, "checked": date.today().isoformat()}
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.path.write_text(
+                    json.dumps(self._tiers, indent=2, sort_keys=True), encoding="utf-8"
+                )
+
+
+_tiers = TierStore()
+
+
+def configure_tier_store(path: Path | None) -> None:
+    """取得方式の記録先ファイルを設定する（None で永続化しない）。"""
+    global _tiers
+    _tiers = TierStore(path)
+
+
+def _probe_row(item: ProbeItem) -> ProbeRow:
+    if isinstance(item, ProbeRow):
+        return item
+    if isinstance(item, (str, re.Pattern)):
+        return ProbeRow((item,))
+    return ProbeRow(tuple(item))
+
+
+def _probe_matches(page: PageText, probe: Sequence[ProbeItem]) -> bool:
+    """probe の全項目で価格が取れるなら True。
+
+    各項目は extract_price() と同じ探索（埋め込み JSON → アンカー周辺の正規表現）で
+    調べ、結果はページに残すので、このページから抽出するときは照合し直さない。
+    """
+    rows = [_probe_row(item) for item in probe]
+    page.anchor_index.expect(row.anchor for row in rows if row.anchor is not None)
+    return all(
+        _extract(page, row.patterns, row.anchor, ANCHOR_WINDOW, row.model, row.field)[0] is not None
+        for row in rows
+    )
+
+
+def _get_static_text(url: str, timeout_ms: int) -> str:
+    """静的 HTML を取得する。キャッシュがあれば条件付きリクエストで再検証する。"""
+    cache = page_cache()
+    cached = cache.get(url, "static") if cache else None
+    headers = dict(_STATIC_HEADERS)
+    if cached:
+        headers.update(cached.validators())
+    resp = http_client.get(url, headers=headers, timeout=timeout_ms / 1000)
+    if cache and cached and resp.status_code == 304:
+        cache.record("static", hit=True)
+        cached.fetched_at = time.time()
+        cache.put(cached)
+        return cached.body
+    resp.raise_for_status()
+    if cache:
+        cache.record("static", hit=False)
+        cache.put(CachedPage(
+            url=url, kind="static", body=resp.text, fetched_at=time.time(),
+            etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"),
+        ))
+    return resp.text
+
+
+async def _fetch_once(
+    url: str, wait_selector: str | None, timeout_ms: int, policy: ResourcePolicy,
+) -> str:
+    async with browser_session() as session:
+        return await session.fetch(url, wait_selector, timeout_ms, policy)
+
+
+# ページ内容に影響しないリクエストごとの揺らぎ（CSP nonce 等）
+_VOLATILE_ATTR_RE = re.compile(r'\s(?:nonce|integrity|data-reactroot|data-n-head)="[^"]*"')
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 可視テキスト化で中身ごと捨てる要素とコメント
+_INVISIBLE_RE = re.compile(
+    r"<(script|style|noscript|svg|template)\b[^>]*>.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+# 行の区切りにするブロック要素。表のセル（td / th）は区切らず、1 行 = 表の 1 行にする
+_BLOCK_TAG_RE = re.compile(
+    r"</?(?:address|article|aside|blockquote|br|dd|details|div|dl|dt|figcaption|figure|footer"
+    r"|h[1-6]|header|hr|li|main|nav|ol|p|section|summary|table|tbody|tfoot|thead|tr|ul)\b[^>]*>",
+    re.IGNORECASE,
+)
+_HSPACE_RE = re.compile(r"[^\S\n]+")
+_LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+
+
+class TextSize(NamedTuple):
+    """可視テキスト化の前後のサイズ（UTF-8 バイト数）。"""
+
+    html_bytes: int
+    text_bytes: int
+
+
+_text_sizes: dict[str, TextSize] = {}
+
+
+def text_sizes() -> dict[str, TextSize]:
+    """この実行で可視テキスト化した URL ごとのサイズを返す。"""
+    return dict(_text_sizes)
+
+
+def visible_text(html: str) -> str:
+    """HTML から表示されるテキストだけを取り出す。
+
+    ソース中の改行・空白は（ブラウザの表示と同じく）1 つの空白とみなし、
+    ブロック要素（行・段落・見出し・リスト項目・div 等）の境界を改行にする。
+    仕様のパターンは [^\\n] で 1 行（表の 1 行）の中に照合を留めるので、
+    ナビゲーション等の別の行にあるモデル名から隣の行の価格を拾わない。
+    その他のタグは空白に置き換える（セル間の語がつながらないように）。
+    実体参照の展開はタグ除去の後に行う（&lt; がタグとして消えないように）。
+    """
+    text = _WHITESPACE_RE.sub(" ", _INVISIBLE_RE.sub(" ", html))
+    text = _TAG_RE.sub(" ", _BLOCK_TAG_RE.sub("\n", text))
+    text = _HSPACE_RE.sub(" ", htmllib.unescape(text))
+    return _LINE_BREAK_RE.sub("\n", text).strip()
+
+
+class PageText(str):
+    """取得元 URL と内容ハッシュを持つページ HTML。
+
+    str としてそのまま正規表現に渡せる。digest は揺らぎを除いて
+    正規化した内容のハッシュで、マニフェストの変更検知に使う。
+    visible（可視テキスト）と structured（埋め込み JSON の索引）は
+    ページごとに 1 度だけ作られる。
+    """
+
+    url: str
+
+    def __new__(cls, html: str, url: str) -> PageText:
+        page = super().__new__(cls, html)
+        page.url = url
+        return page
+
+    @cached_property
+    def digest(self) -> str:
+        normalized = _WHITESPACE_RE.sub(" ", _VOLATILE_ATTR_RE.sub("", self))
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @cached_property
+    def visible(self) -> str:
+        text = visible_text(self)
+        size = TextSize(len(self.encode("utf-8")), len(text.encode("utf-8")))
+        _text_sizes[self.url] = size
+        logger.info(
+            "%s: 可視テキスト化 %.1f KB → %.1f KB",
+            self.url, size.html_bytes / 1024, size.text_bytes / 1024,
+        )
+        return text
+
+    @cached_property
+    def structured(self) -> StructuredIndex:
+        index = StructuredIndex.from_html(self)
+        if len(index):
+            logger.info("%s: 埋め込み JSON から %d 件のレコードを索引化", self.url, len(index))
+        return index
+
+    @cached_property
+    def extractions(self) -> dict[tuple[Any, ...], tuple[float | None, ExtractionTier]]:
+        """抽出条件 → (値, 層)。probe と抽出で同じ条件を照合し直さないためのメモ。"""
+        return {}
+
+    @cached_property
+    def anchor_index(self) -> AnchorIndex:
+        """可視テキスト中のアンカー出現位置（ページごとにまとめて 1 度だけ走査）。"""
+        return AnchorIndex()
+
+
+def scan_anchors(text: str, anchors: Iterable[PatternLike]) -> dict[str, list[int]]:
+    """複数のアンカーの出現位置を、text を 1 回だけ走査して求める。
+
+    全アンカーの先読み選択 (?=(?:a)|(?:b)|...) で候補位置を拾い、候補位置でだけ
+    各アンカーを照合する。先読みなので、重なり合うアンカー（"gpt-5" と
+    "gpt-5 mini" 等）も同じ位置で両方拾える。
+    """
+    compiled = {p.pattern: p for p in map(registry.compile, anchors)}
+    if len(compiled) == 1:
+        ((key, pattern),) = compiled.items()
+        return {key: [m.start() for m in pattern.finditer(text)]}
+    positions: dict[str, list[int]] = {key: [] for key in compiled}
+    try:
+        scan = registry.compile("(?=" + "|".join(f"(?:{k})" for k in compiled) + ")")
+    except re.error:    # 組み合わせられないパターン（インラインフラグ等）は個別に走査する
+        return {key: [m.start() for m in p.finditer(text)] for key, p in compiled.items()}
+    for m in scan.finditer(text):
+        pos = m.start()
+        for key, pattern in compiled.items():
+            if pattern.match(text, pos):
+                positions[key].append(pos)
+    return positions
+
+
+class AnchorIndex:
+    """アンカーパターン → テキスト中の出現位置。
+
+    expect() で登録したアンカーは、どれかが最初に引かれたときに
+    scan_anchors() でまとめて走査する。アンカー数が増えても
+    ページの走査は 1 回で済む。
+    """
+
+    def __init__(self) -> None:
+        self._positions: dict[str, list[int]] = {}
+        self._pending: list[PatternLike] = []
+
+    def __getitem__(self, pattern: str) -> list[int]:
+        return self._positions[pattern]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def expect(self, anchors: Iterable[PatternLike]) -> None:
+        self._pending.extend(anchors)
+
+    def positions(self, text: str, anchor: PatternLike) -> list[int]:
+        key = registry.compile(anchor).pattern
+        found = self._positions.get(key)
+        if found is None:
+            batch = [a for a in self._pending if registry.compile(a).pattern not in self._positions]
+            self._positions.update(scan_anchors(text, [anchor, *batch]))
+            self._pending.clear()
+            found = self._positions[key]
+        return found
+
+
+def expect_anchors(text: str, anchors: Iterable[PatternLike]) -> None:
+    """これから extract_price() に渡すアンカーを予告する（PageText 以外では何もしない）。"""
+    if isinstance(text, PageText):
+        text.anchor_index.expect(anchors)
+
+
+def anchor_positions(text: str, anchor: PatternLike, index: AnchorIndex | None = None) -> list[int]:
+    """text 中のアンカーの出現位置を返す。index を渡すとそこにメモ化する。"""
+    if index is None:
+        return [m.start() for m in registry.compile(anchor).finditer(text)]
+    return index.positions(text, anchor)
+
+
+def get_page_text(
+    url: str,
+    wait_selector: str | None = None,
+    timeout_ms: int = 30_000,
+    policy: ResourcePolicy = DEFAULT_POLICY,
+    probe: Sequence[ProbeItem] | None = None,
+) -> str:
+    """URL のページテキスト全体を返す。
+
+    probe を渡すと、まず共通 HTTP クライアントの GET で静的 HTML を取得し、probe の
+    全項目で価格が抽出できればそれを返す（項目は抽出条件 1 行分の ProbeRow か、
+    パターン 1 つ、どれか 1 つで取れればよい候補の並び）。抽出できない項目が
+    あればヘッドレスブラウザで開く。一部だけサーバー描画されたページを静的取得で
+    済ませないよう、仕様から呼ぶ場合は抽出する全ての行を probe にする。
+    ProbeRow はアンカー周辺だけを探索し、その結果は返したページからの抽出で再利用される。成功した方式は URL ごとに
+    記憶し、次回以降はその方式から始める（記録は _TIER_RECHECK_DAYS 日で判定し直す）。
+
+    policy に該当するリクエスト（画像・フォント・解析スクリプト等）は遮断する。
+    セッションのイベントループと同じスレッドからは呼ばないこと（デッドロックする）。
+    """
+    start = time.perf_counter()
+    try:
+        html = _fetch_tiered(url, wait_selector, timeout_ms, policy, probe)
+    finally:
+        metrics.record(fetch_s=time.perf_counter() - start, pages=1)
+    return html if isinstance(html, PageText) else PageText(html, url)
+
+
+def _fetch_tiered(
+    url: str,
+    wait_selector: str | None,
+    timeout_ms: int,
+    policy: ResourcePolicy,
+    probe: Sequence[ProbeItem] | None,
+) -> str:
+    if probe and _tiers.get(url) != "browser":
+        try:
+            html = _get_static_text(url, timeout_ms)
+        except Exception as exc:
+            logger.info("%s: 静的取得失敗 %s → ブラウザで取得", url, exc)
+        else:
+            html = PageText(html, url)
+            if _probe_matches(html, probe):
+                logger.info("%s: 静的 HTML で取得 (%.1f KB)", url, len(html) / 1024)
+                _tiers.set(url, "static")
+                return html
+            logger.info("%s: 静的 HTML で取れない価格あり → ブラウザで取得", url)
+
+    html = _render_page(url, wait_selector, timeout_ms, policy)
+    if probe:
+        _tiers.set(url, "browser")
+    return html
+
+
+def _render_page(
+    url: str, wait_selector: str | None, timeout_ms: int, policy: ResourcePolicy,
+) -> str:
+    """ブラウザで描画した HTML を返す。TTL 以内の描画結果がキャッシュにあれば再利用する。"""
+    cache = page_cache()
+    if cache:
+        cached = cache.get_fresh(url, "browser")
+        cache.record("browser", hit=cached is not None)
+        if cached:
+            logger.info("%s: 描画キャッシュを再利用 (%.0f 秒前)", url, cached.age().total_seconds())
+            return cached.body
+
+    session = _session
+    if session is None:
+        html = asyncio.run(_fetch_once(url, wait_selector, timeout_ms, policy))
+    else:
+        html = session.fetch_threadsafe(url, wait_selector, timeout_ms, policy)
+    timing, traffic = _ready_timings.get(url), _traffic.get(url)
+    metrics.record(
+        render_wait_s=timing.elapsed_ms / 1000 if timing else 0.0,
+        bytes_downloaded=traffic.transferred_bytes if traffic else 0,
+    )
+    if cache:
+        cache.put(CachedPage(url=url, kind="browser", body=html, fetched_at=time.time()))
+    return html
+
+
+ExtractionTier = Literal["structured", "regex", "none"]
+
+# (URL, モデル名, フィールド) → 値を返した層
+_extraction_tiers: dict[tuple[str, str, str], ExtractionTier] = {}
+
+
+def extraction_tiers() -> dict[tuple[str, str, str], ExtractionTier]:
+    """この実行で model を指定して抽出した価格ごとの、値を返した層を返す。"""
+    return dict(_extraction_tiers)
+
+
+def extract_price(
+    text: str,
+    patterns: Sequence[PatternLike],
+    anchor: PatternLike | None = None,
+    window: int = ANCHOR_WINDOW,
+    model: str | None = None,
+    field: str = "price",
+) -> float | None:
+    """ページから価格を抽出する。
+
+    get_page_text() の戻り値に model（モデル名・プラン名）を渡すと、まず
+    埋め込み JSON の中で名前が model のレコードを引き、キー名に field
+    （"input" / "output" / "price" 等）を含む値を使う。見つからなければ
+    正規表現に進み、patterns のうち最初にマッチした価格を返す。
+
+    patterns には文字列かコンパイル済みパターンを渡せる。文字列は
+    レジストリで初回だけコンパイルされ、照合統計もレジストリに記録される。
+    照合対象は HTML そのものではなく可視テキスト（visible_text()）。
+    get_page_text() の戻り値ならページごとに 1 度だけ変換したものを使う。
+
+    anchor（モデル名など）を渡すと、ページ全体ではなく各アンカー出現位置の
+    前後 window 文字だけを探索する。大きなページでマッチしない場合でも
+    全文を走査・バックトラックしない。patterns はアンカーを含む前提。
+
+    マニフェストが有効な場合は、ページ内容とスクレイパーのコードが
+    前回と同じなら前回の結果（と値を返した層）を返す。
+    """
+    start = time.thread_time()
+    try:
+        return _extract_price(text, patterns, anchor, window, model, field)
+    finally:
+        metrics.record(extract_cpu_s=time.thread_time() - start)
+
+
+def _extract_price(
+    text: str,
+    patterns: Sequence[PatternLike],
+    anchor: PatternLike | None,
+    window: int,
+    model: str | None,
+    field: str,
+) -> float | None:
+    if not isinstance(text, PageText):
+        return _search_price(visible_text(text), patterns, anchor, window)
+
+    manifest = active_manifest()
+    if manifest is None:
+        value, tier = _extract(text, patterns, anchor, window, model, field)
+    else:
+        key_parts = list(patterns)
+        if anchor is not None:
+            key_parts.append(f"anchor:{registry.compile(anchor).pattern}:{window}")
+        if model is not None:
+            key_parts.append(f"model:{model}:{field}")
+        key = patterns_key(key_parts)
+        found, stored = manifest.lookup(text.url, text.digest, key)
+        if found:
+            value, tier = stored
+        else:
+            value, tier = _extract(text, patterns, anchor, window, model, field)
+            manifest.record(text.url, text.digest, key, [value, tier])
+    if model is not None:
+        _extraction_tiers[(text.url, model, field)] = tier
+    return value
+
+
+def _extract(
+    page: PageText,
+    patterns: Sequence[PatternLike],
+    anchor: PatternLike | None,
+    window: int,
+    model: str | None,
+    field: str,
+) -> tuple[float | None, ExtractionTier]:
+    key = (
+        tuple(map(registry.compile, patterns)),
+        None if anchor is None else registry.compile(anchor),
+        window, model, field,
+    )
+    found = page.extractions.get(key)
+    if found is None:
+        found = page.extractions[key] = _extract_once(page, patterns, anchor, window, model, field)
+    return found
+
+
+def _extract_once(
+    page: PageText,
+    patterns: Sequence[PatternLike],
+    anchor: PatternLike | None,
+    window: int,
+    model: str | None,
+    field: str,
+) -> tuple[float | None, ExtractionTier]:
+    if model is not None:
+        for price in page.structured.candidates(model, field):
+            if _PRICE_MIN <= price <= _PRICE_MAX:
+                return price, "structured"
+    value = _search_price(page.visible, patterns, anchor, window, page.anchor_index)
+    return value, "regex" if value is not None else "none"
+
+
+def _search_price(
+    text: str,
+    patterns: Sequence[PatternLike],
+    anchor: PatternLike | None = None,
+    window: int = ANCHOR_WINDOW,
+    anchor_index: AnchorIndex | None = None,
+) -> float | None:
+    if anchor is None:
+        spans = [(0, len(text))]
+    else:
+        spans = _merge_spans(
+            (max(0, pos - window), min(len(text), pos + window))
+            for pos in anchor_positions(text, anchor, anchor_index)
+        )
+    for pat in patterns:
+        for start, end in spans:
+            m = registry.search(pat, text, start, end)
+            if m:
+                price = _parse_price(m)
+                if price is not None:
                     return price
-            except (ValueError, IndexError):
-                pass
     return None
 
 
+def _merge_spans(spans: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """重なる探索範囲を 1 つにまとめる（同じ箇所を何度も照合しないように）。"""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _parse_price(m: re.Match[str]) -> float | None:
+    try:
+        price = float(m.group(1).replace(",", ""))
+    except (ValueError, IndexError):
+        return None
+    return price if _PRICE_MIN <= price <= _PRICE_MAX else None
+
+
 def sanity_check(value: float | None, name: str, fallback: float) -> tuple[float, str]:
     """値が有効範囲内かチェックし、(value, status) を返す。"""
     if value is None:
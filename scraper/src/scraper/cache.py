@@ -0,0 +1,108 @@
+"""取得したページのディスクキャッシュ。
+
+URL をキーに本文・ETag・Last-Modified・取得時刻を保存する。
+  - 静的 HTTP 取得: If-None-Match / If-Modified-Since で再検証し、304 なら本文を再利用
+  - ブラウザ描画結果: TTL 以内ならレンダリングせずに再利用
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+CacheKind = Literal["static", "browser"]
+
+
+@dataclass
+class CachedPage:
+    url: str
+    kind: CacheKind
+    body: str
+    fetched_at: float               # UNIX 時刻
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def age(self) -> timedelta:
+        return timedelta(seconds=time.time() - self.fetched_at)
+
+    def validators(self) -> dict[str, str]:
+        """条件付きリクエスト用のヘッダーを返す。"""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """URL 単位のページキャッシュ。ヒット/ミス数を種別ごとに数える。"""
+
+    def __init__(self, directory: Path, ttl: timedelta) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits: dict[CacheKind, int] = {"static": 0, "browser": 0}
+        self.misses: dict[CacheKind, int] = {"static": 0, "browser": 0}
+
+    def _path(self, url: str, kind: CacheKind) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.directory / kind / f"{digest}.json"
+
+    def get(self, url: str, kind: CacheKind) -> CachedPage | None:
+        path = self._path(url, kind)
+        if not path.exists():
+            return None
+        try:
+            return CachedPage(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("キャッシュ破損のため無視します (%s): %s", path, exc)
+            return None
+
+    def get_fresh(self, url: str, kind: CacheKind) -> CachedPage | None:
+        """TTL 以内のエントリだけを返す。"""
+        cached = self.get(url, kind)
+        if cached is None or cached.age() > self.ttl:
+            return None
+        return cached
+
+    def put(self, page: CachedPage) -> None:
+        path = self._path(page.url, page.kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(page), ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def record(self, kind: CacheKind, hit: bool) -> None:
+        with self._lock:
+            (self.hits if hit else self.misses)[kind] += 1
+
+    def log_summary(self) -> None:
+        logger.info(
+            "ページキャッシュ: 静的 %d hit / %d miss, 描画 %d hit / %d miss (TTL %s)",
+            self.hits["static"], self.misses["static"],
+            self.hits["browser"], self.misses["browser"],
+            self.ttl,
+        )
+
+
+_page_cache: PageCache | None = None
+
+
+def configure_page_cache(directory: Path | None, ttl: timedelta = timedelta(0)) -> PageCache | None:
+    """ページキャッシュを設定する（None で無効化）。"""
+    global _page_cache
+    _page_cache = PageCache(directory, ttl) if directory is not None else None
+    return _page_cache
+
+
+def page_cache() -> PageCache | None:
+    return _page_cache
@@ -0,0 +1,295 @@
+"""宣言的な仕様（specs/*.toml）に基づくページスクレイパーの共通エンジン。
+
+1 ページを読んで価格を拾うプロバイダー・ツールは、URL・モデル（プラン）・
+アンカー・パターン・表示用メタデータを specs/<名前>.toml に書き、
+scrape_models() / scrape_plans() が 取得 → 抽出 → 検証 → 組み立て を行う。
+仕様は名前ごとに 1 度だけ読み込み、パターンはその時点でコンパイルする。
+
+パターンの {key} はモデル名から作るキー（小文字化し、separators の文字を
+対応する正規表現に置き換え、それ以外をエスケープしたもの）に置き換わる。
+モデルにパターンを書いた場合はページ共通のテンプレートより優先し、
+パターンのないモデル・プランは抽出せずフォールバック値をそのまま使い、
+scrape_status は "manual" になる。
+静的取得で済ませるかの判定（probe）には、抽出する全ての行の抽出条件を使う。
+
+出力する行（ApiModel / SubTool）は仕様の読み込み時に 1 度だけ検証し、
+各回の結果はその行を model_copy() で複製して価格と状態だけを差し替える
+（価格は sanity_check() 済みの抽出値か、検証済みの既存データ・仕様の値）。
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import json
+import logging
+import re
+import tomllib
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from importlib import resources
+from typing import Any
+
+from pydantic import ValidationError
+
+from scraper.browser import (
+    DEFAULT_POLICY, ProbeRow, ResourcePolicy, expect_anchors, extract_price, get_page_text,
+    sanity_check,
+)
+from scraper.models import ApiModel, SubTool
+from scraper.patterns import compile_patterns, registry
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TIMEOUT_MS = 40_000
+
+PageFetcher = Callable[..., str]
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """API モデル 1 件。patterns が空なら抽出しない（フォールバック専用）。
+
+    row は仕様の値で作った検証済みの行（出力時に価格と状態だけ差し替える）。
+    """
+
+    provider: str
+    name: str
+    price_in: float
+    price_out: float
+    row: ApiModel
+    anchor: re.Pattern[str] | None = None
+    patterns: Mapping[str, list[re.Pattern[str]]] | None = None
+
+
+@dataclass(frozen=True)
+class PlanSpec:
+    """サブスクリプションのプラン 1 件。patterns が空なら抽出しない。"""
+
+    group: str
+    name: str
+    monthly: float
+    row: SubTool
+    patterns: tuple[re.Pattern[str], ...] = ()
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """1 ページ分の仕様。models（API）か plans（ツール）のどちらかを持つ。
+
+    probe は抽出する行ごと（モデルは入力・出力ごと）の抽出条件。
+    source_digest は仕様ファイルの内容のハッシュ（マニフェストのコードハッシュに使う）。
+    """
+
+    name: str
+    label: str
+    url: str
+    probe: tuple[ProbeRow, ...]
+    policy: ResourcePolicy
+    timeout_ms: int
+    models: tuple[ModelSpec, ...] = ()
+    plans: tuple[PlanSpec, ...] = ()
+    source_digest: str = ""
+
+    @property
+    def owners(self) -> tuple[str, ...]:
+        """出力する行の provider（API）/ group（ツール）。出現順で重複なし。"""
+        return tuple(dict.fromkeys([m.provider for m in self.models] + [p.group for p in self.plans]))
+
+
+def model_key(name: str, separators: Mapping[str, str]) -> str:
+    """モデル名をパターン中で使うキーにする（"GPT-5 Mini" → "gpt\\-5[-\\s]?mini"）。"""
+    return "".join(separators.get(ch, re.escape(ch)) for ch in name.lower())
+
+
+def _fill(templates: Sequence[str], key: str) -> list[re.Pattern[str]]:
+    return compile_patterns(t.replace("{key}", key) for t in templates)
+
+
+def _parse_models(doc: dict[str, Any]) -> tuple[ModelSpec, ...]:
+    templates: dict[str, Any] = doc.get("patterns", {})
+    separators: dict[str, str] = templates.get("separators", {})
+    models: list[ModelSpec] = []
+    for row in doc["models"]:
+        name = row["name"]
+        key = model_key(name, separators)
+        fields = {
+            field: _fill(row.get(field, templates.get(field, [])), key)
+            for field in ("input", "output")
+        }
+        scraped = row.get("scrape", True)
+        template = ApiModel(
+            provider=row.get("provider", doc["provider"]),
+            name=name,
+            tag=row.get("tag", ""),
+            cls=row.get("cls", "tag-bal"),
+            price_in=row["price"][0],
+            price_out=row["price"][1],
+            sub_ja=row.get("sub_ja", ""),
+            sub_en=row.get("sub_en", ""),
+        )
+        models.append(ModelSpec(
+            provider=template.provider,
+            name=name,
+            price_in=template.price_in,
+            price_out=template.price_out,
+            row=template,
+            anchor=registry.compile(row.get("anchor", key)) if scraped else None,
+            patterns=fields if scraped and any(fields.values()) else None,
+        ))
+    return tuple(models)
+
+
+def _parse_plans(doc: dict[str, Any]) -> tuple[PlanSpec, ...]:
+    plans: list[PlanSpec] = []
+    for row in doc["plans"]:
+        template = SubTool(
+            group=row.get("group", doc.get("group", doc["label"])),
+            name=row["name"],
+            monthly=row["monthly"],
+            annual=row.get("annual"),
+            tag=row["tag"],
+            cls=row["cls"],
+            note_ja=row["note_ja"],
+            note_en=row["note_en"],
+        )
+        plans.append(PlanSpec(
+            group=template.group,
+            name=template.name,
+            monthly=template.monthly,
+            row=template,
+            patterns=tuple(compile_patterns(row.get("patterns", []))),
+        ))
+    return tuple(plans)
+
+
+def _probe(models: Sequence[ModelSpec], plans: Sequence[PlanSpec]) -> tuple[ProbeRow, ...]:
+    """scrape_models() / scrape_plans() が extract_price() に渡すのと同じ条件を並べる。"""
+    probe = [
+        ProbeRow(tuple(m.patterns[field]), m.anchor, m.name, field)
+        for m in models if m.patterns is not None
+        for field in ("input", "output")
+    ]
+    probe += [ProbeRow(p.patterns, model=p.name) for p in plans if p.patterns]
+    return tuple(row for row in probe if row.patterns)
+
+
+def _read_doc(name: str) -> dict[str, Any]:
+    source = resources.files(__package__).joinpath("specs", f"{name}.toml")
+    return tomllib.loads(source.read_text(encoding="utf-8"))
+
+
+def _doc_digest(doc: dict[str, Any]) -> str:
+    """仕様の内容のハッシュ（コメントや書式の違いは無視する）。"""
+    canonical = json.dumps(doc, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+@functools.cache
+def load_spec(name: str) -> PageSpec:
+    """specs/<name>.toml を読み込む（名前ごとに 1 度だけ）。"""
+    doc = _read_doc(name)
+    try:
+        policy = DEFAULT_POLICY
+        if doc.get("block_domains") or doc.get("allow_domains"):
+            policy = DEFAULT_POLICY.extend(
+                block_domains=tuple(doc.get("block_domains", ())),
+                allow_domains=tuple(doc.get("allow_domains", ())),
+            )
+        models = _parse_models(doc) if "models" in doc else ()
+        plans = _parse_plans(doc) if "plans" in doc else ()
+        return PageSpec(
+            name=name,
+            label=doc["label"],
+            url=doc["url"],
+            probe=_probe(models, plans),
+            policy=policy,
+            timeout_ms=doc.get("timeout_ms", _DEFAULT_TIMEOUT_MS),
+            models=models,
+            plans=plans,
+            source_digest=_doc_digest(doc),
+        )
+    except (KeyError, IndexError, TypeError, ValidationError) as exc:
+        raise ValueError(f"specs/{name}.toml の形式が不正です: {exc!r}") from exc
+
+
+def _fetch(spec: PageSpec, fetch: PageFetcher) -> str | None:
+    logger.info("%s: スクレイピング開始 %s", spec.label, spec.url)
+    try:
+        return fetch(spec.url, timeout_ms=spec.timeout_ms, policy=spec.policy, probe=spec.probe)
+    except Exception as exc:
+        logger.warning("%s: ページ取得失敗 %s → fallback", spec.label, exc)
+        return None
+
+
+def scrape_models(
+    spec: PageSpec,
+    existing: list[ApiModel] | None = None,
+    fetch: PageFetcher = get_page_text,
+) -> list[ApiModel]:
+    """spec のページから API モデルの価格を取得する。
+
+    既存データの値をフォールバックとして優先し、なければ仕様の値を使う。
+    fetch はページ取得関数（各モジュールの get_page_text を渡す）。
+    """
+    fallback_map: dict[tuple[str, str], tuple[float, float]] = {
+        (m.provider, m.name): (m.price_in, m.price_out) for m in spec.models
+    }
+    for m in existing or ():
+        if (m.provider, m.name) in fallback_map:
+            fallback_map[(m.provider, m.name)] = (m.price_in, m.price_out)
+
+    html = _fetch(spec, fetch)
+    if html is not None:
+        # 全モデルのアンカーをページ 1 回の走査でまとめて探す
+        expect_anchors(html, [m.anchor for m in spec.models if m.patterns is not None])
+    models: list[ApiModel] = []
+    for m in spec.models:
+        fb_in, fb_out = fallback_map[(m.provider, m.name)]
+        # 抽出対象外の行は仕様（手で保守する値）のまま
+        status = "fallback" if m.patterns is not None else "manual"
+        if html is not None and m.patterns is not None:
+            in_price = extract_price(
+                html, m.patterns["input"], anchor=m.anchor, model=m.name, field="input",
+            )
+            out_price = extract_price(
+                html, m.patterns["output"], anchor=m.anchor, model=m.name, field="output",
+            )
+            fb_in, si = sanity_check(in_price, f"{spec.label}/{m.name}/in", fb_in)
+            fb_out, so = sanity_check(out_price, f"{spec.label}/{m.name}/out", fb_out)
+            status = si if si == so else "fallback"
+        elif html is not None:
+            logger.info("%s: フォールバック値を使用", m.name)
+        models.append(m.row.model_copy(
+            update={"price_in": fb_in, "price_out": fb_out, "scrape_status": status},
+        ))
+    return models
+
+
+def scrape_plans(
+    spec: PageSpec,
+    existing: list[SubTool] | None = None,
+    fetch: PageFetcher = get_page_text,
+) -> list[SubTool]:
+    """spec のページからサブスクリプションの月額を取得する。
+
+    月額は既存データの値をフォールバックとして優先する。年払いはページから
+    取らないので、常に仕様の値を使う。
+    """
+    fallback_map: dict[tuple[str, str], float] = {
+        (p.group, p.name): p.monthly for p in spec.plans
+    }
+    for t in existing or ():
+        if (t.group, t.name) in fallback_map:
+            fallback_map[(t.group, t.name)] = t.monthly
+
+    html = _fetch(spec, fetch)
+    tools: list[SubTool] = []
+    for p in spec.plans:
+        monthly = fallback_map[(p.group, p.name)]
+        status = "fallback" if p.patterns else "manual"
+        if html is not None and p.patterns:
+            price = extract_price(html, p.patterns, model=p.name)
+            if price is not None:
+                monthly, status = sanity_check(price, f"{spec.label}/{p.name}/monthly", monthly)
+        tools.append(p.row.model_copy(update={"monthly": monthly, "scrape_status": status}))
+    return tools
@@ -1,33 +1,134 @@
-"""USD/JPY 為替レートを Frankfurter API から取得する。
+"""USD 建ての為替レートを Frankfurter API から取得する。
 
 Frankfurter (https://www.frankfurter.app) は ECB データを使用する
 APIキー不要の無料パブリック API。
-失敗時は既存の pricing.json の値をフォールバックとして使用。
+1 回のリクエストで全通貨のレートを取得し、ECB の公表日をキーに
+ディスクへ記録する（configure_rate_cache() で記録先を設定した場合）。
+ECB は営業日の 16:00 (CET) 頃に 1 日 1 回公表するため、前回の公表日の
+次の公表時刻まではネットワークに出ない。公表時刻を過ぎても新しいレートが
+出ていなければ（遅延・祝日）、_LATE_RECHECK ごとに確認し直す。
+失敗時は記録済みのレート、それもなければ既存の pricing.json の値を使用。
 """
 
 from __future__ import annotations
+import json
 import logging
-from datetime import date as dt_date
+import time
+from datetime import date as dt_date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Literal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-import httpx
+from scraper import http_client
 
 logger = logging.getLogger(__name__)
 
-# Frankfurter API: ECB の公式レートを使用、APIキー不要
-_FRANKFURTER_URL = "https://api.frankfurter.app/latest?from=USD&to=JPY"
+# Frankfurter API: ECB の公式レートを使用、APIキー不要（to を付けず全通貨を取得）
+_FRANKFURTER_URL = "https://api.frankfurter.app/latest?from=USD"
 
+# ECB の公表時刻（現地時間）。祝日は考慮しない（_LATE_RECHECK ごとの再確認で吸収する）
+_ECB_PUBLISH_HOUR = 16
+try:
+    _ECB_TZ = ZoneInfo("Europe/Berlin")
+except ZoneInfoNotFoundError:      # tzdata のない環境では冬時間で近似
+    _ECB_TZ = timezone(timedelta(hours=1))
 
-def fetch_jpy_rate(fallback: float = 155.0) -> tuple[float, str]:
-    """(rate, date) を返す。失敗時は (fallback, 'fallback') を返す。"""
+# 公表時刻を過ぎても公表日が変わらなかった場合に、次に確認するまでの間隔
+_LATE_RECHECK = timedelta(hours=1)
+
+RateSource = Literal["cache", "network", "stale-cache"]
+
+_rate_cache_path: Path | None = None
+
+
+def configure_rate_cache(path: Path | None) -> None:
+    """為替レートの記録先を設定する（None で記録せず毎回取得する）。"""
+    global _rate_cache_path
+    _rate_cache_path = path
+
+
+def next_publication_after(moment: datetime) -> datetime:
+    """moment より後で最初に ECB の公表があり得る時刻（平日 16:00 CET）。"""
+    local = moment.astimezone(_ECB_TZ)
+    day = local.date()
+    while True:
+        candidate = datetime(day.year, day.month, day.day, _ECB_PUBLISH_HOUR, tzinfo=_ECB_TZ)
+        if day.weekday() < 5 and candidate > local:
+            return candidate
+        day += timedelta(days=1)
+
+
+def _load_cache() -> dict | None:
+    if _rate_cache_path is None or not _rate_cache_path.exists():
+        return None
+    try:
+        cached = json.loads(_rate_cache_path.read_text(encoding="utf-8"))
+        dt_date.fromisoformat(cached["date"])
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("為替レート記録の読み込み失敗 (%s): %s", _rate_cache_path, exc)
+        return None
+    return cached if isinstance(cached.get("rates"), dict) else None
+
+
+def _save_cache(data: dict) -> None:
+    if _rate_cache_path is None:
+        return
+    _rate_cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _rate_cache_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(_rate_cache_path)
+
+
+def _is_current(cached: dict, now: datetime) -> bool:
+    """記録したレートをそのまま使ってよいなら True。
+
+    記録した公表日の次の公表時刻まではそのまま使う。公表時刻を過ぎてから
+    確認しても公表日が変わらなかった場合（公表の遅れ・祝日）は、
+    その確認から _LATE_RECHECK の間だけ使い、その後は確認し直す。
+    """
+    published = dt_date.fromisoformat(cached["date"])
+    published_at = datetime(
+        published.year, published.month, published.day, _ECB_PUBLISH_HOUR, tzinfo=_ECB_TZ,
+    )
+    due = next_publication_after(published_at)
+    if now < due:
+        return True
+    checked_at = datetime.fromtimestamp(cached.get("checked_at", 0), timezone.utc)
+    return checked_at >= due and now < checked_at + _LATE_RECHECK
+
+
+def fetch_rates() -> tuple[dict[str, float], str, RateSource]:
+    """USD 基準の全通貨レートを (rates, ECB 公表日, 取得元) で返す。
+
+    取得できず記録もない場合は例外を送出する。
+    """
+    cached = _load_cache()
+    if cached and _is_current(cached, datetime.now(timezone.utc)):
+        return cached["rates"], cached["date"], "cache"
     try:
-        resp = httpx.get(_FRANKFURTER_URL, timeout=15)
+        resp = http_client.get(_FRANKFURTER_URL, timeout=15)
         resp.raise_for_status()
         data = resp.json()
-        # {"amount": 1.0, "base": "USD", "date": "2026-02-21", "rates": {"JPY": 155.22}}
-        rate: float = data["rates"]["JPY"]
+        # {"amount": 1.0, "base": "USD", "date": "2026-02-21", "rates": {"EUR": 0.92, "JPY": 155.22, ...}}
+        rates: dict[str, float] = data["rates"]
         date_str: str = data.get("date", str(dt_date.today()))
-        logger.info("USD/JPY rate fetched: %.2f (date: %s)", rate, date_str)
+    except Exception:
+        if cached:
+            logger.warning("Frankfurter API fetch failed — using cached rates from %s", cached["date"])
+            return cached["rates"], cached["date"], "stale-cache"
+        raise
+    _save_cache({"date": date_str, "base": "USD", "rates": rates, "checked_at": time.time()})
+    return rates, date_str, "network"
+
+
+def fetch_jpy_rate(fallback: float = 155.0) -> tuple[float, str]:
+    """(rate, date) を返す。失敗時は (fallback, 'fallback') を返す。"""
+    try:
+        rates, date_str, source = fetch_rates()
+        rate: float = rates["JPY"]
+        logger.info("USD/JPY rate: %.2f (date: %s, source: %s)", rate, date_str, source)
         return rate, date_str
     except Exception as exc:
         logger.warning("Frankfurter API fetch failed: %s — using fallback %.2f", exc, fallback)
+    logger.info("USD/JPY rate: %.2f (source: fallback)", fallback)
     return fallback, "fallback"
@@ -0,0 +1,183 @@
+"""ブラウザを使わない HTTP 取得の共通クライアント。
+
+実行中は http_session() で 1 つの httpx.Client を共有し、接続をプールして
+keep-alive で再利用する。HTTP/2 は依存関係 httpx[http2] の h2 パッケージで使う
+（h2 がない環境では警告して HTTP/1.1 で接続する）。
+接続エラーと 429 / 5xx は、指数バックオフ＋ジッターで上限回数まで再試行する。
+静的 HTTP の取得は全てモジュール関数 get() / stream() を経由すること。
+セッション外の呼び出しは、その呼び出し専用の一時クライアントを使う（共有しない）。
+"""
+
+from __future__ import annotations
+import importlib.util
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from scraper import metrics, replay
+
+logger = logging.getLogger(__name__)
+
+_HTTP2 = importlib.util.find_spec("h2") is not None
+if not _HTTP2:      # クライアントごとではなく、読み込み時に 1 度だけ警告する
+    logger.warning("h2 パッケージがないため HTTP/1.1 で接続します（httpx[http2] を入れてください）")
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 4
+_BACKOFF_BASE_S = 0.5
+_BACKOFF_CAP_S = 8.0
+
+_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+_DEFAULT_TIMEOUT = 30.0
+
+
+@dataclass
+class HttpStats:
+    """リクエスト数と新規接続数。差が keep-alive で再利用した分。"""
+
+    requests: int = 0
+    connections: int = 0
+    retries: int = 0
+
+    @property
+    def reused(self) -> int:
+        return max(0, self.requests - self.connections)
+
+
+def _backoff_delay(attempt: int, retry_after: str | None) -> float:
+    """attempt 回目の失敗後の待ち時間（Full Jitter。Retry-After 秒指定があれば従う）。"""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), _BACKOFF_CAP_S)
+    return random.uniform(0, min(_BACKOFF_CAP_S, _BACKOFF_BASE_S * 2 ** (attempt - 1)))
+
+
+class HttpSession:
+    """1 回の実行で共有する httpx.Client と、その接続統計。"""
+
+    def __init__(self) -> None:
+        self.stats = HttpStats()
+        self._lock = threading.Lock()
+        # 記録・再生中（replay.configure_replay()）はトランスポートを差し替える
+        self._client = httpx.Client(
+            transport=replay.http_transport(httpx.HTTPTransport(http2=_HTTP2, limits=_LIMITS)),
+            timeout=_DEFAULT_TIMEOUT,
+            follow_redirects=True,
+            trust_env=replay.replay_mode() != "replay",
+        )
+
+    def _trace(self, event: str, info: dict[str, Any]) -> None:
+        # httpcore は新しい接続を張るときだけ connect_tcp を通る
+        if event == "connection.connect_tcp.started":
+            with self._lock:
+                self.stats.connections += 1
+
+    def _with_retries(self, url: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            with self._lock:
+                self.stats.requests += 1
+            retry_after = None
+            try:
+                resp = send()
+            except httpx.TransportError as exc:
+                if attempt == _MAX_ATTEMPTS:
+                    raise
+                reason = f"{type(exc).__name__}: {exc}"
+            else:
+                if resp.status_code not in _RETRY_STATUSES or attempt == _MAX_ATTEMPTS:
+                    return resp
+                reason = f"HTTP {resp.status_code}"
+                retry_after = resp.headers.get("Retry-After")
+                resp.close()
+            delay = _backoff_delay(attempt, retry_after)
+            with self._lock:
+                self.stats.retries += 1
+            logger.info("%s: %s → %.1f 秒後に再試行 (%d/%d)", url, reason, delay, attempt, _MAX_ATTEMPTS - 1)
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        resp = self._with_retries(
+            url, lambda: self._client.get(url, extensions={"trace": self._trace}, **kwargs),
+        )
+        metrics.record(bytes_downloaded=resp.num_bytes_downloaded)
+        return resp
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs: Any) -> Iterator[httpx.Response]:
+        """レスポンスを開くまでを再試行する。本文の読み込み中の失敗は再試行しない。"""
+        follow_redirects = kwargs.pop("follow_redirects", True)
+        request = self._client.build_request(method, url, extensions={"trace": self._trace}, **kwargs)
+        resp = self._with_retries(
+            url, lambda: self._client.send(request, stream=True, follow_redirects=follow_redirects),
+        )
+        try:
+            yield resp
+        finally:
+            resp.close()
+            metrics.record(bytes_downloaded=resp.num_bytes_downloaded)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def log_summary(self) -> None:
+        s = self.stats
+        logger.info(
+            "HTTP: %d リクエスト / 新規接続 %d・再利用 %d / 再試行 %d (HTTP/2 %s)",
+            s.requests, s.connections, s.reused, s.retries, "有効" if _HTTP2 else "無効",
+        )
+
+
+_session: HttpSession | None = None
+
+
+@contextmanager
+def http_session() -> Iterator[HttpSession]:
+    """実行単位の HTTP セッションを開く。既に開いていればそれを使う。"""
+    global _session
+    if _session is not None:
+        yield _session
+        return
+    session = HttpSession()
+    _session = session
+    try:
+        yield session
+    finally:
+        _session = None
+        session.close()
+
+
+@contextmanager
+def _current_session() -> Iterator[HttpSession]:
+    """開いているセッション。なければこの呼び出し専用の一時セッション。
+
+    一時セッションは _session に置かない（他のスレッドが使っている間に閉じないように）。
+    """
+    session = _session
+    if session is not None:
+        yield session
+        return
+    session = HttpSession()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get(url: str, **kwargs: Any) -> httpx.Response:
+    """GET して本文を読み終えたレスポンスを返す。セッション外なら一時クライアントを使う。"""
+    with _current_session() as session:
+        return session.get(url, **kwargs)
+
+
+@contextmanager
+def stream(method: str, url: str, **kwargs: Any) -> Iterator[httpx.Response]:
+    """本文をストリームで読むレスポンスを開く。セッション外なら一時クライアントを使う。"""
+    with _current_session() as session, session.stream(method, url, **kwargs) as resp:
+        yield resp
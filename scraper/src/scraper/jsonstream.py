@@ -0,0 +1,191 @@
+"""巨大な JSON をチャンク単位で読み、必要な部分だけをデコードするストリームパーサー。
+
+iter_members() は指定したパスにあるオブジェクトのメンバーを 1 件ずつ返す。
+それ以外の値は構文だけを追って読み飛ばし、デコードもバッファへの保持もしない。
+読み飛ばしは括弧以外の部分と閉じた文字列を正規表現でまとめて進めるので、
+Python のループは括弧 1 つにつき 1 回で済む。
+"""
+
+from __future__ import annotations
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+JsonPath = tuple[str, ...]
+
+# 括弧以外の文字と、閉じた文字列をまとめて読み進める（括弧 1 つごとに 1 回照合）
+_SKIP_RE = re.compile(r'(?:[^"{}\[\]]++|"(?:[^"\\]++|\\.)*+")*+')
+_STRING_END_RE = re.compile(r'["\\]')
+_SCALAR_RE = re.compile(r"[^,}\]\s]*")
+_NON_WS_RE = re.compile(r"\S")
+# 数値の直後に来たら、その数値がチャンク境界で途切れている可能性がある文字
+_NUMBER_CONT_CHARS = frozenset("0123456789.eE+-")
+
+_DECODER = json.JSONDecoder()
+
+# 読み終えた部分をバッファから捨てる閾値
+_COMPACT_CHARS = 1 << 16
+
+
+class _Reader:
+    """チャンク列の上のカーソル。mark 以降はデコード用にバッファに残す。"""
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self.buf = ""
+        self.pos = 0
+        self.mark: int | None = None
+
+    def fill(self) -> bool:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        keep = self.pos if self.mark is None else self.mark
+        if keep >= _COMPACT_CHARS or keep == len(self.buf):
+            self.buf = self.buf[keep:]
+            self.pos -= keep
+            if self.mark is not None:
+                self.mark -= keep
+        self.buf += chunk
+        return True
+
+    def _need_more(self) -> None:
+        if not self.fill():
+            raise ValueError("JSON が途中で終わっています")
+
+    def peek(self) -> str:
+        """空白を飛ばして次の文字を返す（消費しない）。"""
+        while True:
+            m = _NON_WS_RE.search(self.buf, self.pos)
+            if m:
+                self.pos = m.start()
+                return m.group()
+            self.pos = len(self.buf)
+            self._need_more()
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"{char!r} が必要な位置に {found!r} があります")
+        self.pos += 1
+
+    def _skip_string_body(self) -> None:
+        """開き引用符の直後から、閉じ引用符の直後まで進める。"""
+        while True:
+            m = _STRING_END_RE.search(self.buf, self.pos)
+            if m is None:
+                self.pos = len(self.buf)
+                self._need_more()
+            elif m.group() == '"':
+                self.pos = m.end()
+                return
+            elif m.end() < len(self.buf):
+                self.pos = m.end() + 1        # エスケープされた 1 文字を飛ばす
+            else:
+                self.pos = m.start()
+                self._need_more()
+
+    def skip_value(self) -> None:
+        first = self.peek()
+        if first == '"':
+            self.pos += 1
+            self._skip_string_body()
+        elif first in "{[":
+            depth = 0
+            while True:
+                end = _SKIP_RE.match(self.buf, self.pos).end()
+                # バッファ末尾に達したか、閉じていない文字列で止まった
+                if end == len(self.buf) or self.buf[end] == '"':
+                    self.pos = end
+                    self._need_more()
+                    continue
+                self.pos = end + 1
+                if self.buf[end] in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        else:
+            while True:
+                m = _SCALAR_RE.match(self.buf, self.pos)
+                if m.end() < len(self.buf) or not self.fill():
+                    self.pos = m.end()
+                    return
+
+    def read_value(self) -> Any:
+        """次の値をデコードして返す。バッファ内で値が途切れていれば読み足して再試行する。"""
+        self.peek()
+        self.mark = self.pos
+        try:
+            while True:
+                try:
+                    value, end = _DECODER.raw_decode(self.buf, self.mark)
+                except json.JSONDecodeError:
+                    if not self.fill():
+                        raise
+                    continue
+                # 数値は途中で途切れていても（"1." や "-1.5e-" の手前まで）デコードできてしまう
+                if (
+                    isinstance(value, (int, float))
+                    and (end == len(self.buf) or self.buf[end] in _NUMBER_CONT_CHARS)
+                    and self.fill()
+                ):
+                    continue
+                self.pos = end
+                return value
+        finally:
+            self.mark = None
+
+    def read_string(self) -> str:
+        if self.peek() != '"':
+            raise ValueError("オブジェクトのキーが文字列ではありません")
+        return self.read_value()
+
+
+def iter_members(
+    chunks: Iterable[str],
+    paths: Sequence[JsonPath],
+    want: Callable[[JsonPath, str], bool] | None = None,
+) -> Iterator[tuple[JsonPath, str, Any]]:
+    """paths にあるオブジェクトのメンバーを (パス, キー, 値) として順に返す。
+
+    want(パス, キー) が False のメンバーはデコードせずに読み飛ばす。
+    paths に含まれない部分は全て読み飛ばす。
+    """
+    reader = _Reader(chunks)
+    targets = set(paths)
+    if reader.peek() == "{":
+        yield from _walk_object(reader, (), targets, want)
+
+
+def _walk_object(
+    reader: _Reader,
+    path: JsonPath,
+    targets: set[JsonPath],
+    want: Callable[[JsonPath, str], bool] | None,
+) -> Iterator[tuple[JsonPath, str, Any]]:
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.read_string()
+        reader.expect(":")
+        child = path + (key,)
+        if path in targets:
+            if want is None or want(path, key):
+                yield path, key, reader.read_value()
+            else:
+                reader.skip_value()
+        elif reader.peek() == "{" and any(t[:len(child)] == child for t in targets):
+            yield from _walk_object(reader, child, targets, want)
+        else:
+            reader.skip_value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == "}":
+            return
+        if char != ",":
+            raise ValueError(f"',' か '}}' が必要な位置に {char!r} があります")
@@ -1,23 +1,65 @@
 """スクレイパー CLI エントリポイント。
 
 Usage:
-    uv run python -m scraper.main [--output PATH] [--no-scrape]
+    uv run python -m scraper.main [--output PATH] [--no-scrape] [--concurrency N]
+                                  [--no-block-resources] [--cache-dir DIR]
+                                  [--cache-ttl DURATION] [--only NAMES] [--skip NAMES]
+                                  [--stale-after DURATION] [--metrics-out PATH]
+                                  [--profile DIR [--profile-trace]] [--record DIR | --replay DIR]
 
 --output: 出力先 JSON パス (デフォルト: ../../pricing.json)
 --no-scrape: スクレイピングをスキップし、既存値 or フォールバック値のみで出力
+--concurrency: 同時に実行するスクレイパー数 (デフォルト: 1 = 逐次)
+--no-block-resources: 画像・フォント・解析スクリプト等の遮断を無効化 (効果測定用)
+--cache-dir: ページキャッシュや取得方式の記録を保存するディレクトリ (デフォルト: scraper/.cache)
+--cache-ttl: ブラウザ描画結果を再利用する期間 (例: 30m, 1h, 0 で無効。デフォルト: 1h)
+--only: 指定したスクレイパーだけを実行 (例: anthropic,aws)。他は既存値を維持
+--skip: 指定したスクレイパーを実行せず既存値を維持
+--stale-after: 最後の成功がこれより古いか fallback を含むスクレイパーだけを実行 (例: 24h)
+               最後に実行した日時は --cache-dir の scraper_checked.json に記録する
+--metrics-out: スクレイパーごとの所要時間・転送量・抽出 CPU 時間等と合計を JSON で書き出す
+--profile: スクレイパーごとの cProfile 結果 (<名前>.prof / .txt) を DIR に書き出す (逐次実行になる)
+--profile-trace: --profile に加え、ブラウザで開いたページごとの Playwright トレースを DIR/traces に書き出す
+--record: ブラウザ・HTTP の全レスポンスを DIR に記録する (キャッシュを使わず全て取得する)
+--replay: --record で記録した DIR からレスポンスを返し、ネットワークなしで同じ入力を再実行する
 """
 
 from __future__ import annotations
 import argparse
+import asyncio
 import json
 import logging
+import os
+import re
 import sys
-from datetime import datetime, timezone
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import TypeVar, Callable
+from typing import Any, TypeVar, Callable
 
-from scraper.exchange import fetch_jpy_rate
+from scraper import engine
+from scraper.browser import (
+    browser_session, configure_tier_store, extraction_tiers, page_traffic, text_sizes,
+)
+from scraper.cache import configure_page_cache, page_cache
+from scraper.exchange import configure_rate_cache, fetch_jpy_rate
+from scraper.http_client import http_session
+from scraper.manifest import (
+    ExtractionManifest,
+    active_manifest,
+    configure_manifest,
+    manifest_path,
+    scraper_scope,
+)
+from scraper.metrics import ScraperMetrics, log_summary, measure, scraper_metrics, write_report
 from scraper.models import ApiModel, PricingData, SubTool
+from scraper.patterns import registry
+from scraper.profiling import configure_profiling, profiling_enabled, run_profiled
+from scraper.replay import configure_replay
+from scraper.providers import aws
 from scraper.providers import (
     scrape_anthropic,
     scrape_openai,
@@ -45,8 +87,35 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 _DEFAULT_OUTPUT = Path(__file__).parent.parent.parent.parent.parent / "pricing.json"
+_DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache"
+# web フロントエンドが読み込むデータのコピー先（ディレクトリがあるときだけ書く）
+_WEB_DATA_PATH = (
+    Path(__file__).parent.parent.parent.parent.parent / "web" / "src" / "data" / "pricing.json"
+)
 
 T = TypeVar("T")
+E = TypeVar("E")
+
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+# pricing.json に書く API 価格の小数点以下の桁数
+_PRICE_DIGITS = 6
+
+
+def _parse_duration(value: str) -> timedelta:
+    """'90', '30m', '24h', '7d' 形式の期間を timedelta に変換する（単位省略時は秒）。"""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", value)
+    if not m:
+        raise argparse.ArgumentTypeError(f"期間の形式が不正です: {value!r} (例: 30m, 24h)")
+    return timedelta(**{_DURATION_UNITS[m.group(2) or "s"]: float(m.group(1))})
+
+
+def _parse_names(value: str) -> list[str]:
+    """'anthropic, aws' 形式のカンマ区切りリストを名前のリストにする。"""
+    names = [n.strip().lower().replace("-", "_") for n in value.split(",") if n.strip()]
+    if not names:
+        raise argparse.ArgumentTypeError("スクレイパー名を 1 つ以上指定してください")
+    return names
 
 
 def _load_existing(output_path: Path) -> PricingData | None:
@@ -54,83 +123,381 @@ def _load_existing(output_path: Path) -> PricingData | None:
     if not output_path.exists():
         return None
     try:
-        with output_path.open(encoding="utf-8") as f:
-            return PricingData.model_validate(json.load(f))
+        # 中間の dict を作らずに JSON から直接検証する
+        return PricingData.model_validate_json(output_path.read_bytes())
     except Exception as exc:
         logger.warning("既存 pricing.json の読み込み失敗: %s", exc)
         return None
 
 
-def _run_scraper(fn: Callable[[], list[T]], label: str, dest: list[T]) -> None:
-    """スクレイパー 1 件を安全に実行し dest に追加する。"""
+async def _run_scraper(
+    fn: Callable[[E], list[T]], existing: E, label: str, limit: asyncio.Semaphore
+) -> list[T]:
+    """スクレイパー 1 件をワーカースレッドで安全に実行し、結果を返す。
+
+    クラッシュしても他のスクレイパーに影響しないよう空リストを返す。
+    抽出結果はスクレイパーのコードハッシュ（モジュール・仕様・抽出処理）に紐付けて記録する。
+    所要時間・転送量などはスクレイパー名ごとに計測する（scraper_metrics()）。
+    プロファイル有効時はスクレイパー名で cProfile の結果を書き出す。
+    """
+    name = _scraper_name(fn)
+    async with limit:
+        with measure(name, label) as stats:
+            try:
+                with scraper_scope(fn.__module__):
+                    result = await asyncio.to_thread(run_profiled, name, fn, existing)
+            except Exception as exc:
+                logger.error("%s: スクレイパークラッシュ %s", label, exc)
+                return []
+            _stamp_scraped_at(result, existing, datetime.now(timezone.utc))
+            success = sum(1 for m in result if getattr(m, "scrape_status", "") == "success")
+            stats.rows, stats.success = len(result), success
+    logger.info("%s: %d件取得 (%d件 success, %.1f 秒)", label, len(result), success, stats.wall_s)
+    return result
+
+
+async def _run_or_keep(
+    fn: Callable[[E], list[T]],
+    existing: Any,
+    label: str,
+    limit: asyncio.Semaphore,
+    selected: set[str] | None,
+) -> list[T]:
+    """selected に含まれないスクレイパーは実行せず、既存の行をそのまま返す。
+
+    実行したがクラッシュした（0 件）場合も既存の行を残すが、次回の
+    --stale-after で再実行されるよう scrape_status を fallback にする。
+    """
+    name = _scraper_name(fn)
+    if selected is not None and name not in selected:
+        kept = _owned_rows(name, existing)
+        logger.info("%s: スキップ（既存 %d 件を維持）", label, len(kept))
+        return kept
+    result = await _run_scraper(fn, existing, label, limit)
+    if result:
+        return result
+    return [
+        r if r.scrape_status == "manual" else r.model_copy(update={"scrape_status": "fallback"})
+        for r in _owned_rows(name, existing)
+    ]
+
+
+def _scraper_name(fn: Callable[..., object]) -> str:
+    """--only / --skip で使うスクレイパー名（モジュール名。例: "anthropic"）。"""
+    return fn.__module__.rsplit(".", 1)[-1]
+
+
+def _row_key(row: ApiModel | SubTool) -> tuple[str, str]:
+    return (row.provider, row.name) if isinstance(row, ApiModel) else (row.group, row.name)
+
+
+def _row_values(row: ApiModel | SubTool) -> tuple[Any, ...]:
+    """scraped_at を付け直すかの比較に使う値（状態と、出力時に丸めた価格）。"""
+    if isinstance(row, ApiModel):
+        return row.scrape_status, round(row.price_in, _PRICE_DIGITS), round(row.price_out, _PRICE_DIGITS)
+    return row.scrape_status, row.monthly, row.annual
+
+
+def _stamp_scraped_at(rows: list[Any], existing: list[Any] | None, now: datetime) -> None:
+    """成功した行のうち、価格か状態が既存の行から変わった行に今回の日時を付ける。
+
+    それ以外の行は既存の行の日時を引き継ぐ。変わっていない行まで毎回
+    付け直すと、pricing.json が実行のたびに変わってしまう。
+    """
+    previous = {_row_key(r): r for r in existing or ()}
+    stamp = now.isoformat(timespec="seconds")
+    for row in rows:
+        status = getattr(row, "scrape_status", None)
+        if status is None:
+            continue
+        before = previous.get(_row_key(row))
+        if status == "success" and (
+            before is None or before.scraped_at is None or _row_values(before) != _row_values(row)
+        ):
+            row.scraped_at = stamp
+        elif row.scraped_at is None and before is not None:
+            row.scraped_at = before.scraped_at
+
+
+_API_SCRAPERS: list[tuple[Callable[[list[ApiModel] | None], list[ApiModel]], str]] = [
+    (scrape_anthropic, "Anthropic"),
+    (scrape_openai,    "OpenAI"),
+    (scrape_google,    "Google AI / Vertex AI"),
+    (scrape_aws,       "AWS Bedrock"),
+    (scrape_deepseek,  "DeepSeek"),
+    (scrape_xai,       "xAI"),
+]
+
+_TOOL_SCRAPERS: list[tuple[Callable[[list[SubTool] | None], list[SubTool]], str]] = [
+    (scrape_github_copilot, "GitHub Copilot"),
+    (scrape_cursor,         "Cursor"),
+    (scrape_windsurf,       "Windsurf"),
+    (scrape_claude_code,    "Claude Code"),
+    (scrape_jetbrains,      "JetBrains AI / Junie"),
+    (scrape_openai_codex,   "OpenAI Codex"),
+    (scrape_google_one,     "Google One AI"),
+    (scrape_antigravity,    "Antigravity"),
+]
+
+
+
+def _scraper_names() -> list[str]:
+    return [_scraper_name(fn) for fn, _ in [*_API_SCRAPERS, *_TOOL_SCRAPERS]]
+
+
+def _scraper_rows() -> dict[str, tuple[str, ...]]:
+    """スクレイパー名 → そのスクレイパーが出力する行の provider（API）/ group（ツール）。
+
+    仕様で動くスクレイパーは specs/<名前>.toml の行から、AWS はモジュールの定数から作る。
+    """
+    rows = {"aws": (aws.PROVIDER,)}
+    for name in _scraper_names():
+        if name not in rows:
+            rows[name] = engine.load_spec(name).owners
+    return rows
+
+
+_SCRAPER_ROWS = _scraper_rows()
+
+
+def _run_metrics() -> list[ScraperMetrics]:
+    """この実行で計測したスクレイパーの値を _API_SCRAPERS / _TOOL_SCRAPERS の定義順で返す。"""
+    measured = scraper_metrics()
+    return [measured[name] for name in _scraper_names() if name in measured]
+
+
+def _owned_rows(name: str, rows: list[Any] | None) -> list[Any]:
+    """既存データのうち、スクレイパー name が出力した行。"""
+    owners = _SCRAPER_ROWS.get(name, ())
+    return [
+        r for r in rows or ()
+        if (r.provider if isinstance(r, ApiModel) else r.group) in owners
+    ]
+
+
+def _is_stale(
+    rows: list[ApiModel] | list[SubTool],
+    stale_after: timedelta,
+    now: datetime,
+    checked_at: datetime | None = None,
+) -> bool:
+    """既存の行が無い・fallback を含む・最後の成功が stale_after より古いなら True。
+
+    scraped_at は値が変わったときだけ更新されるので、成功した行は
+    スクレイパーを最後に実行した日時（checked_at）でも新しさを判定する。
+    """
+    if not rows:
+        return True
+    for row in rows:
+        if row.scrape_status == "fallback":
+            return True
+        if row.scrape_status == "manual":
+            continue
+        last = checked_at
+        if row.scraped_at is not None:
+            try:
+                scraped_at = datetime.fromisoformat(row.scraped_at)
+            except ValueError:
+                scraped_at = None
+            if scraped_at is not None and (last is None or scraped_at > last):
+                last = scraped_at
+        if last is None or now - last > stale_after:
+            return True
+    return False
+
+
+def _load_checked(path: Path | None) -> dict[str, datetime]:
+    """スクレイパー名 → 最後に実行して行を返した日時の記録を読む。"""
+    if path is None or not path.exists():
+        return {}
     try:
-        result = fn()
-        dest.extend(result)
-        success = sum(1 for m in result if getattr(m, "scrape_status", "") == "success")
-        logger.info("%s: %d件取得 (%d件 success)", label, len(result), success)
-    except Exception as exc:
-        logger.error("%s: スクレイパークラッシュ %s", label, exc)
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return {name: datetime.fromisoformat(stamp) for name, stamp in raw.items()}
+    except (OSError, ValueError, AttributeError, TypeError) as exc:
+        logger.warning("スクレイパー実行記録の読み込み失敗 (%s): %s", path, exc)
+        return {}
+
+
+def _save_checked(path: Path | None, checked: dict[str, datetime]) -> None:
+    if path is None:
+        return
+    raw = {name: stamp.isoformat(timespec="seconds") for name, stamp in sorted(checked.items())}
+    _write_atomic(path, json.dumps(raw, indent=2).encode("utf-8"))
+
+
+def _select_scrapers(
+    existing: PricingData,
+    only: list[str] | None,
+    skip: list[str] | None,
+    stale_after: timedelta | None,
+    now: datetime,
+    checked: dict[str, datetime] | None = None,
+) -> set[str]:
+    """--only / --skip / --stale-after から今回実行するスクレイパー名を決める。
+
+    checked はスクレイパー名 → 最後に実行して行を返した日時（_load_checked()）。
+    """
+    selected = set(only) if only else set(_scraper_names())
+    selected -= set(skip or ())
+    if stale_after is not None:
+        selected = {
+            name for name in selected
+            if _is_stale(
+                _owned_rows(name, existing.api_models) or _owned_rows(name, existing.sub_tools),
+                stale_after, now, (checked or {}).get(name),
+            )
+        }
+    return selected
 
 
 def _scrape_all(
     existing_api: list[ApiModel] | None,
     existing_tools: list[SubTool] | None,
+    concurrency: int = 1,
+    block_resources: bool = True,
+    selected: set[str] | None = None,
+) -> tuple[list[ApiModel], list[SubTool]]:
+    """全プロバイダーをスクレイピングして (api_models, sub_tools) を返す。
+
+    Chromium は実行全体で 1 つだけ起動し、各スクレイパーで共有する。
+    concurrency 件までのスクレイパーを並行実行するが、出力順は常に
+    _API_SCRAPERS / _TOOL_SCRAPERS の定義順に揃える。
+    selected を渡すと、その名前のスクレイパーだけを実行し、
+    それ以外は既存の行をそのまま同じ位置に残す。
+    """
+    return asyncio.run(
+        _scrape_all_async(existing_api, existing_tools, concurrency, block_resources, selected)
+    )
+
+
+async def _scrape_all_async(
+    existing_api: list[ApiModel] | None,
+    existing_tools: list[SubTool] | None,
+    concurrency: int,
+    block_resources: bool,
+    selected: set[str] | None = None,
 ) -> tuple[list[ApiModel], list[SubTool]]:
-    """全プロバイダーをスクレイピングして (api_models, sub_tools) を返す。"""
-    logger.info("=== API プロバイダーのスクレイピング開始 ===")
-    api_models: list[ApiModel] = []
-    for fn, label in [
-        (lambda: scrape_anthropic(existing_api), "Anthropic"),
-        (lambda: scrape_openai(existing_api),    "OpenAI"),
-        (lambda: scrape_google(existing_api),    "Google AI / Vertex AI"),
-        (lambda: scrape_aws(existing_api),       "AWS Bedrock"),
-        (lambda: scrape_deepseek(existing_api),  "DeepSeek"),
-        (lambda: scrape_xai(existing_api),       "xAI"),
-    ]:
-        _run_scraper(fn, label, api_models)
-
-    logger.info("=== コーディングツールのスクレイピング開始 ===")
-    sub_tools: list[SubTool] = []
-    for fn, label in [
-        (lambda: scrape_github_copilot(existing_tools), "GitHub Copilot"),
-        (lambda: scrape_cursor(existing_tools),         "Cursor"),
-        (lambda: scrape_windsurf(existing_tools),       "Windsurf"),
-        (lambda: scrape_claude_code(existing_tools),    "Claude Code"),
-        (lambda: scrape_jetbrains(existing_tools),      "JetBrains AI / Junie"),
-        (lambda: scrape_openai_codex(existing_tools),   "OpenAI Codex"),
-        (lambda: scrape_google_one(existing_tools),     "Google One AI"),
-        (lambda: scrape_antigravity(existing_tools),    "Antigravity"),
-    ]:
-        _run_scraper(fn, label, sub_tools)
+    limit = asyncio.Semaphore(max(1, concurrency))
+    logger.info("=== スクレイピング開始 (並行数 %d) ===", max(1, concurrency))
+    async with browser_session(block_resources) as session:
+        api_results, tool_results = await asyncio.gather(
+            asyncio.gather(*[
+                _run_or_keep(fn, existing_api, label, limit, selected)
+                for fn, label in _API_SCRAPERS
+            ]),
+            asyncio.gather(*[
+                _run_or_keep(fn, existing_tools, label, limit, selected)
+                for fn, label in _TOOL_SCRAPERS
+            ]),
+        )
+    logger.info("Chromium 起動回数: %d", session.launches)
+    _log_traffic_summary()
+    _log_extraction_summary()
+    cache = page_cache()
+    if cache:
+        cache.log_summary()
+    registry.log_summary()
+    log_summary(_run_metrics())
 
+    api_models: list[ApiModel] = [m for result in api_results for m in result]
+    sub_tools: list[SubTool] = [t for result in tool_results for t in result]
     return api_models, sub_tools
 
 
-def _write_output(data: PricingData, output_path: Path) -> None:
-    """pricing.json を書き込み、web フロントエンド用ディレクトリにもコピーする。"""
+def _log_traffic_summary() -> None:
+    """ページ読み込みの転送量・遮断件数と、可視テキスト化によるサイズ削減の実行合計をログに出す。"""
+    traffic = page_traffic().values()
+    if traffic:
+        logger.info(
+            "ページ通信合計: %d ページ / 転送 %d 件 %.1f KB / 遮断 %d 件",
+            len(traffic),
+            sum(t.requests for t in traffic),
+            sum(t.transferred_bytes for t in traffic) / 1024,
+            sum(t.blocked_total for t in traffic),
+        )
+    sizes = text_sizes().values()
+    if sizes:
+        logger.info(
+            "可視テキスト化合計: HTML %.1f KB → テキスト %.1f KB",
+            sum(s.html_bytes for s in sizes) / 1024,
+            sum(s.text_bytes for s in sizes) / 1024,
+        )
+
+
+def _log_extraction_summary() -> None:
+    """価格ごとに値を返した抽出層（構造化データ / 正規表現 / 失敗）の件数をログに出す。"""
+    tiers = Counter(extraction_tiers().values())
+    if tiers:
+        logger.info(
+            "抽出層: 構造化データ %d 件 / 正規表現 %d 件 / 抽出失敗 %d 件",
+            tiers["structured"], tiers["regex"], tiers["none"],
+        )
+
+
+def _write_atomic(path: Path, payload: bytes) -> bool:
+    """payload を path に書く。内容が既存のファイルと同じなら書かずに False を返す。
+
+    同じディレクトリの一意な一時ファイルに書き、ディスクへ同期してから置き換えるので、
+    途中で落ちても空や壊れた JSON は残らず、同時に書く他のプロセスとも衝突しない。
+    失敗した場合は一時ファイルを消す。権限は既存のファイル（なければ 0644）に揃える。
+    """
+    try:
+        if path.read_bytes() == payload:
+            return False
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False,
+    )
+    try:
+        with tmp:
+            tmp.write(payload)
+            tmp.flush()
+            os.fchmod(tmp.fileno(), mode)
+            os.fsync(tmp.fileno())
+        os.replace(tmp.name, path)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _write_output(data: PricingData, output_path: Path) -> bool:
+    """pricing.json を書き込み、web フロントエンド用ディレクトリにもコピーする。
+
+    JSON へのシリアライズは 1 度だけ行い、内容が変わった出力先だけを書き換える。
+    いずれかの出力先が変わったら True を返す。
+    """
     # 浮動小数点アーティファクトを除去（例: 0.034999... → 0.035）
     for m in data.api_models:
-        m.price_in = round(m.price_in, 6)
-        m.price_out = round(m.price_out, 6)
+        m.price_in = round(m.price_in, _PRICE_DIGITS)
+        m.price_out = round(m.price_out, _PRICE_DIGITS)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    payload = data.model_dump()
+    # dict を経由せずに JSON を作る。1e-4 以上の値は json.dumps(model_dump(), ensure_ascii=False,
+    # indent=2) と同じバイト列になる（価格は 0.001〜2000、為替レートもこの範囲）。
+    # それ未満の値は表記が異なる（1e-05 → 0.00001、1e-07 → 1e-7）が、読み戻した値は同じ
+    payload = data.model_dump_json(indent=2).encode("utf-8")
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
-    logger.info("✓ pricing.json を書き込みました: %s", output_path)
+    destinations = [output_path]
+    if _WEB_DATA_PATH.parent.exists() and _WEB_DATA_PATH.resolve() != output_path.resolve():
+        destinations.append(_WEB_DATA_PATH)
+    changed = False
+    for path in destinations:
+        if _write_atomic(path, payload):
+            changed = True
+            logger.info("✓ pricing.json を書き込みました: %s", path)
+        else:
+            logger.info("✓ pricing.json に変更なし（書き込みを省略）: %s", path)
     logger.info("  API モデル: %d件 / コーディングツール: %d件",
                 len(data.api_models), len(data.sub_tools))
     logger.info("  USD/JPY: %.2f (as of %s)", data.jpy_rate, data.jpy_rate_date)
 
-    web_data_path = (
-        Path(__file__).parent.parent.parent.parent.parent
-        / "web" / "src" / "data" / "pricing.json"
-    )
-    if web_data_path.parent.exists():
-        with web_data_path.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-        logger.info("  web/src/data/pricing.json にもコピー完了")
+    manifest = active_manifest()
+    if manifest is not None:
+        manifest.save(manifest_path(output_path))
+    return changed
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -142,8 +509,29 @@ def main(argv: list[str] | None = None) -> int:
     
     Description:
         - Supports `--output` to set the output JSON path and `--no-scrape` to skip scraping.
+        - `--concurrency N` runs up to N scrapers in parallel against one shared browser.
+        - `--no-block-resources` disables request blocking so its savings can be measured.
+        - `--cache-dir` sets where the page cache, per-URL fetch tier and per-scraper last-run times are kept;
+          `--cache-ttl` bounds how long rendered browser snapshots are reused.
+        - `--only` / `--skip` (comma-separated scraper names) and `--stale-after DURATION` re-run only the
+          selected scrapers, or only those whose rows fell back or last succeeded too long ago; the other
+          scrapers' rows are kept from the existing output in place.
+        - A row's `scraped_at` only moves when its price or status changes, so an unchanged run leaves
+          pricing.json byte-for-byte as it was; `--stale-after` also counts the scraper's last run time.
+        - `--metrics-out PATH` writes per-scraper wall time, fetch time, render wait, bytes downloaded,
+          extraction CPU time and pattern attempts, plus run totals, as JSON.
+        - `--profile DIR` writes a cProfile dump (`<scraper>.prof`, plus a cumulative-time `.txt`) per scraper
+          and runs scrapers sequentially so the profiles do not mix; `--profile-trace` also writes a
+          Playwright trace zip per browser page load under `DIR/traces`.
+        - `--record DIR` saves every browser response (one HAR per page) and every httpx response under DIR;
+          `--replay DIR` serves them back with no network access. Both bypass the page, offer, exchange-rate
+          and extraction caches and keep the fetch-tier record in DIR, so a replay takes the same path as the
+          recorded run.
         - When `--no-scrape` is provided and existing output is found, existing model and tool data are reused while the exchange rate is updated.
         - Otherwise, performs scraping (using any existing data as incremental input when available) and persists the assembled PricingData.
+        - The output is serialized once and written atomically (temp file then rename) to each destination whose content
+          changed; unchanged destinations are left untouched, and whether anything changed is logged (and reported
+          as `output_changed` in the `--metrics-out` report).
     
     Returns:
         int: Exit code (`0` on success).
@@ -154,25 +542,133 @@ def main(argv: list[str] | None = None) -> int:
         "--no-scrape", action="store_true",
         help="スクレイピングをスキップ（既存値 or フォールバック値のみ）"
     )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, metavar="N",
+        help="同時に実行するスクレイパー数（デフォルト: 1 = 逐次）"
+    )
+    parser.add_argument(
+        "--no-block-resources", action="store_true",
+        help="画像・フォント・解析スクリプト等のリクエスト遮断を無効化（効果測定用）"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=_DEFAULT_CACHE_DIR,
+        help="ページキャッシュや取得方式の記録を保存するディレクトリ"
+    )
+    parser.add_argument(
+        "--cache-ttl", type=_parse_duration, default=timedelta(hours=1), metavar="DURATION",
+        help="ブラウザ描画結果を再利用する期間（例: 30m, 1h。0 で無効）"
+    )
+    parser.add_argument(
+        "--only", type=_parse_names, metavar="NAMES",
+        help="指定したスクレイパーだけを実行（カンマ区切り。例: anthropic,aws）"
+    )
+    parser.add_argument(
+        "--skip", type=_parse_names, metavar="NAMES",
+        help="指定したスクレイパーを実行しない（カンマ区切り）"
+    )
+    parser.add_argument(
+        "--stale-after", type=_parse_duration, metavar="DURATION",
+        help="最後の成功がこれより古いか fallback を含むスクレイパーだけを実行（例: 24h）"
+    )
+    parser.add_argument(
+        "--metrics-out", type=Path, metavar="PATH",
+        help="スクレイパーごとの性能計測と合計を JSON で書き出す（例: run.json）"
+    )
+    parser.add_argument(
+        "--profile", type=Path, metavar="DIR",
+        help="スクレイパーごとの cProfile 結果を DIR に書き出す（逐次実行になる）"
+    )
+    parser.add_argument(
+        "--profile-trace", action="store_true",
+        help="--profile に加え、ページごとの Playwright トレースを DIR/traces に書き出す"
+    )
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument(
+        "--record", type=Path, metavar="DIR",
+        help="ブラウザ・HTTP の全レスポンスを DIR に記録する"
+    )
+    recording.add_argument(
+        "--replay", type=Path, metavar="DIR",
+        help="--record で記録した DIR からレスポンスを返す（ネットワークなし）"
+    )
     args = parser.parse_args(argv)
+    if args.profile_trace and not args.profile:
+        parser.error("--profile-trace には --profile DIR が必要です")
+    selective = bool(args.only or args.skip or args.stale_after is not None)
+    if args.no_scrape and selective:
+        parser.error("--no-scrape と --only / --skip / --stale-after は同時に指定できません")
+    unknown = sorted((set(args.only or ()) | set(args.skip or ())) - set(_scraper_names()))
+    if unknown:
+        parser.error(
+            f"不明なスクレイパー名: {', '.join(unknown)}（有効な名前: {', '.join(_scraper_names())}）"
+        )
 
     output_path: Path = args.output.resolve()
     logger.info("出力先: %s", output_path)
+    replay_dir: Path | None = args.record or args.replay
+    if replay_dir is not None:
+        if args.replay and not replay_dir.is_dir():
+            parser.error(f"記録ディレクトリがありません: {replay_dir}")
+        configure_replay(replay_dir, "record" if args.record else "replay")
+        # 記録・再生では通信を省略するキャッシュを使わず、取得方式の記録は DIR に置く
+        configure_tier_store(replay_dir / "fetch_tiers.json")
+        configure_page_cache(None)
+        aws.configure_offer_state(None)
+        configure_rate_cache(None)
+        checked_path = None
+    else:
+        configure_tier_store(args.cache_dir / "fetch_tiers.json")
+        configure_page_cache(args.cache_dir / "pages", args.cache_ttl)
+        aws.configure_offer_state(args.cache_dir / "aws_offer.json")
+        configure_rate_cache(args.cache_dir / "fx_rates.json")
+        checked_path = args.cache_dir / "scraper_checked.json"
+    configure_profiling(args.profile, trace=args.profile_trace)
+    concurrency = args.concurrency
+    if profiling_enabled() and concurrency > 1:
+        # cProfile はプロセス全体で 1 つしか有効にできず、並行実行では内訳が混ざる
+        logger.warning("--profile 指定のため並行数 %d → 1 (逐次実行)", concurrency)
+        concurrency = 1
 
     existing = _load_existing(output_path)
-    jpy_rate, jpy_date = fetch_jpy_rate(fallback=existing.jpy_rate if existing else 155.0)
-
-    if args.no_scrape and existing:
-        logger.info("--no-scrape: 既存値を保持し為替レートのみ更新")
-        api_models, sub_tools = existing.api_models, existing.sub_tools
-    elif args.no_scrape:
-        logger.warning("--no-scrape 指定だが既存ファイルなし → 通常スクレイピングを実行")
-        api_models, sub_tools = _scrape_all(None, None)
-    else:
-        api_models, sub_tools = _scrape_all(
-            existing.api_models if existing else None,
-            existing.sub_tools if existing else None,
-        )
+    with http_session() as http:
+        jpy_rate, jpy_date = fetch_jpy_rate(fallback=existing.jpy_rate if existing else 155.0)
+
+        selected: set[str] | None = None
+        scrape_wall_s = 0.0
+        checked = _load_checked(checked_path)
+        if selective and existing:
+            selected = _select_scrapers(
+                existing, args.only, args.skip, args.stale_after, datetime.now(timezone.utc), checked,
+            )
+            logger.info("実行するスクレイパー: %s", ", ".join(sorted(selected)) or "なし")
+        elif selective:
+            logger.warning("--only / --skip / --stale-after 指定だが既存ファイルなし → 全件スクレイピングを実行")
+
+        if args.no_scrape and existing:
+            logger.info("--no-scrape: 既存値を保持し為替レートのみ更新")
+            api_models, sub_tools = existing.api_models, existing.sub_tools
+        elif existing and selected is not None and not selected:
+            logger.info("再取得が必要なスクレイパーなし: 既存値を保持し為替レートのみ更新")
+            api_models, sub_tools = existing.api_models, existing.sub_tools
+        else:
+            if args.no_scrape:
+                logger.warning("--no-scrape 指定だが既存ファイルなし → 通常スクレイピングを実行")
+            configure_manifest(
+                ExtractionManifest.load(manifest_path(output_path)) if replay_dir is None else None
+            )
+            scrape_start = time.perf_counter()
+            api_models, sub_tools = _scrape_all(
+                existing.api_models if existing else None,
+                existing.sub_tools if existing else None,
+                concurrency,
+                not args.no_block_resources,
+                selected,
+            )
+            scrape_wall_s = time.perf_counter() - scrape_start
+            ran_at = datetime.now(timezone.utc)
+            checked.update((m.name, ran_at) for m in _run_metrics() if m.rows)
+            _save_checked(checked_path, checked)
+        http.log_summary()
 
     data = PricingData(
         generated_at=datetime.now(timezone.utc).strftime("%Y-%m-%d"),
@@ -181,7 +677,19 @@ def main(argv: list[str] | None = None) -> int:
         api_models=api_models,
         sub_tools=sub_tools,
     )
-    _write_output(data, output_path)
+    changed = _write_output(data, output_path)
+    logger.info("出力: %s", "変更あり" if changed else "前回から変更なし")
+
+    if args.metrics_out:
+        write_report(
+            args.metrics_out,
+            _run_metrics(),
+            generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            concurrency=concurrency,
+            wall_s=scrape_wall_s,
+            output_changed=changed,
+            http={**asdict(http.stats), "reused": http.stats.reused},
+        )
     return 0
 
 
@@ -0,0 +1,149 @@
+"""抽出結果のサイドカーマニフェスト (pricing.manifest.json)。
+
+URL ごとにページ内容のハッシュとスクレイパーのコードハッシュ、
+パターン列ごとの抽出結果を保存する。次回実行時に両ハッシュが一致すれば
+正規表現を実行せずに前回の抽出結果を再利用する。
+
+コードハッシュはスクレイパーモジュールのソースに、その仕様（specs/*.toml）の
+内容と抽出処理のモジュール（_EXTRACTOR_MODULES）のソースを加えたもの。
+パターン・フォールバック表・抽出処理のどれを変えても前回の結果は使われない。
+"""
+
+from __future__ import annotations
+import hashlib
+import importlib
+import json
+import logging
+import re
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 2
+
+# 実行中のスクレイパーモジュールのコードハッシュ（スレッド/タスクごと）
+_code_hash: ContextVar[str] = ContextVar("scraper_code_hash", default="")
+
+# 抽出結果を左右する共通モジュール（どのスクレイパーのコードハッシュにも含める）
+_EXTRACTOR_MODULES = ("scraper.browser", "scraper.structured", "scraper.patterns", "scraper.engine")
+
+
+@lru_cache(maxsize=None)
+def module_code_hash(module_name: str) -> str:
+    """スクレイパーのコードハッシュを返す。
+
+    モジュールと抽出処理のモジュールのソース、モジュールが仕様（_SPEC）を
+    持つ場合はその内容のハッシュ（PageSpec.source_digest）から作る。
+    """
+    module = importlib.import_module(module_name)
+    source = getattr(module, "__file__", None)
+    if not source:
+        return ""
+    digest = hashlib.sha256(Path(source).read_bytes())
+    for name in _EXTRACTOR_MODULES:
+        extractor = getattr(importlib.import_module(name), "__file__", None)
+        if extractor:
+            digest.update(Path(extractor).read_bytes())
+    digest.update(getattr(getattr(module, "_SPEC", None), "source_digest", "").encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+@contextmanager
+def scraper_scope(module_name: str) -> Iterator[None]:
+    """このブロック内の抽出結果を module_name のコードハッシュに紐付ける。"""
+    token = _code_hash.set(module_code_hash(module_name))
+    try:
+        yield
+    finally:
+        _code_hash.reset(token)
+
+
+def patterns_key(patterns: Sequence[str | re.Pattern[str]]) -> str:
+    sources = [p.pattern if isinstance(p, re.Pattern) else p for p in patterns]
+    return hashlib.sha256("\x00".join(sources).encode("utf-8")).hexdigest()[:16]
+
+
+class ExtractionManifest:
+    """前回の抽出結果の参照と、今回の結果の記録を行う。"""
+
+    def __init__(self, previous: dict[str, Any] | None = None) -> None:
+        self._pages: dict[str, dict[str, Any]] = dict(previous or {})
+        self._touched: set[str] = set()
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.computed = 0
+
+    @classmethod
+    def load(cls, path: Path) -> ExtractionManifest:
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("マニフェストの読み込み失敗 (%s): %s", path, exc)
+            return cls()
+        if data.get("version") != _MANIFEST_VERSION:
+            return cls()
+        return cls(data.get("pages", {}))
+
+    def _entry(self, url: str, digest: str) -> dict[str, Any]:
+        """今回の (digest, code) に対応するエントリを返す。不一致なら作り直す。"""
+        code = _code_hash.get()
+        entry = self._pages.get(url)
+        if entry is None or entry["digest"] != digest or entry["code"] != code:
+            entry = {"digest": digest, "code": code, "results": {}}
+            self._pages[url] = entry
+        self._touched.add(url)
+        return entry
+
+    def lookup(self, url: str, digest: str, key: str) -> tuple[bool, Any]:
+        """(見つかったか, 前回の記録値) を返す。"""
+        with self._lock:
+            results = self._entry(url, digest)["results"]
+            if key in results:
+                self.reused += 1
+                return True, results[key]
+            return False, None
+
+    def record(self, url: str, digest: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._entry(url, digest)["results"][key] = value
+            self.computed += 1
+
+    def save(self, path: Path) -> None:
+        """今回参照した URL のエントリだけを書き出す。
+
+        仕様から外れた URL のエントリが残り続けないよう、参照しなかったものは捨てる
+        （--only 等で実行しなかったスクレイパーの分は次回の実行で作り直される）。
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pages = {url: entry for url, entry in self._pages.items() if url in self._touched}
+        payload = {"version": _MANIFEST_VERSION, "pages": pages}
+        path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        logger.info(
+            "マニフェスト: %d ページ更新 / 抽出 %d 件再利用, %d 件実行 → %s",
+            len(self._touched), self.reused, self.computed, path,
+        )
+
+
+_manifest: ExtractionManifest | None = None
+
+
+def configure_manifest(manifest: ExtractionManifest | None) -> None:
+    global _manifest
+    _manifest = manifest
+
+
+def active_manifest() -> ExtractionManifest | None:
+    return _manifest
+
+
+def manifest_path(output_path: Path) -> Path:
+    """pricing.json に対応するマニフェストのパス (pricing.manifest.json)。"""
+    return output_path.with_name(f"{output_path.stem}.manifest.json")
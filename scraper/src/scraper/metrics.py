@@ -0,0 +1,108 @@
+"""スクレイパーごとの性能計測と実行レポート。
+
+measure() のブロック内（asyncio.to_thread で起動したスレッドを含む）で
+record() された値は、そのスクレイパーの ScraperMetrics に加算される。
+ページ取得・レンダリング待ち・転送量・抽出 CPU 時間・正規表現の照合回数は
+browser / http_client / patterns が記録するので、スクレイパー側の変更は要らない。
+計測対象外（スクレイパーの外）での record() は何もしない。
+"""
+
+from __future__ import annotations
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScraperMetrics:
+    """スクレイパー 1 件の計測値。時間は秒、転送量はバイト。"""
+
+    name: str
+    label: str
+    wall_s: float = 0.0             # スクレイパー全体の経過時間
+    fetch_s: float = 0.0            # get_page_text() の経過時間（静的取得・描画を含む）
+    render_wait_s: float = 0.0      # ブラウザでの描画完了待ち
+    bytes_downloaded: int = 0       # HTTP 本文とブラウザの転送量
+    extract_cpu_s: float = 0.0      # extract_price() のスレッド CPU 時間
+    patterns_tried: int = 0         # 正規表現の照合回数
+    pages: int = 0
+    rows: int = 0
+    success: int = 0
+
+
+# 合計に含める数値フィールド
+_TOTAL_FIELDS = tuple(
+    f.name for f in fields(ScraperMetrics) if f.name not in ("name", "label")
+)
+
+_current: ContextVar[ScraperMetrics | None] = ContextVar("scraper_metrics", default=None)
+_runs: dict[str, ScraperMetrics] = {}
+_runs_lock = threading.Lock()
+
+
+def record(**deltas: float) -> None:
+    """実行中のスクレイパーの計測値に deltas を加算する。"""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    for key, value in deltas.items():
+        setattr(metrics, key, getattr(metrics, key) + value)
+
+
+@contextmanager
+def measure(name: str, label: str) -> Iterator[ScraperMetrics]:
+    """ブロック内の処理を name のスクレイパーとして計測する。"""
+    metrics = ScraperMetrics(name, label)
+    token = _current.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_s += time.perf_counter() - start
+        _current.reset(token)
+        with _runs_lock:
+            _runs[name] = metrics
+
+
+def scraper_metrics() -> dict[str, ScraperMetrics]:
+    """この実行で計測したスクレイパーごとの値を返す。"""
+    with _runs_lock:
+        return dict(_runs)
+
+
+def totals(runs: list[ScraperMetrics]) -> dict[str, float]:
+    return {key: sum(getattr(m, key) for m in runs) for key in _TOTAL_FIELDS}
+
+
+def log_summary(runs: list[ScraperMetrics]) -> None:
+    """経過時間の長い順にスクレイパーごとの内訳をログに出す。"""
+    if runs:
+        logger.info("スクレイパー別の所要時間（長い順）:")
+    for m in sorted(runs, key=lambda m: m.wall_s, reverse=True):
+        logger.info(
+            "  %-22s %6.2f s (取得 %5.2f s / 描画待ち %5.2f s / 抽出 CPU %5.3f s) "
+            "%7.1f KB / 照合 %d 回",
+            m.label, m.wall_s, m.fetch_s, m.render_wait_s, m.extract_cpu_s,
+            m.bytes_downloaded / 1024, m.patterns_tried,
+        )
+
+
+def write_report(path: Path, runs: list[ScraperMetrics], **run_info: Any) -> None:
+    """スクレイパーごとの内訳と合計を JSON で書き出す。run_info は最上位にそのまま入れる。"""
+    report = {
+        **run_info,
+        "totals": totals(runs),
+        "scrapers": [asdict(m) for m in runs],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("実行レポートを書き込みました: %s", path)
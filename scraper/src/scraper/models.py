@@ -18,6 +18,7 @@ class ApiModel(BaseModel):
     sub_ja: str
     sub_en: str
     scrape_status: ScrapeStatus = "manual"
+    scraped_at: str | None = None   # 抽出に成功した値・状態が最後に変わった日時 (ISO 8601)。未成功なら None
 
 
 class SubTool(BaseModel):
@@ -30,6 +31,7 @@ class SubTool(BaseModel):
     note_ja: str
     note_en: str
     scrape_status: ScrapeStatus = "manual"
+    scraped_at: str | None = None   # 抽出に成功した値・状態が最後に変わった日時 (ISO 8601)。未成功なら None
 
 
 class PricingData(BaseModel):
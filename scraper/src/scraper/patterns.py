@@ -0,0 +1,98 @@
+"""価格抽出用の正規表現レジストリ。
+
+パターンは 1 度だけコンパイルして使い回し、パターンごとの
+ヒット数と照合時間を記録する（どのパターンがコストに見合うかの確認用）。
+"""
+
+from __future__ import annotations
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from scraper import metrics
+
+logger = logging.getLogger(__name__)
+
+FLAGS = re.IGNORECASE | re.DOTALL
+
+PatternLike = str | re.Pattern[str]
+
+
+@dataclass
+class PatternStats:
+    calls: int = 0
+    hits: int = 0
+    total_ns: int = 0
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_ns / self.calls / 1000 if self.calls else 0.0
+
+
+class PatternRegistry:
+    """コンパイル済みパターンのキャッシュと照合統計。"""
+
+    def __init__(self) -> None:
+        self._compiled: dict[str, re.Pattern[str]] = {}
+        self._stats: dict[str, PatternStats] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, pattern: PatternLike) -> re.Pattern[str]:
+        if isinstance(pattern, re.Pattern):
+            return pattern
+        compiled = self._compiled.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern, FLAGS)
+            self._compiled[pattern] = compiled
+        return compiled
+
+    def compile_all(self, patterns: Iterable[PatternLike]) -> list[re.Pattern[str]]:
+        return [self.compile(p) for p in patterns]
+
+    def search(
+        self, pattern: PatternLike, text: str, pos: int = 0, endpos: int | None = None,
+    ) -> re.Match[str] | None:
+        """パターンで text を検索し、呼び出し回数・ヒット数・所要時間を記録する。"""
+        compiled = self.compile(pattern)
+        start = time.perf_counter_ns()
+        m = compiled.search(text, pos, len(text) if endpos is None else endpos)
+        elapsed = time.perf_counter_ns() - start
+        with self._lock:
+            stats = self._stats.setdefault(compiled.pattern, PatternStats())
+            stats.calls += 1
+            stats.hits += m is not None
+            stats.total_ns += elapsed
+        metrics.record(patterns_tried=1)
+        return m
+
+    def stats(self) -> dict[str, PatternStats]:
+        with self._lock:
+            return {k: PatternStats(v.calls, v.hits, v.total_ns) for k, v in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def log_summary(self, top: int = 10) -> None:
+        stats = self.stats()
+        if not stats:
+            return
+        total_ms = sum(s.total_ns for s in stats.values()) / 1e6
+        hits = sum(s.hits for s in stats.values())
+        calls = sum(s.calls for s in stats.values())
+        logger.info("正規表現: %d パターン / %d 回照合 (%d hit) / 計 %.1f ms",
+                    len(stats), calls, hits, total_ms)
+        ranked = sorted(stats.items(), key=lambda kv: kv[1].total_ns, reverse=True)
+        for pattern, s in ranked[:top]:
+            logger.info("  %8.2f ms  %3d/%-3d hit  %s", s.total_ns / 1e6, s.hits, s.calls, pattern)
+
+
+registry = PatternRegistry()
+
+
+def compile_patterns(patterns: Iterable[PatternLike]) -> list[re.Pattern[str]]:
+    """モジュール読み込み時にパターン表をコンパイルするためのショートカット。"""
+    return registry.compile_all(patterns)
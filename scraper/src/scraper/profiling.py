@@ -0,0 +1,84 @@
+"""スクレイパー単位のプロファイル（cProfile）とページ読み込みのトレース出力。
+
+configure_profiling() で出力先を設定すると、run_profiled() で実行したスクレイパーごとに
+<出力先>/<名前>.prof（pstats 形式）と、累積時間の上位を並べた <名前>.txt を書き出す。
+trace=True なら、ブラウザで開いたページごとに Playwright のトレース
+（<出力先>/traces/<ホスト>_<パス>.zip、`playwright show-trace` で開ける）も残す。
+
+Python 3.12 の cProfile はプロセス内の全スレッドを記録し、同時に 1 つしか
+有効にできない。そのため計測中のスクレイパーが待っている間のイベントループ上の
+処理（Playwright）もそのスクレイパーのプロファイルに入る。スクレイパーを
+並行実行すると内訳が混ざるので、呼び出し側で逐次実行にすること。
+"""
+
+from __future__ import annotations
+import cProfile
+import io
+import logging
+import pstats
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import TypeVar
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_STATS_LINES = 40     # <名前>.txt に載せる関数の数
+
+_profile_dir: Path | None = None
+_trace: bool = False
+
+
+def configure_profiling(directory: Path | None, trace: bool = False) -> None:
+    """プロファイルの出力先を設定する（None で無効）。trace でページのトレースも出力する。"""
+    global _profile_dir, _trace
+    _profile_dir = directory
+    _trace = trace and directory is not None
+
+
+def profiling_enabled() -> bool:
+    return _profile_dir is not None
+
+
+def run_profiled(name: str, fn: Callable[..., T], *args: object) -> T:
+    """fn(*args) を実行する。プロファイル有効時は cProfile で計測して name で書き出す。"""
+    if _profile_dir is None:
+        return fn(*args)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        _dump(profiler, _profile_dir, name)
+
+
+def _dump(profiler: cProfile.Profile, directory: Path, name: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.prof"
+    profiler.dump_stats(path)
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_STATS_LINES)
+    path.with_suffix(".txt").write_text(report.getvalue(), encoding="utf-8")
+    logger.info("%s: プロファイルを書き込みました: %s", name, path)
+
+
+def trace_path(url: str) -> Path | None:
+    """url のページ読み込みのトレース出力先（トレース無効なら None）。
+
+    同じ URL を再度開いた場合は連番を付けて上書きしない。
+    """
+    if _profile_dir is None or not _trace:
+        return None
+    parts = urlsplit(url)
+    slug = re.sub(r"[^A-Za-z0-9.-]+", "_", f"{parts.netloc}{parts.path}").strip("_")
+    directory = _profile_dir / "traces"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{slug}.zip"
+    n = 1
+    while path.exists():
+        n += 1
+        path = directory / f"{slug}-{n}.zip"
+    return path
@@ -1,25 +1,47 @@
 """AWS Bedrock 料金スクレイパー。
 
 AWS Pricing JSON API を使用（スクレイピングより信頼性が高い）。
-API エンドポイント:
+オファー索引 (offers/v1.0/aws/index.json) → Bedrock のリージョン索引 →
+us-east-1 のオファーファイルの順にたどり、必要なリージョン分だけを取得する。
+リージョン索引が取れない場合は全リージョンのオファーファイル
   https://pricing.us-east-1.amazonaws.com/offers/v1.0/aws/AmazonBedrock/current/index.json
+を使う。
+
+オファーのバージョン（currentVersionUrl）が前回処理したものと同じなら、
+ダウンロードもパースもせず前回選んだ価格を使う（configure_offer_state() で
+記録先を設定した場合）。
+
+オファーファイルは数十 MB 以上あるため、全体を読み込まずにストリームで
+パースし、対象モデルの products と OnDemand terms だけを保持する。
 
 失敗時は公式料金ページをフォールバックとして使用。
 """
 
 from __future__ import annotations
+import json
 import logging
+import re
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 
-import httpx
-
+from scraper import http_client
 from scraper.browser import sanity_check
+from scraper.jsonstream import iter_members
 from scraper.models import ApiModel
 
 logger = logging.getLogger(__name__)
 
-_PRICING_API = (
-    "https://pricing.us-east-1.amazonaws.com/offers/v1.0/aws/AmazonBedrock/current/index.json"
-)
+# このスクレイパーが出力する行の provider
+PROVIDER = "AWS"
+
+_OFFER_HOST = "https://pricing.us-east-1.amazonaws.com"
+_OFFER_INDEX = _OFFER_HOST + "/offers/v1.0/aws/index.json"
+_OFFER_CODE = "AmazonBedrock"
+_REGION = "us-east-1"
+_PRICING_API = _OFFER_HOST + "/offers/v1.0/aws/AmazonBedrock/current/index.json"
 
 _FALLBACKS: dict[str, tuple[float, float]] = {
     "Amazon Nova Pro":   (0.80,  3.20),
@@ -49,12 +71,248 @@ _AWS_KEYWORDS: dict[str, list[str]] = {
     "Amazon Nova Micro": ["Nova Micro", "amazon.nova-micro"],
 }
 
+# 標準のオンデマンド料金以外（バッチ・キャッシュ・学習等）を表す usagetype の語
+_NON_STANDARD_USAGE = (
+    "batch", "flex", "priority", "custom-model", "latency-optimized",
+    "cache", "storage", "throughput", "training",
+)
+
+_PRODUCTS = ("products",)
+_ON_DEMAND = ("terms", "OnDemand")
+
+
+@dataclass(frozen=True)
+class _PriceDim:
+    """標準オンデマンド料金の 1 行（usagetype と説明は小文字化済み）。"""
+
+    usage_type: str
+    description: str
+    usd_per_unit: float
+
+
+class _SkuIndex:
+    """オファーファイルを 1 回走査して作る、モデル → 料金行の索引。
+
+    add_product() でキーワードに一致した SKU をモデルに対応付け、
+    add_terms() でその SKU の標準オンデマンド料金行をモデルごとに積む。
+    モデルごとの参照は prices() の辞書引き 1 回で済む。
+    """
+
+    def __init__(self, keywords: dict[str, list[str]]) -> None:
+        self._model_keywords = {model: [kw.lower() for kw in kws] for model, kws in keywords.items()}
+        # どれかのキーワードを含むかだけを 1 回の検索で判定する（大半の SKU はここで除外）
+        self._keyword_re = re.compile(
+            "|".join(re.escape(kw) for kws in self._model_keywords.values() for kw in kws),
+        )
+        self._sku_models: dict[str, tuple[list[str], str]] = {}
+        self._prices: dict[str, list[_PriceDim]] = {model: [] for model in keywords}
+
+    def __contains__(self, sku: str) -> bool:
+        return sku in self._sku_models
+
+    def add_product(self, sku: str, product: dict[str, Any]) -> bool:
+        """対象モデルの SKU なら登録して True を返す。"""
+        attrs = product.get("attributes", {})
+        desc = (attrs.get("modelId", "") + " " + attrs.get("model", "")).lower()
+        if not self._keyword_re.search(desc):
+            return False
+        # 選択パターン 1 つでは同じ位置で重なるキーワードの片方しか拾えないので、
+        # 当たった SKU だけモデルごとに部分文字列で確かめる
+        models = [
+            model for model, kws in self._model_keywords.items() if any(kw in desc for kw in kws)
+        ]
+        self._sku_models[sku] = (models, attrs.get("usagetype", "").lower())
+        return True
+
+    def add_terms(self, sku: str, sku_terms: dict[str, Any]) -> None:
+        entry = self._sku_models.get(sku)
+        if entry is None:
+            return
+        models, usage_type = entry
+        # 標準形式: [Region]-Nova[Size]-[input|output]-tokens 以外は対象外
+        if not usage_type.endswith(("-input-tokens", "-output-tokens")):
+            return
+        if any(kw in usage_type for kw in _NON_STANDARD_USAGE):
+            return
+        for term in sku_terms.values():
+            for pd in term.get("priceDimensions", {}).values():
+                usd_per_unit = float(pd.get("pricePerUnit", {}).get("USD", "0") or "0")
+                if usd_per_unit == 0:
+                    continue
+                row = _PriceDim(usage_type, pd.get("description", "").lower(), usd_per_unit)
+                for model in models:
+                    self._prices[model].append(row)
+
+    def prices(self, model_name: str) -> list[_PriceDim]:
+        return self._prices.get(model_name, [])
+
+
+def _parse_offer(chunks: Iterable[str]) -> _SkuIndex:
+    """オファーファイルをストリームで読み、対象モデルの料金行だけを索引化する。
+
+    products は terms より前に現れるので、terms は一致した SKU のものだけを
+    デコードする（順序が逆のファイルでは全 terms を読んでから索引化する）。
+    """
+    index = _SkuIndex(_AWS_KEYWORDS)
+    pending: dict[str, dict[str, Any]] = {}
+    seen_products = False
+
+    def want(path: tuple[str, ...], sku: str) -> bool:
+        return path == _PRODUCTS or not seen_products or sku in index
+
+    for path, sku, value in iter_members(chunks, [_PRODUCTS, _ON_DEMAND], want):
+        if path == _PRODUCTS:
+            seen_products = True
+            index.add_product(sku, value)
+        elif seen_products:
+            index.add_terms(sku, value)
+        else:
+            pending[sku] = value
+    for sku, sku_terms in pending.items():
+        index.add_terms(sku, sku_terms)
+    return index
+
+
+def _fetch_offer(url: str) -> _SkuIndex:
+    start = time.perf_counter()
+    with http_client.stream("GET", url, timeout=30) as resp:
+        resp.raise_for_status()
+        index = _parse_offer(resp.iter_text())
+        received = resp.num_bytes_downloaded
+    logger.info(
+        "AWS: オファーファイル %.1f MB をストリーム処理 (%.1f 秒, 料金行 %d 件を索引化)",
+        received / 1e6, time.perf_counter() - start,
+        sum(len(index.prices(m)) for m in _AWS_KEYWORDS),
+    )
+    return index
+
+
+def _locate_regional_offer() -> tuple[str, str, str]:
+    """(オファーファイルの URL, バージョン, 公開日) を返す。
+
+    オファー索引は Bedrock のエントリが見つかった時点で読むのをやめる。
+    """
+    with http_client.stream("GET", _OFFER_INDEX, timeout=30) as resp:
+        resp.raise_for_status()
+        members = iter_members(
+            resp.iter_text(), [("offers",)], want=lambda _, code: code == _OFFER_CODE,
+        )
+        entry = next((value for _, _, value in members), None)
+    if entry is None:
+        raise LookupError(f"オファー索引に {_OFFER_CODE} がありません")
+    resp = http_client.get(_OFFER_HOST + entry["currentRegionIndexUrl"], timeout=30)
+    resp.raise_for_status()
+    region_index = resp.json()
+    version_url = region_index["regions"][_REGION]["currentVersionUrl"]
+    return _OFFER_HOST + version_url, version_url, region_index.get("publicationDate", "")
+
+
+# 前回処理したオファーのバージョンと、そこから選んだ価格の記録先
+_state_path: Path | None = None
+
+
+def configure_offer_state(path: Path | None) -> None:
+    """オファーのバージョン記録先を設定する（None で記録せず毎回取得する）。"""
+    global _state_path
+    _state_path = path
+
+
+def _load_state(version: str) -> dict[str, tuple[float | None, float | None]] | None:
+    """同じバージョン・同じ対象モデルで記録した価格があれば返す。"""
+    if _state_path is None or not _state_path.exists():
+        return None
+    try:
+        state = json.loads(_state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logger.warning("AWS: オファー記録の読み込み失敗 (%s): %s", _state_path, exc)
+        return None
+    if state.get("version") != version or state.get("keywords") != _AWS_KEYWORDS:
+        return None
+    return {model: (p[0], p[1]) for model, p in state.get("prices", {}).items()}
+
+
+def _save_state(
+    version: str, published: str, prices: dict[str, tuple[float | None, float | None]],
+) -> None:
+    if _state_path is None:
+        return
+    _state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _state_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({
+        "version": version,
+        "publicationDate": published,
+        "keywords": _AWS_KEYWORDS,
+        "prices": prices,
+    }, indent=2), encoding="utf-8")
+    tmp.replace(_state_path)
+
+
+def _fetch_prices() -> dict[str, tuple[float | None, float | None]]:
+    """モデルごとの (入力, 出力) USD / 1M トークン。オファーが未更新なら記録を使う。"""
+    try:
+        url, version, published = _locate_regional_offer()
+    except Exception as exc:
+        logger.warning("AWS: リージョン索引の取得失敗 %s → 全リージョンのオファーを使用", exc)
+        index = _fetch_offer(_PRICING_API)
+        return {m: _select_prices(m, index.prices(m)) for m in _AWS_KEYWORDS}
+
+    cached = _load_state(version)
+    if cached is not None:
+        logger.info("AWS: オファー未更新 (%s, 公開 %s) → ダウンロードを省略", version, published)
+        return cached
+    logger.info("AWS: %s のオファーを取得 (%s, 公開 %s)", _REGION, version, published)
+    index = _fetch_offer(url)
+    prices = {m: _select_prices(m, index.prices(m)) for m in _AWS_KEYWORDS}
+    _save_state(version, published, prices)
+    return prices
+
+
+def _select_prices(model_name: str, rows: list[_PriceDim]) -> tuple[float | None, float | None]:
+    """料金行から (入力, 出力) の USD / 1M トークンを選ぶ。us-east-1 の標準行を優先する。"""
+    in_price: float | None = None
+    out_price: float | None = None
+    found_use1_in = False
+    found_use1_out = False
+    for row in rows:
+        # USD per unit -> USD per 1M tokens
+        # AWS Bedrock is typically per 1,000 tokens
+        # 表記揺れ: "1k", "1,000", "per 1000" 等
+        desc_lower = row.description
+        if "1k" in desc_lower or "1,000" in desc_lower or "per 1000" in desc_lower:
+            multiplier = 1000
+            logger.debug(
+                "AWS/%s: 1K単位の価格検出 (usage=%s, desc=%s, usd=%.6f, price_1m=%.4f)",
+                model_name, row.usage_type, desc_lower, row.usd_per_unit, row.usd_per_unit * multiplier,
+            )
+        else:
+            multiplier = 1_000_000
+        price_1m = row.usd_per_unit * multiplier
+
+        # Prefer us-east-1 (USE1) for price consistency
+        # Also prefer rows that don't have extra qualifiers in usage type
+        usage_type_lower = row.usage_type
+        is_use1 = "use1" in usage_type_lower
+
+        if "input" in usage_type_lower or "input" in desc_lower:
+            if in_price is None:
+                in_price = price_1m
+            elif is_use1 and not found_use1_in and usage_type_lower.count("-") <= 3:
+                in_price = price_1m
+                found_use1_in = True
+        elif "output" in usage_type_lower or "output" in desc_lower:
+            if out_price is None:
+                out_price = price_1m
+            elif is_use1 and not found_use1_out and usage_type_lower.count("-") <= 3:
+                out_price = price_1m
+                found_use1_out = True
+    return in_price, out_price
+
 
 def scrape(existing: list[ApiModel] | None = None) -> list[ApiModel]:
     """
     Fetches AWS Bedrock on-demand prices from the AWS Pricing API and returns normalized ApiModel entries.
     
-    If provided, `existing` models from the AWS provider are used to seed fallback prices; built-in fallbacks fill any remaining missing models. Prices are converted to USD per 1,000,000 tokens (with recognition of per-1K unit descriptions) and selection prefers standard token usage tiers for the us-east-1 region. If the Pricing API call or parsing fails, all models fall back to the prepared fallback prices.
+    If provided, `existing` models from the AWS provider are used to seed fallback prices; built-in fallbacks fill any remaining missing models. Prices are converted to USD per 1,000,000 tokens (with recognition of per-1K unit descriptions) and selection prefers standard token usage tiers for the us-east-1 region. Only the us-east-1 regional offer file is downloaded, and the download is skipped entirely when its version matches the one recorded by the previous run (see `configure_offer_state`). If the Pricing API call or parsing fails, all models fall back to the prepared fallback prices.
     
     Parameters:
         existing (list[ApiModel] | None): Optional list of previously scraped ApiModel objects whose AWS entries are used as higher-priority fallback prices.
@@ -67,7 +325,7 @@ def scrape(existing: list[ApiModel] | None = None) -> list[ApiModel]:
     fallback_map: dict[str, tuple[float, float]] = {}
     if existing:
         for m in existing:
-            if m.provider == "AWS":
+            if m.provider == PROVIDER:
                 fallback_map[m.name] = (m.price_in, m.price_out)
     for k, v in _FALLBACKS.items():
         fallback_map.setdefault(k, v)
@@ -75,75 +333,11 @@ def scrape(existing: list[ApiModel] | None = None) -> list[ApiModel]:
     results: dict[str, tuple[float, float, str]] = {}
 
     try:
-        resp = httpx.get(_PRICING_API, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        products = data.get("products", {})
-        terms = data.get("terms", {}).get("OnDemand", {})
-
-        # モデルごとに SKU を探して価格を取得
-        for model_name, keywords in _AWS_KEYWORDS.items():
-            in_price: float | None = None
-            out_price: float | None = None
-            found_use1_in = False
-            found_use1_out = False
-            fb_in, fb_out = fallback_map[model_name]
-
-            for sku, product in products.items():
-                attrs = product.get("attributes", {})
-                desc = attrs.get("modelId", "") + " " + attrs.get("model", "")
-                if not any(kw.lower() in desc.lower() for kw in keywords):
-                    continue
-                usage_type = attrs.get("usagetype", "")
-                # 入力トークン: InputToken / output: OutputToken
-                sku_terms = terms.get(sku, {})
-                for _, term in sku_terms.items():
-                    for _, pd in term.get("priceDimensions", {}).items():
-                        usd_per_unit = float(pd.get("pricePerUnit", {}).get("USD", "0") or "0")
-                        if usd_per_unit == 0:
-                            continue
-                        usage_type_lower = usage_type.lower()
-                        desc_lower = pd.get("description", "").lower()
-
-                        # Skip non-standard tiers (batch, flex, etc.)
-                        # Standard format: [Region]-Nova[Size]-[input|output]-tokens
-                        if not usage_type_lower.endswith(("-input-tokens", "-output-tokens")):
-                            continue
-
-                        # Skip specific keywords in usage type
-                        if any(kw in usage_type_lower for kw in ["batch", "flex", "priority", "custom-model", "latency-optimized", "cache", "storage", "throughput", "training"]):
-                            continue
-
-                        # USD per unit -> USD per 1M tokens
-                        # AWS Bedrock is typically per 1,000 tokens
-                        # 表記揺れ: "1k", "1,000", "per 1000" 等
-                        if "1k" in desc_lower or "1,000" in desc_lower or "per 1000" in desc_lower:
-                            multiplier = 1000
-                            logger.debug(
-                                "AWS/%s: 1K単位の価格検出 (usage=%s, desc=%s, usd=%.6f, price_1m=%.4f)",
-                                model_name, usage_type, desc_lower, usd_per_unit, usd_per_unit * multiplier,
-                            )
-                        else:
-                            multiplier = 1_000_000
-                        price_1m = usd_per_unit * multiplier
-
-                        # Prefer us-east-1 (USE1) for price consistency
-                        # Also prefer rows that don't have extra qualifiers in usage type
-                        is_use1 = "use1" in usage_type_lower
-                        
-                        if "input" in usage_type_lower or "input" in desc_lower:
-                            if in_price is None:
-                                in_price = price_1m
-                            elif is_use1 and not found_use1_in and usage_type_lower.count("-") <= 3:
-                                in_price = price_1m
-                                found_use1_in = True
-                        elif "output" in usage_type_lower or "output" in desc_lower:
-                            if out_price is None:
-                                out_price = price_1m
-                            elif is_use1 and not found_use1_out and usage_type_lower.count("-") <= 3:
-                                out_price = price_1m
-                                found_use1_out = True
+        prices = _fetch_prices()
 
+        for model_name in _AWS_KEYWORDS:
+            fb_in, fb_out = fallback_map[model_name]
+            in_price, out_price = prices.get(model_name, (None, None))
             pi, si = sanity_check(in_price, f"AWS/{model_name}/in", fb_in)
             po, so = sanity_check(out_price, f"AWS/{model_name}/out", fb_out)
             results[model_name] = (pi, po, si if si == so else "fallback")
@@ -155,7 +349,7 @@ def scrape(existing: list[ApiModel] | None = None) -> list[ApiModel]:
 
     return [
         ApiModel(
-            provider="AWS",
+            provider=PROVIDER,
             name=n,
             tag=_TAG.get(n, ""),
             cls=_CLS.get(n, "tag-bal"),
@@ -0,0 +1,183 @@
+"""ページ読み込みと HTTP 取得の記録・再生（ネットワークなしで同じ入力を再実行する）。
+
+configure_replay(<ディレクトリ>, "record") で実行中の通信をディレクトリに記録し、
+"replay" で記録から返す。再生中はネットワークに出ない。
+
+- ブラウザ: ページ（URL）ごとの HAR（<ディレクトリ>/pages/<ホスト>_<パス>.har）。
+  記録時は Playwright の route_from_har(update=True) がそのページの全レスポンスを書き、
+  再生時は同じ HAR から返す（記録にないリクエストは中断される）。
+- httpx: 共通クライアントのトランスポートを差し替える。レスポンスは
+  <ディレクトリ>/http/index.json（リクエストごとのステータス・ヘッダー）と
+  本文ファイル（内容のハッシュ名）に書く。同じ URL への複数のリクエストは
+  記録した順に返し、尽きたら最後のものを返し続ける。
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import re
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Literal
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+ReplayMode = Literal["record", "replay"]
+
+_directory: Path | None = None
+_mode: ReplayMode | None = None
+_recording: HttpRecording | None = None
+
+
+def configure_replay(directory: Path | None, mode: ReplayMode | None = None) -> None:
+    """記録・再生のディレクトリとモードを設定する（None で無効）。
+
+    記録モードでは前回の httpx の記録を破棄して記録し直す。
+    """
+    global _directory, _mode, _recording
+    _directory = directory
+    _mode = mode if directory is not None else None
+    _recording = None
+    if directory is not None and _mode is not None:
+        _recording = HttpRecording(directory / "http", load=_mode == "replay")
+        logger.info(
+            "%s: %s", "通信を記録します" if _mode == "record" else "記録から再生します（ネットワークなし）",
+            directory,
+        )
+
+
+def replay_mode() -> ReplayMode | None:
+    return _mode
+
+
+def _slug(url: str) -> str:
+    parts = urlsplit(url)
+    return re.sub(r"[^A-Za-z0-9.-]+", "_", f"{parts.netloc}{parts.path}").strip("_")
+
+
+def har_path(url: str) -> Path | None:
+    """url のページの HAR の場所（記録・再生が無効なら None）。
+
+    再生時に記録がなければ LookupError を送出する。
+    """
+    if _directory is None:
+        return None
+    path = _directory / "pages" / f"{_slug(url)}.har"
+    if _mode == "replay" and not path.exists():
+        raise LookupError(f"{url}: ページの記録がありません ({path})")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@dataclass
+class RecordedResponse:
+    """httpx のレスポンス 1 件の記録。本文は http/<body> に置く。"""
+
+    method: str
+    url: str
+    status: int
+    headers: list[tuple[str, str]]
+    body: str
+
+
+class HttpRecording:
+    """http/index.json とその本文ファイル。記録はスレッドセーフに追記する。"""
+
+    def __init__(self, directory: Path, load: bool = True) -> None:
+        self.directory = directory
+        self._index = directory / "index.json"
+        self._lock = threading.Lock()
+        self._entries: list[RecordedResponse] = []
+        self._served: dict[tuple[str, str], int] = {}
+        if load and self._index.exists():
+            self._entries = [
+                RecordedResponse(**{**e, "headers": [tuple(h) for h in e["headers"]]})
+                for e in json.loads(self._index.read_text(encoding="utf-8"))
+            ]
+
+    def add(self, request: httpx.Request, status: int, headers: httpx.Headers, body: bytes) -> None:
+        name = hashlib.sha256(body).hexdigest()[:32] + ".body"
+        entry = RecordedResponse(
+            method=request.method,
+            url=str(request.url),
+            status=status,
+            headers=[(k.decode("latin-1"), v.decode("latin-1")) for k, v in headers.raw],
+            body=name,
+        )
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / name
+            if not path.exists():
+                path.write_bytes(body)
+            self._entries.append(entry)
+            tmp = self._index.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps([asdict(e) for e in self._entries], ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+            tmp.replace(self._index)
+
+    def next(self, method: str, url: str) -> tuple[RecordedResponse, bytes] | None:
+        """method / url の記録を記録順に 1 件返す（尽きたら最後のもの）。"""
+        with self._lock:
+            matches = [e for e in self._entries if e.method == method and e.url == url]
+            if not matches:
+                return None
+            n = self._served.get((method, url), 0)
+            self._served[(method, url)] = n + 1
+            entry = matches[min(n, len(matches) - 1)]
+        return entry, (self.directory / entry.body).read_bytes()
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """実際のトランスポートで送り、レスポンス（圧縮されたままの本文）を記録する。"""
+
+    def __init__(self, inner: httpx.BaseTransport, recording: HttpRecording) -> None:
+        self._inner = inner
+        self._recording = recording
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._inner.handle_request(request)
+        try:
+            body = b"".join(response.stream)
+        finally:
+            response.close()
+        self._recording.add(request, response.status_code, response.headers, body)
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=body,
+            request=request, extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """記録からレスポンスを返す。記録にないリクエストは接続エラーにする。"""
+
+    def __init__(self, recording: HttpRecording) -> None:
+        self._recording = recording
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        found = self._recording.next(request.method, str(request.url))
+        if found is None:
+            raise httpx.ConnectError(
+                f"記録にないリクエスト: {request.method} {request.url}", request=request,
+            )
+        entry, body = found
+        return httpx.Response(entry.status, headers=entry.headers, content=body, request=request)
+
+
+def http_transport(inner: httpx.BaseTransport) -> httpx.BaseTransport:
+    """共通 HTTP クライアントのトランスポート。記録・再生中はそれぞれのものに包む。"""
+    if _recording is None:
+        return inner
+    if _mode == "record":
+        return RecordingTransport(inner, _recording)
+    inner.close()
+    return ReplayTransport(_recording)
@@ -0,0 +1,157 @@
+"""ページに埋め込まれた構造化データ（JSON）からの価格抽出。
+
+JSON-LD (application/ld+json)、Next.js の __NEXT_DATA__、その他の
+script[type="application/json"] をページごとに 1 度だけパースし、
+name / model / title 等の値（正規化したモデル名）で引ける索引を作る。
+"""
+
+from __future__ import annotations
+import json
+import logging
+import re
+from collections.abc import Iterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+_JSON_SCRIPT_ATTR_RE = re.compile(
+    r"""type\s*=\s*["']?application/(?:ld\+)?json|id\s*=\s*["']?__NEXT_DATA__""",
+    re.IGNORECASE,
+)
+_PRICE_STR_RE = re.compile(r"^\s*(?:US)?\$?\s*(\d[\d,]*(?:\.\d+)?|\.\d+)\s*(?:USD)?\s*$", re.IGNORECASE)
+# 名前を区別する記号（"Pro" と "Pro+"）は残す
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9+]+")
+
+# レコードの名前として扱うキー（この順に見る）
+_NAME_KEYS = ("name", "model", "modelName", "model_name", "displayName", "title", "id", "slug", "sku")
+
+# 名前付きレコードの中で価格フィールドを探す深さ
+_FIELD_DEPTH = 4
+
+# 部分一致させない汎用のフィールド名。"annualPrice" や "originalPrice" を拾わないよう、
+# 完全一致のキーか月額のキー（"monthlyPrice" / "monthly" 等）だけを使う
+_GENERIC_FIELDS = frozenset({"price"})
+_MONTHLY_KEYS = frozenset({"monthly", "permonth"})
+
+
+def normalize_key(name: str) -> str:
+    """モデル名・プラン名の比較用キー（"GPT-5 Mini" と "gpt-5-mini" を同一視）。
+
+    "+" は残すので "Pro" と "Pro+" は別のキーになる。
+    """
+    return _NON_ALNUM_RE.sub("", name.lower())
+
+
+def embedded_json(html: str) -> list[Any]:
+    """HTML 中の JSON を埋め込んだ script 要素をパースして返す。壊れたものは無視する。"""
+    blobs: list[Any] = []
+    for m in _SCRIPT_RE.finditer(html):
+        if not _JSON_SCRIPT_ATTR_RE.search(m.group(1)):
+            continue
+        body = m.group(2).strip()
+        if not body:
+            continue
+        try:
+            blobs.append(json.loads(body))
+        except ValueError:
+            continue
+    return blobs
+
+
+def _field_rank(key: str, field: str) -> int | None:
+    """キー名が field に当たる優先度（小さいほど優先、当たらなければ None）。"""
+    lowered = key.lower()
+    if lowered == field:
+        return 0
+    if field in _GENERIC_FIELDS:
+        if "month" in lowered and (field in lowered or lowered in _MONTHLY_KEYS):
+            return 1
+        return None
+    if lowered.startswith(field):
+        return 1
+    if field in lowered:
+        return 2
+    return None
+
+
+def parse_price_value(value: Any) -> float | None:
+    """数値、または "$1.25" / "1,000" のような価格文字列を float にする。"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        m = _PRICE_STR_RE.match(value)
+        if m:
+            return float(m.group(1).replace(",", ""))
+    return None
+
+
+class StructuredIndex:
+    """正規化した名前 → その名前を持つ JSON オブジェクトの索引。"""
+
+    def __init__(self, blobs: list[Any]) -> None:
+        self._records: dict[str, list[dict[str, Any]]] = {}
+        for blob in blobs:
+            self._walk(blob)
+
+    @classmethod
+    def from_html(cls, html: str) -> StructuredIndex:
+        return cls(embedded_json(html))
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+    def _walk(self, root: Any) -> None:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                for key in _NAME_KEYS:
+                    name = node.get(key)
+                    if isinstance(name, str) and name.strip():
+                        self._records.setdefault(normalize_key(name), []).append(node)
+                        break
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+
+    def candidates(self, name: str, field: str) -> Iterator[float]:
+        """name のレコードで、キー名が field に当たる値を価格として順に返す。
+
+        キー名が field と完全一致するもの、field で始まるもの、field を含むものの
+        順に優先し、入れ子は浅い順に探す。"price" のような汎用のフィールドは
+        完全一致か月額のキーだけを使う。名前が異なる内容の複数のレコードに
+        当たる場合はどれの価格か決められないので何も返さない（正規表現に任せる）。
+        """
+        field = field.lower()
+        records: list[dict[str, Any]] = []
+        for record in self._records.get(normalize_key(name), ()):
+            if record not in records:
+                records.append(record)
+        if len(records) > 1:
+            logger.debug("%s: 埋め込み JSON に同名のレコードが %d 件 → 使わない", name, len(records))
+            return
+        for record in records:
+            level: list[dict[str, Any]] = [record]
+            for _ in range(_FIELD_DEPTH):
+                matched: list[tuple[int, Any]] = []
+                nested: list[dict[str, Any]] = []
+                for obj in level:
+                    for key, value in obj.items():
+                        if isinstance(value, dict):
+                            nested.append(value)
+                        rank = _field_rank(key, field)
+                        if rank is not None:
+                            matched.append((rank, value))
+                matched.sort(key=lambda item: item[0])
+                for _, value in matched:
+                    if isinstance(value, dict):
+                        value = value.get("price", value.get("value"))
+                    price = parse_price_value(value)
+                    if price is not None:
+                        yield price
+                if not nested:
+                    break
+                level = nested
@@ -1,9 +1,12 @@
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 import logging
 
 from scraper.main import main
-from scraper.exchange import fetch_jpy_rate
+from scraper.exchange import configure_rate_cache, fetch_jpy_rate
+from scraper.manifest import configure_manifest
 from scraper.providers import (
     scrape_anthropic, scrape_openai, scrape_google, scrape_aws, scrape_deepseek, scrape_xai
 )
@@ -29,7 +32,8 @@ class TestSmoke(unittest.TestCase):
 
     def test_fetch_jpy_rate(self):
         """Minimal smoke test for exchange rate fetcher (mocked)."""
-        with patch("scraper.exchange.httpx.get") as mock_get:
+        configure_rate_cache(None)
+        with patch("scraper.http_client.get") as mock_get:
             mock_resp = MagicMock()
             mock_resp.json.return_value = {"rates": {"JPY": 150.0}, "date": "2024-01-01"}
             mock_resp.raise_for_status.return_value = None
@@ -54,8 +58,11 @@ class TestSmoke(unittest.TestCase):
             mock_scrape.return_value = ([], [])
             mock_load.return_value = None
 
-            # Test with no arguments (full scrape path)
-            ret = main([])
+            self.addCleanup(configure_manifest, None)
+            # Test with no arguments (full scrape path), keeping run records out of the real cache dir
+            with tempfile.TemporaryDirectory() as cache_dir, \
+                 patch("scraper.main._DEFAULT_CACHE_DIR", Path(cache_dir)):
+                ret = main([])
             self.assertEqual(ret, 0)
             mock_scrape.assert_called_once()
             mock_write.assert_called_once()
@@ -79,11 +86,13 @@ class TestSmoke(unittest.TestCase):
 
         # AWS uses httpx
         with self.subTest(provider="scraper.providers.aws"):
-            with patch("scraper.providers.aws.httpx.get") as mock_get:
+            with patch("scraper.http_client.stream") as mock_stream, \
+                 patch("scraper.http_client.get") as mock_get:
                 mock_resp = MagicMock()
-                mock_resp.json.return_value = {}
+                mock_resp.iter_text.side_effect = lambda: iter(["{}"])
                 mock_resp.raise_for_status.return_value = None
-                mock_get.return_value = mock_resp
+                mock_resp.num_bytes_downloaded = 2
+                mock_stream.return_value.__enter__.return_value = mock_resp
                 res = scrape_aws()
                 self.assertIsInstance(res, list)
 
@@ -0,0 +1,203 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from scraper import browser
+from scraper.cache import configure_page_cache
+
+
+def _mock_async_playwright(content: str) -> tuple[MagicMock, MagicMock, MagicMock]:
+    """async_playwright() の戻り値を模したモックを組み立てる。"""
+    pw = MagicMock()
+    pw.stop = AsyncMock()
+    chromium_browser = MagicMock()
+    chromium_browser.close = AsyncMock()
+    pw.chromium.launch = AsyncMock(return_value=chromium_browser)
+
+    page = MagicMock()
+    page.goto = AsyncMock()
+    page.evaluate = AsyncMock(return_value=[1000.0, True])
+    page.wait_for_load_state = AsyncMock()
+    page.content = AsyncMock(return_value=content)
+    context = MagicMock()
+    context.new_page = AsyncMock(return_value=page)
+    context.close = AsyncMock()
+    context.route = AsyncMock()
+    chromium_browser.new_context = AsyncMock(return_value=context)
+
+    factory = MagicMock()
+    factory.return_value.start = AsyncMock(return_value=pw)
+    return factory, pw, chromium_browser
+
+
+class TestBrowserSession(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        configure_page_cache(None)
+        browser.configure_tier_store(None)
+
+    async def test_session_launches_chromium_once(self):
+        """セッション内の複数 get_page_text() で Chromium が 1 回だけ起動されること。"""
+        factory, pw, chromium_browser = _mock_async_playwright("<html>$1</html>")
+        with patch("scraper.browser.async_playwright", factory):
+            async with browser.browser_session() as session:
+                for url in ("https://a.example", "https://b.example", "https://c.example"):
+                    text = await asyncio.to_thread(browser.get_page_text, url)
+                    self.assertEqual(text, "<html>$1</html>")
+
+        self.assertEqual(session.launches, 1)
+        pw.chromium.launch.assert_awaited_once()
+        self.assertEqual(chromium_browser.new_context.await_count, 3)
+        chromium_browser.close.assert_awaited_once()
+        pw.stop.assert_awaited_once()
+
+
+class TestReadiness(unittest.IsolatedAsyncioTestCase):
+    async def test_ready_when_price_appears_and_dom_settles(self):
+        """価格表記が出て DOM が静止した時点で、上限を待たずに返ること。"""
+        page = MagicMock()
+        page.evaluate = AsyncMock(side_effect=[[0.0, False], [50.0, True], [400.0, True]])
+        page.wait_for_load_state = AsyncMock(side_effect=asyncio.TimeoutError())
+        with patch("scraper.browser._READY_POLL_MS", 1):
+            timing = await browser._wait_until_ready(page, cap_ms=5_000)
+        self.assertEqual(timing.reason, "price")
+        self.assertLess(timing.elapsed_ms, 5_000)
+        self.assertEqual(page.evaluate.await_count, 3)
+
+    async def test_hard_cap(self):
+        """DOM が変化し続けるページでも上限で打ち切ること。"""
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value=[0.0, False])
+        page.wait_for_load_state = AsyncMock(side_effect=asyncio.TimeoutError())
+        with patch("scraper.browser._READY_POLL_MS", 1):
+            timing = await browser._wait_until_ready(page, cap_ms=20)
+        self.assertEqual(timing.reason, "timeout")
+        self.assertGreaterEqual(timing.elapsed_ms, 20)
+
+
+class TestResourcePolicy(unittest.IsolatedAsyncioTestCase):
+    def test_blocks_by_type_and_domain(self):
+        policy = browser.DEFAULT_POLICY.extend(
+            block_domains=("tracker.example",), allow_domains=("cdn.googletagmanager.com",),
+        )
+        self.assertTrue(policy.blocks("image", "www.anthropic.com"))
+        self.assertTrue(policy.blocks("script", "www.google-analytics.com"))
+        self.assertTrue(policy.blocks("xhr", "a.tracker.example"))
+        self.assertFalse(policy.blocks("script", "www.anthropic.com"))
+        self.assertFalse(policy.blocks("document", "www.anthropic.com"))
+        self.assertFalse(policy.blocks("script", "cdn.googletagmanager.com"))
+
+    async def test_route_counts_blocked_requests(self):
+        traffic = browser.PageTraffic()
+        for resource_type, url in [
+            ("image", "https://www.cursor.com/hero.png"),
+            ("font", "https://fonts.gstatic.com/a.woff2"),
+            ("script", "https://www.cursor.com/app.js"),
+        ]:
+            route = MagicMock()
+            route.request.resource_type = resource_type
+            route.request.url = url
+            route.abort = AsyncMock()
+            route.fallback = AsyncMock()
+            await browser._route_request(route, browser.DEFAULT_POLICY, traffic)
+            if resource_type == "script":
+                route.fallback.assert_awaited_once()
+            else:
+                route.abort.assert_awaited_once()
+        self.assertEqual(traffic.blocked, {"image": 1, "font": 1})
+        self.assertEqual(traffic.blocked_total, 2)
+
+
+class TestTieredFetch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store_path = Path(self.tmp.name) / "fetch_tiers.json"
+        browser.configure_tier_store(self.store_path)
+        configure_page_cache(None)
+
+    def tearDown(self) -> None:
+        browser.configure_tier_store(None)
+        self.tmp.cleanup()
+
+    def test_static_html_skips_browser(self):
+        """静的 HTML で probe が抽出できればブラウザを起動しないこと。"""
+        with patch("scraper.browser._get_static_text", return_value="Pro $20 / month") as get, \
+             patch("scraper.browser._render_page") as render:
+            html = browser.get_page_text("https://a.example", probe=[r"pro[^$]*?\$([\d]+)"])
+        self.assertEqual(html, "Pro $20 / month")
+        get.assert_called_once()
+        render.assert_not_called()
+        self.assertEqual(browser.TierStore(self.store_path).get("https://a.example"), "static")
+
+    def test_escalates_and_remembers_browser_tier(self):
+        """静的 HTML で抽出できなければブラウザに切り替え、次回は直接ブラウザを使うこと。"""
+        probe = [r"pro[^$]*?\$([\d]+)"]
+        with patch("scraper.browser._get_static_text", return_value="<div id=app></div>") as get, \
+             patch("scraper.browser._render_page", return_value="Pro $20") as render:
+            self.assertEqual(browser.get_page_text("https://b.example", probe=probe), "Pro $20")
+            browser.configure_tier_store(self.store_path)
+            self.assertEqual(browser.get_page_text("https://b.example", probe=probe), "Pro $20")
+        get.assert_called_once()
+        self.assertEqual(render.call_count, 2)
+
+    def test_partially_rendered_static_page_uses_browser(self):
+        """probe の項目が 1 つでも静的 HTML で取れなければブラウザで取得すること。"""
+        probe = [
+            [r"pro[^$]*?\$([\d]+)", r"\$([\d]+)[^$]*?pro"],
+            [r"ultra[^$]*?\$([\d]+)"],
+        ]
+        with patch("scraper.browser._get_static_text", return_value="Pro $20 | Ultra (loading)"), \
+             patch("scraper.browser._render_page", return_value="Pro $20 | Ultra $200") as render:
+            self.assertEqual(browser.get_page_text("https://c.example", probe=probe), "Pro $20 | Ultra $200")
+        render.assert_called_once()
+        self.assertEqual(browser.TierStore(self.store_path).get("https://c.example"), "browser")
+
+    def test_probe_searches_near_the_anchor_and_is_reused(self):
+        """probe は抽出と同じくアンカー周辺だけを探し、その結果を抽出で再利用すること。"""
+        patterns = (r"pro[^$]*?\$([\d]+)",)
+        probe = [browser.ProbeRow(patterns, anchor="pro", model="Pro")]
+        far = "Pro" + " filler" * 1000 + " $20"
+        with patch("scraper.browser._get_static_text", return_value=far), \
+             patch("scraper.browser._render_page", return_value="Pro $25") as render:
+            html = browser.get_page_text("https://d.example", probe=probe)
+        render.assert_called_once()
+        self.assertEqual(browser.extract_price(html, patterns, anchor="pro", model="Pro"), 25.0)
+
+        with patch("scraper.browser._get_static_text", return_value="Pro $20"), \
+             patch("scraper.browser._search_price", wraps=browser._search_price) as search:
+            html = browser.get_page_text("https://e.example", probe=probe)
+            self.assertEqual(browser.extract_price(html, patterns, anchor="pro", model="Pro"), 20.0)
+        search.assert_called_once()
+
+    def test_recorded_tiers_expire(self):
+        old = (date.today() - timedelta(days=browser._TIER_RECHECK_DAYS)).isoformat()
+        self.store_path.write_text(json.dumps({
+            "https://s.example": {"tier": "static", "checked": old},
+            "https://b.example": {"tier": "browser", "checked": old},
+            "https://n.example": {"tier": "static", "checked": date.today().isoformat()},
+        }), encoding="utf-8")
+        store = browser.TierStore(self.store_path)
+        self.assertIsNone(store.get("https://s.example"))
+        self.assertIsNone(store.get("https://b.example"))
+        self.assertEqual(store.get("https://n.example"), "static")
+
+
+class TestStandaloneFetch(unittest.TestCase):
+    def setUp(self) -> None:
+        configure_page_cache(None)
+        browser.configure_tier_store(None)
+
+    def test_get_page_text_without_session(self):
+        """セッション外の呼び出しは一時セッションを開いて閉じること。"""
+        factory, _, chromium_browser = _mock_async_playwright("x")
+        with patch("scraper.browser.async_playwright", factory):
+            self.assertEqual(browser.get_page_text("https://a.example"), "x")
+        chromium_browser.close.assert_awaited_once()
+        self.assertIsNone(browser._session)
+
+
+if __name__ == "__main__":
+    unittest.main()
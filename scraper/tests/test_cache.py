@@ -0,0 +1,61 @@
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from scraper import browser
+from scraper.cache import CachedPage, configure_page_cache
+
+
+def _response(status: int, text: str = "", headers: dict[str, str] | None = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = text
+    resp.headers = headers or {}
+    return resp
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = configure_page_cache(Path(self.tmp.name), timedelta(hours=1))
+
+    def tearDown(self) -> None:
+        configure_page_cache(None)
+        self.tmp.cleanup()
+
+    def test_static_revalidation_uses_cached_body_on_304(self):
+        """2 回目は ETag 付きで再検証し、304 ならキャッシュ本文を返すこと。"""
+        url = "https://api-docs.example/pricing"
+        with patch("scraper.http_client.get") as get:
+            get.return_value = _response(200, "$0.28", {"ETag": '"v1"', "Last-Modified": "Mon"})
+            self.assertEqual(browser._get_static_text(url, 1000), "$0.28")
+            get.return_value = _response(304)
+            self.assertEqual(browser._get_static_text(url, 1000), "$0.28")
+
+        sent = get.call_args.kwargs["headers"]
+        self.assertEqual(sent["If-None-Match"], '"v1"')
+        self.assertEqual(sent["If-Modified-Since"], "Mon")
+        self.assertEqual((self.cache.hits["static"], self.cache.misses["static"]), (1, 1))
+
+    def test_rendered_snapshot_ttl(self):
+        """TTL 以内の描画結果は再利用し、期限切れなら再描画すること。"""
+        url = "https://pricing.example"
+        self.cache.put(CachedPage(url=url, kind="browser", body="fresh", fetched_at=time.time()))
+        with patch("scraper.browser._fetch_once", new_callable=MagicMock) as fetch, \
+             patch("scraper.browser.asyncio.run", return_value="rendered"):
+            self.assertEqual(browser._render_page(url, None, 1000, browser.DEFAULT_POLICY), "fresh")
+            fetch.assert_not_called()
+
+            self.cache.put(CachedPage(
+                url=url, kind="browser", body="stale", fetched_at=time.time() - 7200,
+            ))
+            self.assertEqual(browser._render_page(url, None, 1000, browser.DEFAULT_POLICY), "rendered")
+        self.assertEqual(self.cache.get(url, "browser").body, "rendered")
+        self.assertEqual((self.cache.hits["browser"], self.cache.misses["browser"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from scraper import engine
+from scraper.models import ApiModel, SubTool
+
+_SPEC_NAMES = (
+    "anthropic", "openai", "google", "deepseek", "xai",
+    "github_copilot", "cursor", "windsurf", "claude_code",
+    "jetbrains", "openai_codex", "google_one", "antigravity",
+)
+
+_ANTHROPIC_PAGE = """
+<table>
+<tr><td>Claude Opus 4.6</td><td>Input $5 / MTok</td><td>Output $26 / MTok</td></tr>
+<tr><td>Claude Sonnet 4.6</td><td>Input $3 / MTok</td><td>Output $15 / MTok</td></tr>
+</table>
+"""
+
+# ナビゲーションのモデル名の後に、別モデルの行が先に来るページ
+_ANTHROPIC_NAV_PAGE = """
+<nav><a href="/claude">Claude Opus</a> <a href="/api">API</a></nav>
+<table>
+<tr><td>Claude Sonnet 4.6</td><td>$3 / MTok</td><td>$15 / MTok</td></tr>
+<tr><td>Claude Opus 4.6</td><td>$5 / MTok</td><td>$25 / MTok</td></tr>
+</table>
+"""
+
+_CURSOR_CARDS_PAGE = """
+<nav><a href="/pricing">Pricing</a> <a href="/pro">Pro</a></nav><h1>Plans</h1>
+<div class="plan"><h3>Hobby</h3><p class="price">$0 / month</p></div>
+<div class="plan"><h3>Pro</h3><p class="price">$20 / month</p></div>
+<div class="plan"><h3>Ultra</h3><p class="price">$200 / month</p></div>
+"""
+
+
+def _page(text: str):
+    def fetch(url: str, **kwargs) -> str:
+        return text
+    return fetch
+
+
+def _unreachable(url: str, **kwargs) -> str:
+    raise OSError("offline")
+
+
+class TestSpecs(unittest.TestCase):
+    def test_every_spec_loads_once(self):
+        for name in _SPEC_NAMES:
+            with self.subTest(spec=name):
+                spec = engine.load_spec(name)
+                self.assertIs(engine.load_spec(name), spec)
+                self.assertTrue(spec.url.startswith("https://"))
+                self.assertTrue(spec.models or spec.plans)
+
+    def test_model_key_and_templates(self):
+        self.assertEqual(engine.model_key("GPT-5.2 pro", {" ": r"[-\s]?"}), r"gpt\-5\.2[-\s]?pro")
+        spec = engine.load_spec("openai")
+        gpt5 = next(m for m in spec.models if m.name == "GPT-5 Mini")
+        self.assertIsNotNone(gpt5.anchor.search("gpt-5-mini"))
+        self.assertEqual(len(gpt5.patterns["input"]), 3)
+
+    def test_probe_covers_every_extracted_row(self):
+        openai = engine.load_spec("openai")
+        self.assertEqual(len(openai.probe), 2 * sum(1 for m in openai.models if m.patterns is not None))
+        gpt5 = next(m for m in openai.models if m.name == "GPT-5 Mini")
+        self.assertIn(engine.ProbeRow(tuple(gpt5.patterns["output"]), gpt5.anchor, gpt5.name, "output"), openai.probe)
+        cursor = engine.load_spec("cursor")
+        self.assertEqual([r.patterns for r in cursor.probe], [p.patterns for p in cursor.plans if p.patterns])
+        self.assertEqual([r.model for r in cursor.probe], [p.name for p in cursor.plans if p.patterns])
+
+    def test_google_vertex_rows_are_fallback_only(self):
+        spec = engine.load_spec("google")
+        vertex = [m for m in spec.models if m.provider == "Vertex AI"]
+        self.assertEqual(len(vertex), 4)
+        self.assertTrue(all(m.patterns is None for m in vertex))
+
+    def test_source_digest_follows_the_spec_content(self):
+        doc = engine._read_doc("cursor")
+        self.assertEqual(engine.load_spec("cursor").source_digest, engine._doc_digest(doc))
+        doc["plans"][1]["monthly"] = 25
+        self.assertNotEqual(engine._doc_digest(doc), engine.load_spec("cursor").source_digest)
+
+    def test_rows_are_validated_when_the_spec_loads(self):
+        doc = {
+            "label": "Broken", "url": "https://broken.example", "provider": "Broken",
+            "models": [{"name": "M", "price": [-1, 2], "scrape": False}],
+        }
+        with patch.object(engine, "_read_doc", return_value=doc):
+            with self.assertRaises(ValueError):
+                engine.load_spec("broken-negative-price")
+
+
+class TestScrape(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        logging.disable(logging.NOTSET)
+
+    def test_models_extract_validate_and_fall_back(self):
+        spec = engine.load_spec("anthropic")
+        models = {m.name: m for m in engine.scrape_models(spec, fetch=_page(_ANTHROPIC_PAGE))}
+        self.assertEqual(list(models), [m.name for m in spec.models])
+        opus = models["Claude Opus 4.6"]
+        self.assertEqual((opus.price_in, opus.price_out, opus.scrape_status), (5.0, 26.0, "success"))
+        self.assertEqual(models["Claude Haiku 4.5"].scrape_status, "fallback")
+        self.assertEqual(models["Claude Haiku 3"].tag, "Budget")
+
+    def test_patterns_stay_within_one_row(self):
+        spec = engine.load_spec("anthropic")
+        for page in (_ANTHROPIC_NAV_PAGE, _ANTHROPIC_NAV_PAGE.replace("tr>", "div>").replace("td>", "span>")):
+            with self.subTest(page=page):
+                models = {m.name: m for m in engine.scrape_models(spec, fetch=_page(page))}
+                opus, sonnet = models["Claude Opus 4.6"], models["Claude Sonnet 4.6"]
+                self.assertEqual((opus.price_in, opus.price_out, opus.scrape_status), (5.0, 25.0, "success"))
+                self.assertEqual((sonnet.price_in, sonnet.price_out), (3.0, 15.0))
+
+    def test_plan_price_on_the_line_after_its_name(self):
+        spec = engine.load_spec("cursor")
+        tools = {t.name: t for t in engine.scrape_plans(spec, fetch=_page(_CURSOR_CARDS_PAGE))}
+        self.assertEqual((tools["Pro"].monthly, tools["Pro"].scrape_status), (20.0, "success"))
+        self.assertEqual((tools["Ultra"].monthly, tools["Ultra"].scrape_status), (200.0, "success"))
+
+    def test_existing_values_are_the_fallback(self):
+        spec = engine.load_spec("anthropic")
+        existing = [ApiModel(
+            provider="Anthropic", name="Claude Haiku 3", tag="", cls="",
+            price_in=0.3, price_out=1.5, sub_ja="", sub_en="",
+        )]
+        models = {m.name: m for m in engine.scrape_models(spec, existing, fetch=_unreachable)}
+        self.assertEqual((models["Claude Haiku 3"].price_in, models["Claude Haiku 3"].price_out), (0.3, 1.5))
+        self.assertEqual(models["Claude Opus 4.6"].tag, "最新")
+        self.assertEqual(models["Claude Opus 4.6"].scrape_status, "fallback")
+        self.assertEqual(models["Claude Haiku 3"].scrape_status, "manual")
+
+    def test_plans(self):
+        spec = engine.load_spec("cursor")
+        existing = [SubTool(
+            group="Cursor", name="Ultra", monthly=180, tag="", cls="", note_ja="", note_en="",
+        )]
+        page = "Pro $25 / month ... Teams $40 / user"
+        tools = {t.name: t for t in engine.scrape_plans(spec, existing, fetch=_page(page))}
+        self.assertEqual((tools["Pro"].monthly, tools["Pro"].scrape_status), (25.0, "success"))
+        self.assertEqual(tools["Pro"].annual, 16)
+        self.assertEqual((tools["Ultra"].monthly, tools["Ultra"].scrape_status), (180, "fallback"))
+        self.assertEqual(tools["Hobby (Free)"].scrape_status, "manual")
+
+        # 出力は検証済みの行の複製で、変更しても仕様側の行は変わらない
+        tools["Pro"].scraped_at = "2026-01-01T00:00:00+00:00"
+        pro = next(p for p in spec.plans if p.name == "Pro")
+        self.assertIsNone(pro.row.scraped_at)
+        self.assertEqual(pro.row.scrape_status, "manual")
+
+
+if __name__ == "__main__":
+    unittest.main()
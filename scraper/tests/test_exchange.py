@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from scraper import exchange
+
+
+def _response(date: str, jpy: float) -> MagicMock:
+    resp = MagicMock()
+    resp.json.return_value = {"base": "USD", "date": date, "rates": {"JPY": jpy, "EUR": 0.92}}
+    return resp
+
+
+class TestRateCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        exchange.configure_rate_cache(Path(self.tmp.name) / "fx_rates.json")
+
+    def tearDown(self) -> None:
+        exchange.configure_rate_cache(None)
+        self.tmp.cleanup()
+
+    def test_next_publication_skips_weekend(self):
+        friday_evening = datetime(2026, 2, 20, 18, 0, tzinfo=timezone.utc)
+        nxt = exchange.next_publication_after(friday_evening)
+        self.assertEqual((nxt.weekday(), nxt.hour), (0, 16))
+        self.assertEqual(nxt.date().isoformat(), "2026-02-23")
+
+    def test_uses_cache_until_a_newer_ecb_date_can_exist(self):
+        with patch("scraper.http_client.get", return_value=_response("2026-02-20", 150.0)) as get:
+            self.assertEqual(exchange.fetch_rates()[1:], ("2026-02-20", "network"))
+            # 週末のうちは再取得しない
+            saturday = datetime(2026, 2, 21, 12, 0, tzinfo=timezone.utc)
+            with patch("scraper.exchange.datetime", wraps=datetime) as dt:
+                dt.now.return_value = saturday
+                rates, date, source = exchange.fetch_rates()
+            self.assertEqual((rates["EUR"], date, source), (0.92, "2026-02-20", "cache"))
+            self.assertEqual(get.call_count, 1)
+
+    def test_late_publication_is_rechecked_within_the_hour(self):
+        # 月曜 16:05 CET に確認したが、まだ金曜の公表日だった
+        checked = datetime(2026, 2, 23, 15, 5, tzinfo=timezone.utc)
+        exchange._save_cache({
+            "date": "2026-02-20", "base": "USD", "rates": {"JPY": 150.0}, "checked_at": checked.timestamp(),
+        })
+        cases = [
+            (datetime(2026, 2, 23, 15, 30, tzinfo=timezone.utc), "cache"),
+            (datetime(2026, 2, 23, 16, 10, tzinfo=timezone.utc), "network"),
+        ]
+        for now, expected in cases:
+            with self.subTest(now=now), \
+                    patch("scraper.http_client.get", return_value=_response("2026-02-23", 151.0)), \
+                    patch("scraper.exchange.datetime", wraps=datetime) as dt:
+                dt.now.return_value = now
+                self.assertEqual(exchange.fetch_rates()[2], expected)
+
+    def test_stale_cache_when_network_fails(self):
+        exchange._save_cache({"date": "2020-01-02", "base": "USD", "rates": {"JPY": 110.0}, "checked_at": 0})
+        with patch("scraper.http_client.get", side_effect=OSError("offline")):
+            self.assertEqual(exchange.fetch_jpy_rate(fallback=155.0), (110.0, "2020-01-02"))
+            self.assertEqual(exchange.fetch_rates()[2], "stale-cache")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import re
+import unittest
+
+from scraper.browser import PageText, expect_anchors, extract_price, scan_anchors, visible_text
+from scraper.patterns import PatternRegistry, registry
+
+
+class TestPatternRegistry(unittest.TestCase):
+    def test_compiles_once_and_counts_hits(self):
+        reg = PatternRegistry()
+        first = reg.compile(r"pro[^$]*?\$([\d]+)")
+        self.assertIs(reg.compile(r"pro[^$]*?\$([\d]+)"), first)
+        self.assertTrue(first.flags & re.IGNORECASE)
+
+        self.assertIsNotNone(reg.search(first, "PRO plan $20"))
+        self.assertIsNone(reg.search(first, "free"))
+        stats = reg.stats()[first.pattern]
+        self.assertEqual((stats.calls, stats.hits), (2, 1))
+        self.assertGreater(stats.total_ns, 0)
+
+    def test_extract_price_accepts_compiled_patterns(self):
+        compiled = registry.compile(r"ultra[^$]*?\$([\d]+)")
+        self.assertEqual(extract_price("Ultra $200 / month", [compiled]), 200.0)
+        self.assertEqual(extract_price("Ultra $200 / month", [r"ultra[^$]*?\$([\d]+)"]), 200.0)
+
+
+class TestAnchoredExtraction(unittest.TestCase):
+    def test_searches_only_near_anchor(self):
+        """アンカー周辺の窓だけを探索し、遠く離れた価格は拾わないこと。"""
+        pattern = r"gpt-5[^$]*?output[^$]*?\$([\d.]+)"
+        near = PageText("x" * 5000 + "GPT-5 output $10.00 / input $1.25", "https://a.example")
+        self.assertEqual(extract_price(near, [pattern], anchor="gpt-5", window=100), 10.0)
+
+        far = PageText("GPT-5 output " + "-" * 5000 + " $10.00", "https://b.example")
+        self.assertEqual(extract_price(far, [pattern]), 10.0)
+        self.assertIsNone(extract_price(far, [pattern], anchor="gpt-5", window=100))
+
+    def test_anchor_positions_memoized_per_page(self):
+        page = PageText("o3 $2 ... o3 $8", "https://c.example")
+        extract_price(page, [r"o3[^$]*?\$([\d.]+)"], anchor="o3")
+        self.assertEqual(page.anchor_index[registry.compile("o3").pattern], [0, 10])
+        self.assertIsNone(extract_price(page, [r"o3[^$]*?\$([\d.]+)"], anchor="o4"))
+
+    def test_expected_anchors_scanned_together(self):
+        page = PageText("GPT-5 $1 | GPT-5 Mini $0.25 | o3 $2", "https://e.example")
+        anchors = [registry.compile(a) for a in (r"gpt\-5", r"gpt\-5[-\s]?mini", "o3")]
+        expect_anchors(page, anchors)
+        self.assertEqual(extract_price(page, [r"mini[^$]*?\$([\d.]+)"], anchor=anchors[1]), 0.25)
+        self.assertEqual(len(page.anchor_index), 3)
+        self.assertEqual(page.anchor_index[anchors[0].pattern], [0, 11])
+        self.assertEqual(page.anchor_index[anchors[1].pattern], [11])
+        self.assertEqual(scan_anchors("o3 o3", ["o3"]), {"o3": [0, 3]})
+
+
+class TestVisibleText(unittest.TestCase):
+    def test_strips_markup_and_decodes_entities(self):
+        html = (
+            '<html><head><style>.p{color:red}</style>'
+            '<script>var price = "$999";</script></head>'
+            '<body><!-- $1 --><table><tr><td class="m">Pro&nbsp;plan</td>'
+            '<td>\n  $20&#47;month</td></tr></table>&lt;b&gt;</body></html>'
+        )
+        self.assertEqual(visible_text(html), "Pro plan $20/month\n<b>")
+
+    def test_block_elements_become_lines(self):
+        html = (
+            "<nav><a>Claude</a> <a>Opus</a></nav>\n<div><h3>Pro</h3>\n"
+            "<p>$20 /\n month</p></div><ul><li>A</li><li>B<br>C</li></ul>"
+        )
+        self.assertEqual(visible_text(html), "Claude Opus\nPro\n$20 / month\nA\nB\nC")
+
+    def test_script_prices_do_not_match(self):
+        page = PageText('<script>{"pro":"$999"}</script><p>Pro</p><p>$20 / month</p>', "https://d.example")
+        self.assertEqual(extract_price(page, [r"pro[^$\n]*?\n?[^$\n]*?\$([\d]+)"]), 20.0)
+        self.assertEqual(page.visible, "Pro\n$20 / month")
+
+
+if __name__ == "__main__":
+    unittest.main()
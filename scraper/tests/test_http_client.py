@@ -0,0 +1,96 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+
+from scraper import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = 0
+
+    def do_GET(self) -> None:
+        if _Handler.failures:
+            _Handler.failures -= 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestHttpSession(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_reuses_connection_within_session(self):
+        with http_client.http_session() as session:
+            for _ in range(3):
+                self.assertEqual(http_client.get(self.url).text, "ok")
+            with http_client.stream("GET", self.url) as resp:
+                self.assertEqual(resp.read(), b"ok")
+        self.assertEqual((session.stats.requests, session.stats.connections), (4, 1))
+        self.assertEqual(session.stats.reused, 3)
+        self.assertIsNone(http_client._session)
+
+    def test_calls_outside_a_session_do_not_share_their_client(self):
+        """セッション外の呼び出しは一時クライアントを _session に置かずに使って閉じること。"""
+        seen: list[object] = []
+        original = http_client.HttpSession.get
+
+        def get(session, url, **kwargs):
+            seen.append(http_client._session)
+            return original(session, url, **kwargs)
+
+        with patch.object(http_client.HttpSession, "get", get), \
+             patch.object(http_client.HttpSession, "close", autospec=True,
+                          side_effect=http_client.HttpSession.close) as close:
+            self.assertEqual(http_client.get(self.url).text, "ok")
+            with http_client.stream("GET", self.url) as resp:
+                self.assertIsNone(http_client._session)
+                self.assertEqual(resp.read(), b"ok")
+        self.assertEqual(seen, [None])
+        self.assertEqual(close.call_count, 2)
+
+    def test_missing_h2_is_not_reported_per_client(self):
+        """h2 がない場合の警告は読み込み時の 1 度だけで、一時クライアントごとには出さないこと。"""
+        with patch.object(http_client, "_HTTP2", False), \
+             self.assertNoLogs(http_client.logger, "WARNING"):
+            for _ in range(2):
+                self.assertEqual(http_client.get(self.url).text, "ok")
+
+    def test_retries_transient_status_with_backoff(self):
+        _Handler.failures = 2
+        with patch("scraper.http_client.time.sleep") as sleep, http_client.http_session() as session:
+            self.assertEqual(http_client.get(self.url).status_code, 200)
+        self.assertEqual(session.stats.retries, 2)
+        self.assertEqual(sleep.call_count, 2)
+        for call in sleep.call_args_list:
+            self.assertLessEqual(call.args[0], http_client._BACKOFF_CAP_S)
+
+    def test_gives_up_after_max_attempts(self):
+        with patch("scraper.http_client.time.sleep"), http_client.http_session() as session, \
+             patch.object(session._client, "get", side_effect=httpx.ConnectError("reset")):
+            with self.assertRaises(httpx.ConnectError):
+                http_client.get(self.url)
+        self.assertEqual(session.stats.requests, http_client._MAX_ATTEMPTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
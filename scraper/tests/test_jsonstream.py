@@ -0,0 +1,104 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from scraper.jsonstream import iter_members
+from scraper.providers import aws
+
+
+def _offer(n_other: int = 20) -> dict:
+    products = {
+        "NOVA-IN": {"sku": "NOVA-IN", "attributes": {"model": "Nova Pro", "usagetype": "USE1-NovaPro-input-tokens"}},
+        "NOVA-OUT": {"sku": "NOVA-OUT", "attributes": {"model": "Nova Pro", "usagetype": "USE1-NovaPro-output-tokens"}},
+    }
+    products.update({
+        f"OTHER{i}": {"sku": f"OTHER{i}", "attributes": {"model": 'Titan "X" }', "usagetype": "x"}}
+        for i in range(n_other)
+    })
+
+    def term(usd: str) -> dict:
+        return {"T1": {"priceDimensions": {"D1": {
+            "description": "per 1K tokens", "pricePerUnit": {"USD": usd}}}}}
+
+    on_demand = {sku: term("0.0001") for sku in products}
+    on_demand["NOVA-IN"] = term("0.0008")
+    on_demand["NOVA-OUT"] = term("0.0032")
+    return {
+        "formatVersion": "v1.0",
+        "products": products,
+        "terms": {"OnDemand": on_demand, "Reserved": {"X": [1, 2, {"a": "]"}]}},
+    }
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestIterMembers(unittest.TestCase):
+    def test_yields_target_members_across_chunk_boundaries(self):
+        doc = _offer()
+        text = json.dumps(doc, indent=1)
+        for size in (1, 7, 4096):
+            with self.subTest(size=size):
+                members = list(iter_members(_chunks(text, size), [("products",), ("terms", "OnDemand")]))
+                self.assertEqual({k: v for p, k, v in members if p == ("products",)}, doc["products"])
+                self.assertEqual(
+                    {k: v for p, k, v in members if p == ("terms", "OnDemand")}, doc["terms"]["OnDemand"],
+                )
+
+    def test_want_skips_without_decoding(self):
+        text = json.dumps({"a": {"keep": 123456, "drop": "{not json"}, "b": 1})
+        members = list(iter_members(_chunks(text, 3), [("a",)], want=lambda _, key: key == "keep"))
+        # チャンク境界で途切れた数値も読み足してからデコードする
+        self.assertEqual(members, [(("a",), "keep", 123456)])
+
+    def test_number_split_at_every_position(self):
+        text = '{"p": {"a": 1.25, "b": -1.5e-07, "c": 0, "d": 12E+3, "e": true}}'
+        expected = json.loads(text)["p"]
+        for cut in range(1, len(text)):
+            with self.subTest(cut=cut):
+                members = list(iter_members([text[:cut], text[cut:]], [("p",)]))
+                self.assertEqual({k: v for _, k, v in members}, expected)
+
+
+class TestAwsOffer(unittest.TestCase):
+    def test_indexes_only_matching_skus(self):
+        index = aws._parse_offer(_chunks(json.dumps(_offer()), 64))
+        rows = index.prices("Amazon Nova Pro")
+        self.assertEqual({r.usage_type for r in rows}, {"use1-novapro-input-tokens", "use1-novapro-output-tokens"})
+        self.assertEqual(index.prices("Amazon Nova Micro"), [])
+        self.assertEqual(aws._select_prices("Amazon Nova Pro", rows), (0.8, 3.2))
+
+    def test_overlapping_keywords_match_every_model(self):
+        index = aws._SkuIndex({"Nova": ["nova"], "Nova Pro": ["nova pro"], "Micro": ["micro"]})
+        self.assertTrue(index.add_product("S1", {"attributes": {"model": "Nova Pro", "usagetype": "x-input-tokens"}}))
+        self.assertFalse(index.add_product("S2", {"attributes": {"model": "Titan"}}))
+        index.add_terms("S1", {"T": {"priceDimensions": {"D": {"pricePerUnit": {"USD": "0.001"}}}}})
+        self.assertEqual((len(index.prices("Nova")), len(index.prices("Nova Pro"))), (1, 1))
+        self.assertEqual(index.prices("Micro"), [])
+
+    def test_skips_download_when_offer_version_unchanged(self):
+        index = aws._parse_offer([json.dumps(_offer())])
+        with tempfile.TemporaryDirectory() as tmp:
+            aws.configure_offer_state(Path(tmp) / "aws_offer.json")
+            try:
+                with patch("scraper.providers.aws._locate_regional_offer") as locate, \
+                     patch("scraper.providers.aws._fetch_offer", return_value=index) as fetch:
+                    locate.return_value = ("https://x/v1/index.json", "/v1/us-east-1/index.json", "2025-01-01")
+                    first = aws._fetch_prices()
+                    self.assertEqual(aws._fetch_prices(), first)
+                    self.assertEqual(fetch.call_count, 1)
+
+                    locate.return_value = ("https://x/v2/index.json", "/v2/us-east-1/index.json", "2025-02-01")
+                    aws._fetch_prices()
+                    fetch.assert_called_with("https://x/v2/index.json")
+                    self.assertEqual(fetch.call_count, 2)
+            finally:
+                aws.configure_offer_state(None)
+        self.assertEqual(first["Amazon Nova Pro"], (0.8, 3.2))
+
+
+if __name__ == "__main__":
+    unittest.main()
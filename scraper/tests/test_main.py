@@ -0,0 +1,252 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from scraper import main as scraper_main
+from scraper.manifest import configure_manifest
+from scraper.models import ApiModel, PricingData
+
+
+def _api(provider: str, name: str, status: str = "success", scraped_at: str | None = None) -> ApiModel:
+    return ApiModel(
+        provider=provider, name=name, tag="", cls="", price_in=1, price_out=2,
+        sub_ja="", sub_en="", scrape_status=status, scraped_at=scraped_at,
+    )
+
+
+class TestScrapeAll(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        logging.disable(logging.NOTSET)
+
+    def test_concurrent_order_and_isolation(self):
+        """並行実行でも定義順に結果が並び、クラッシュは他に波及しないこと。"""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def make(label: str, delay: float, crash: bool = False):
+            def fn(existing):
+                nonlocal running, peak
+                with lock:
+                    running += 1
+                    peak = max(peak, running)
+                time.sleep(delay)
+                with lock:
+                    running -= 1
+                if crash:
+                    raise RuntimeError("boom")
+                return [label]
+            return fn
+
+        api = [(make("a", 0.05), "A"), (make("b", 0.0, crash=True), "B"), (make("c", 0.01), "C")]
+        tools = [(make("x", 0.0), "X"), (make("y", 0.03), "Y")]
+        with patch.object(scraper_main, "_API_SCRAPERS", api), \
+             patch.object(scraper_main, "_TOOL_SCRAPERS", tools):
+            api_models, sub_tools = scraper_main._scrape_all(None, None, concurrency=3)
+
+        self.assertEqual(api_models, ["a", "c"])
+        self.assertEqual(sub_tools, ["x", "y"])
+        self.assertLessEqual(peak, 3)
+        self.assertGreater(peak, 1)
+
+
+class TestSelectiveScrape(unittest.TestCase):
+    NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        logging.disable(logging.NOTSET)
+
+    def test_every_scraper_owns_rows(self):
+        self.assertEqual(sorted(scraper_main._SCRAPER_ROWS), sorted(scraper_main._scraper_names()))
+        self.assertEqual(scraper_main._SCRAPER_ROWS["google"], ("Google AI", "Vertex AI"))
+        self.assertEqual(scraper_main._SCRAPER_ROWS["jetbrains"], ("JetBrains AI", "Junie (JetBrains)"))
+        self.assertEqual(scraper_main._SCRAPER_ROWS["aws"], ("AWS",))
+
+    def test_staleness(self):
+        fresh = (self.NOW - timedelta(hours=2)).isoformat()
+        old = (self.NOW - timedelta(days=2)).isoformat()
+        day = timedelta(hours=24)
+        self.assertFalse(scraper_main._is_stale([_api("X", "a", scraped_at=fresh), _api("X", "b", "manual")], day, self.NOW))
+        self.assertTrue(scraper_main._is_stale([_api("X", "a", scraped_at=old)], day, self.NOW))
+        self.assertTrue(scraper_main._is_stale([_api("X", "a", "fallback", scraped_at=fresh)], day, self.NOW))
+        self.assertTrue(scraper_main._is_stale([], day, self.NOW))
+
+    def test_stale_rows_count_the_last_run(self):
+        old = (self.NOW - timedelta(days=2)).isoformat()
+        day = timedelta(hours=24)
+        rows = [_api("X", "a", scraped_at=old), _api("X", "b", scraped_at=None)]
+        self.assertTrue(scraper_main._is_stale(rows, day, self.NOW))
+        self.assertFalse(scraper_main._is_stale(rows, day, self.NOW, self.NOW - timedelta(hours=1)))
+        self.assertTrue(scraper_main._is_stale(rows, day, self.NOW, self.NOW - timedelta(days=3)))
+
+    def test_checked_record_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "scraper_checked.json"
+            self.assertEqual(scraper_main._load_checked(path), {})
+            scraper_main._save_checked(path, {"aws": self.NOW})
+            self.assertEqual(scraper_main._load_checked(path), {"aws": self.NOW})
+            path.write_text("[1]", encoding="utf-8")
+            self.assertEqual(scraper_main._load_checked(path), {})
+
+    def test_scraped_at_moves_only_when_the_row_changes(self):
+        then = "2026-01-01T00:00:00+00:00"
+        existing = [
+            _api("X", "same", scraped_at=then),
+            _api("X", "price", scraped_at=then),
+            _api("X", "recovered", "fallback", scraped_at=then),
+            _api("X", "failed", scraped_at=then),
+        ]
+        rows = [
+            _api("X", "same").model_copy(update={"price_in": 1.0000000001}),
+            _api("X", "price").model_copy(update={"price_in": 1.5}),
+            _api("X", "recovered"),
+            _api("X", "failed", "fallback"),
+            _api("X", "new"),
+        ]
+        scraper_main._stamp_scraped_at(rows, existing, self.NOW)
+        now = self.NOW.isoformat(timespec="seconds")
+        self.assertEqual([r.scraped_at for r in rows], [then, now, now, then, now])
+
+    def test_select(self):
+        fresh = (self.NOW - timedelta(hours=1)).isoformat()
+        existing = PricingData(
+            generated_at="2026-03-01", jpy_rate=150, jpy_rate_date="2026-03-01",
+            api_models=[_api("Anthropic", "a", scraped_at=fresh), _api("OpenAI", "o", "fallback")],
+            sub_tools=[],
+        )
+        select = scraper_main._select_scrapers
+        self.assertEqual(select(existing, ["anthropic", "aws"], None, None, self.NOW), {"anthropic", "aws"})
+        stale = select(existing, None, ["cursor"], timedelta(hours=24), self.NOW)
+        self.assertIn("openai", stale)
+        self.assertIn("aws", stale)             # 既存の行なし
+        self.assertNotIn("anthropic", stale)
+        self.assertNotIn("cursor", stale)
+        # 値が変わらず scraped_at が古くても、最近実行していれば再取得しない
+        existing.api_models[0].scraped_at = (self.NOW - timedelta(days=5)).isoformat()
+        self.assertIn("anthropic", select(existing, None, None, timedelta(hours=24), self.NOW))
+        checked = {"anthropic": self.NOW - timedelta(hours=1)}
+        self.assertNotIn("anthropic", select(existing, None, None, timedelta(hours=24), self.NOW, checked))
+
+    def test_skipped_rows_kept_in_place_and_success_stamped(self):
+        def anthropic(existing):
+            return [_api("Anthropic", "a"), _api("Anthropic", "b", "fallback")]
+        anthropic.__module__ = "scraper.providers.anthropic"
+
+        def openai(existing):
+            raise AssertionError("skipped scraper must not run")
+        openai.__module__ = "scraper.providers.openai"
+
+        existing = [_api("Anthropic", "b", scraped_at="2026-01-01T00:00:00+00:00"), _api("OpenAI", "o")]
+        with patch.object(scraper_main, "_API_SCRAPERS", [(openai, "OpenAI"), (anthropic, "Anthropic")]), \
+             patch.object(scraper_main, "_TOOL_SCRAPERS", []):
+            api_models, _ = scraper_main._scrape_all(existing, None, selected={"anthropic"})
+
+        self.assertEqual([m.name for m in api_models], ["o", "a", "b"])
+        self.assertIsNotNone(api_models[1].scraped_at)
+        self.assertEqual(api_models[2].scraped_at, "2026-01-01T00:00:00+00:00")
+
+    def test_unknown_scraper_name_rejected(self):
+        self.addCleanup(configure_manifest, None)
+        with self.assertRaises(SystemExit):
+            scraper_main.main(["--only", "anthropic,nope"])
+
+
+
+class TestWriteOutput(unittest.TestCase):
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.web = self.dir / "web" / "pricing.json"
+        self.web.parent.mkdir()
+        patcher = patch.object(scraper_main, "_WEB_DATA_PATH", self.web)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _data(self, price_in: float) -> PricingData:
+        model = _api("Anthropic", "Claude").model_copy(update={"price_in": price_in})
+        return PricingData(
+            generated_at="2026-01-01", jpy_rate=150.0, jpy_rate_date="2026-01-01",
+            api_models=[model], sub_tools=[],
+        )
+
+    def test_writes_only_when_changed(self):
+        output = self.dir / "out" / "pricing.json"
+        self.assertTrue(scraper_main._write_output(self._data(1.0000000001), output))
+        self.assertEqual(output.read_bytes(), self.web.read_bytes())
+        loaded = scraper_main._load_existing(output)
+        assert loaded is not None
+        self.assertEqual(loaded.api_models[0].price_in, 1.0)
+
+        mtime = output.stat().st_mtime_ns
+        self.assertFalse(scraper_main._write_output(self._data(1.0), output))
+        self.assertEqual(output.stat().st_mtime_ns, mtime)
+
+        self.assertTrue(scraper_main._write_output(self._data(2.0), output))
+        self.assertEqual(scraper_main._load_existing(self.web).api_models[0].price_in, 2.0)  # type: ignore[union-attr]
+        self.assertEqual(list(output.parent.glob("*.tmp")), [])
+
+    def test_float_format_in_the_price_range(self):
+        output = self.dir / "pricing.json"
+        models = [
+            _api("Anthropic", f"M{i}").model_copy(update={"price_in": price, "price_out": price})
+            for i, price in enumerate([0.001, 0.0375, 0.1, 1.25, 3.0, 168.0, 2000.0, 0.034999999999])
+        ]
+        data = PricingData(
+            generated_at="2026-01-01", jpy_rate=150.25, jpy_rate_date="2026-01-01",
+            api_models=models, sub_tools=[],
+        )
+        scraper_main._write_output(data, output)
+        legacy = json.dumps(data.model_dump(), ensure_ascii=False, indent=2).encode("utf-8")
+        self.assertEqual(output.read_bytes(), legacy)
+        self.assertIn(b'"price_in": 0.035,', legacy)
+
+        # 1e-4 未満は json.dumps と表記が異なる（値は同じ）
+        scraper_main._write_output(self._data(1e-05), output)
+        self.assertIn(b'"price_in": 0.00001,', output.read_bytes())
+        self.assertEqual(scraper_main._load_existing(output).api_models[0].price_in, 1e-05)  # type: ignore[union-attr]
+
+    def test_output_that_is_the_web_copy_is_written_once(self):
+        with patch("scraper.main.os.replace", side_effect=os.replace) as replace:
+            self.assertTrue(scraper_main._write_output(self._data(1.0), self.web))
+        self.assertEqual(replace.call_count, 1)
+
+    def test_atomic_write_syncs_and_cleans_up(self):
+        path = self.dir / "pricing.json"
+        path.write_bytes(b"old")
+        path.chmod(0o640)
+        with patch("scraper.main.os.fsync", side_effect=os.fsync) as fsync:
+            self.assertTrue(scraper_main._write_atomic(path, b"new"))
+        fsync.assert_called_once()
+        self.assertEqual((path.read_bytes(), path.stat().st_mode & 0o777), (b"new", 0o640))
+
+        with patch("scraper.main.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                scraper_main._write_atomic(path, b"newer")
+        self.assertEqual(path.read_bytes(), b"new")
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["pricing.json", "web"])
+
+
+if __name__ == "__main__":
+    unittest.main()
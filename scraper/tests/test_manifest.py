@@ -0,0 +1,79 @@
+import dataclasses
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from scraper import browser
+from scraper.manifest import ExtractionManifest, configure_manifest, module_code_hash, scraper_scope
+from scraper.tools import cursor
+
+_PATTERNS = [r"pro[^$]*?\$([\d.]+)"]
+
+
+class TestExtractionManifest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "pricing.manifest.json"
+
+    def tearDown(self) -> None:
+        configure_manifest(None)
+        self.tmp.cleanup()
+
+    def _run(
+        self, html: str, module: str = "scraper.tools.cursor", url: str = "https://cursor.example/pricing",
+    ) -> tuple[float | None, int]:
+        """マニフェストを読み込んで 1 回抽出し、(結果, 正規表現の実行回数) を返す。"""
+        manifest = ExtractionManifest.load(self.path)
+        configure_manifest(manifest)
+        page = browser.PageText(html, url)
+        with scraper_scope(module), \
+             patch("scraper.browser._search_price", wraps=browser._search_price) as search:
+            value = browser.extract_price(page, _PATTERNS)
+        manifest.save(self.path)
+        return value, search.call_count
+
+    def test_reuses_results_for_unchanged_page(self):
+        self.assertEqual(self._run("<p>Pro $20</p>"), (20.0, 1))
+        # 空白や nonce の違いは同一ページとみなす
+        self.assertEqual(self._run('<p nonce="abc">Pro   $20</p>'), (20.0, 0))
+
+    def test_recomputes_when_page_or_code_changes(self):
+        self._run("<p>Pro $20</p>")
+        self.assertEqual(self._run("<p>Pro $25</p>"), (25.0, 1))
+        self.assertEqual(self._run("<p>Pro $25</p>", module="scraper.tools.windsurf"), (25.0, 1))
+
+    def test_unvisited_urls_are_dropped(self):
+        self._run("<p>Pro $20</p>", url="https://old.example/pricing")
+        self._run("<p>Pro $20</p>")
+        pages = json.loads(self.path.read_text(encoding="utf-8"))["pages"]
+        self.assertEqual(list(pages), ["https://cursor.example/pricing"])
+
+    def test_code_hash_covers_the_spec(self):
+        """パターン・フォールバック値は仕様にあるので、仕様が変われば別のハッシュになること。"""
+        before = module_code_hash.__wrapped__("scraper.tools.cursor")
+        self.assertEqual(before, module_code_hash("scraper.tools.cursor"))
+        edited = dataclasses.replace(cursor._SPEC, source_digest="edited")
+        with patch.object(cursor, "_SPEC", edited):
+            self.assertNotEqual(module_code_hash.__wrapped__("scraper.tools.cursor"), before)
+
+    def test_code_hash_covers_the_extractor(self):
+        """抽出処理（browser.py 等）のソースが変われば別のハッシュになること。"""
+        before = module_code_hash.__wrapped__("scraper.tools.cursor")
+        original = Path.read_bytes
+
+        def read_bytes(path: Path) -> bytes:
+            data = original(path)
+            return data + b"# edited" if path.name == "structured.py" else data
+
+        with patch.object(Path, "read_bytes", read_bytes):
+            self.assertNotEqual(module_code_hash.__wrapped__("scraper.tools.cursor"), before)
+
+    def test_plain_strings_bypass_manifest(self):
+        configure_manifest(ExtractionManifest())
+        self.assertEqual(browser.extract_price("Pro $20", _PATTERNS), 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
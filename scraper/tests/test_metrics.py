@@ -0,0 +1,46 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scraper import metrics
+from scraper.browser import PageText, extract_price
+
+
+class TestMetrics(unittest.TestCase):
+    def test_records_follow_the_scraper_into_worker_threads(self):
+        def work() -> None:
+            metrics.record(bytes_downloaded=100, pages=1)
+            page = PageText("<p>Pro $20 / month</p>", "https://m.example")
+            extract_price(page, [r"team[^$]*?\$([\d]+)", r"pro[^$]*?\$([\d]+)"])
+
+        async def run() -> metrics.ScraperMetrics:
+            with metrics.measure("example", "Example") as stats:
+                await asyncio.to_thread(work)
+            return stats
+
+        metrics.record(pages=1)     # 計測外では何もしない
+        stats = asyncio.run(run())
+        self.assertEqual((stats.bytes_downloaded, stats.pages, stats.patterns_tried), (100, 1, 2))
+        self.assertGreater(stats.extract_cpu_s, 0)
+        self.assertGreater(stats.wall_s, 0)
+        self.assertIs(metrics.scraper_metrics()["example"], stats)
+
+    def test_report(self):
+        runs = [
+            metrics.ScraperMetrics("a", "A", wall_s=1.5, bytes_downloaded=10),
+            metrics.ScraperMetrics("b", "B", wall_s=0.5, bytes_downloaded=5, rows=3),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "out" / "run.json"
+            metrics.write_report(path, runs, wall_s=1.6)
+            report = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(report["wall_s"], 1.6)
+        self.assertEqual(report["totals"]["wall_s"], 2.0)
+        self.assertEqual(report["totals"]["bytes_downloaded"], 15)
+        self.assertEqual([s["name"] for s in report["scrapers"]], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
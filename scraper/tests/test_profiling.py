@@ -0,0 +1,51 @@
+import logging
+import pstats
+import tempfile
+import unittest
+from pathlib import Path
+
+from scraper import profiling
+
+
+def _work(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / "profile"
+
+    def tearDown(self) -> None:
+        profiling.configure_profiling(None)
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def test_disabled_runs_without_output(self):
+        self.assertEqual(profiling.run_profiled("work", _work, 10), 285)
+        self.assertIsNone(profiling.trace_path("https://example.com/pricing"))
+        self.assertFalse(self.dir.exists())
+
+    def test_dump_per_scraper(self):
+        profiling.configure_profiling(self.dir)
+        self.assertEqual(profiling.run_profiled("work", _work, 10), 285)
+        stats = pstats.Stats(str(self.dir / "work.prof"))
+        self.assertTrue(any(func[2] == "_work" for func in stats.stats))  # type: ignore[attr-defined]
+        self.assertIn("_work", (self.dir / "work.txt").read_text(encoding="utf-8"))
+        self.assertIsNone(profiling.trace_path("https://example.com/pricing"))
+
+    def test_trace_paths_do_not_collide(self):
+        profiling.configure_profiling(self.dir, trace=True)
+        first = profiling.trace_path("https://example.com/api/pricing?x=1")
+        assert first is not None
+        self.assertEqual(first, self.dir / "traces" / "example.com_api_pricing.zip")
+        first.write_bytes(b"")
+        self.assertEqual(
+            profiling.trace_path("https://example.com/api/pricing"),
+            self.dir / "traces" / "example.com_api_pricing-2.zip",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import gzip
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from scraper import http_client, replay
+
+
+def _origin(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/old":
+        return httpx.Response(301, headers={"Location": "https://example.com/rates"})
+    if request.url.path == "/rates":
+        return httpx.Response(
+            200, headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+            content=gzip.compress(b'{"rates": {"JPY": 150.0}}'),
+        )
+    return httpx.Response(404)
+
+
+def _offline(request: httpx.Request) -> httpx.Response:
+    raise AssertionError(f"network access during replay: {request.url}")
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        replay.configure_replay(None)
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _get(self, url: str, origin) -> httpx.Response:
+        with patch.object(http_client.httpx, "HTTPTransport", lambda **kw: httpx.MockTransport(origin)):
+            return http_client.get(url)
+
+    def test_http_round_trip_through_shared_client(self):
+        replay.configure_replay(self.dir, "record")
+        recorded = self._get("https://example.com/old", _origin)
+        self.assertEqual(recorded.json(), {"rates": {"JPY": 150.0}})
+
+        replay.configure_replay(self.dir, "replay")
+        replayed = self._get("https://example.com/old", _offline)
+        self.assertEqual(replayed.json(), recorded.json())
+        self.assertEqual(str(replayed.url), "https://example.com/rates")
+        with self.assertRaises(httpx.ConnectError):
+            self._get("https://example.com/unknown", _offline)
+
+    def test_repeated_requests_replay_in_order(self):
+        recording = replay.HttpRecording(self.dir, load=False)
+        responses = iter([httpx.Response(503), httpx.Response(200, text="ok")])
+        client = httpx.Client(transport=replay.RecordingTransport(
+            httpx.MockTransport(lambda request: next(responses)), recording,
+        ))
+        self.assertEqual([client.get("https://example.com/").status_code for _ in range(2)], [503, 200])
+
+        client = httpx.Client(transport=replay.ReplayTransport(replay.HttpRecording(self.dir)))
+        self.assertEqual(
+            [client.get("https://example.com/").status_code for _ in range(3)], [503, 200, 200],
+        )
+
+    def test_har_paths(self):
+        self.assertIsNone(replay.har_path("https://example.com/pricing"))
+        replay.configure_replay(self.dir, "record")
+        self.assertEqual(
+            replay.har_path("https://example.com/api/pricing?x=1"),
+            self.dir / "pages" / "example.com_api_pricing.har",
+        )
+        replay.configure_replay(self.dir, "replay")
+        with self.assertRaises(LookupError):
+            replay.har_path("https://example.com/pricing")
+
+
+if __name__ == "__main__":
+    unittest.main()
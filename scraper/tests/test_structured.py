@@ -0,0 +1,97 @@
+import logging
+import unittest
+
+from scraper import browser, engine
+from scraper.structured import StructuredIndex, embedded_json, normalize_key
+
+_NEXT_PAGE = """
+<html><head>
+<script type="application/ld+json">{"@type": "Product", "offers": [
+  {"@type": "Offer", "name": "Pro", "price": "20.00", "priceCurrency": "USD"}]}</script>
+<script id="__NEXT_DATA__" type="application/json">{"props": {"pageProps": {"models": [
+  {"name": "GPT-5 Mini", "pricing": {"input": "$0.25", "cachedInput": 0.025, "output": 2}},
+  {"model": "gpt-5", "inputTokens": 400000, "input_price": 1.25, "output_price": 10}
+]}}}</script>
+<script>window.broken = {</script>
+</head><body><p>GPT-5 input $9.99 output $99.99</p></body></html>
+"""
+
+_COPILOT_PAGE = """
+<script id="__NEXT_DATA__" type="application/json">{"plans": [
+  {"name": "Pro", "price": 10}, {"name": "Pro+", "price": 39}]}</script>
+<div class="plan"><h3>Pro</h3><p>$10 / month</p></div>
+<div class="plan"><h3>Pro+</h3><p>$39 / month</p></div>
+"""
+
+_CURSOR_PAGE = """
+<script id="__NEXT_DATA__" type="application/json">{"plans": [
+  {"name": "Pro", "annualPrice": 192, "monthlyPrice": 20},
+  {"name": "Ultra", "originalPrice": 250, "price": 200}]}</script>
+"""
+
+
+def _fetch(html: str):
+    return lambda url, **kwargs: browser.PageText(html, url)
+
+
+class TestStructuredIndex(unittest.TestCase):
+    def test_embedded_json_and_lookup(self):
+        self.assertEqual(len(embedded_json(_NEXT_PAGE)), 2)
+        index = StructuredIndex.from_html(_NEXT_PAGE)
+        self.assertEqual(normalize_key("GPT-5 Mini"), normalize_key("gpt-5-mini"))
+        self.assertEqual(next(index.candidates("gpt-5-mini", "input")), 0.25)
+        self.assertEqual(next(index.candidates("GPT-5 Mini", "output")), 2.0)
+        self.assertEqual(next(index.candidates("Pro", "price")), 20.0)
+        self.assertEqual(list(index.candidates("o3", "input")), [])
+        self.assertNotEqual(normalize_key("Pro+"), normalize_key("Pro"))
+
+    def test_generic_field_prefers_exact_then_monthly_keys(self):
+        index = StructuredIndex.from_html(_CURSOR_PAGE)
+        self.assertEqual(list(index.candidates("Pro", "price")), [20.0])
+        self.assertEqual(list(index.candidates("Ultra", "price")), [200.0])
+
+    def test_ambiguous_name_is_skipped(self):
+        index = StructuredIndex([
+            {"name": "Pro", "price": 10}, {"name": "Pro", "price": 100},
+            {"name": "Team", "price": 30}, {"name": "Team", "price": 30},
+        ])
+        self.assertEqual(list(index.candidates("Pro", "price")), [])
+        self.assertEqual(list(index.candidates("Team", "price")), [30.0])
+
+    def test_structured_tier_answers_before_regex(self):
+        page = browser.PageText(_NEXT_PAGE, "https://openai.example/pricing")
+        patterns = [r"gpt-5[^$]*?input[^$]*?\$([\d.]+)"]
+        # inputTokens は範囲外なので飛ばし、input_price を使う
+        self.assertEqual(browser.extract_price(page, patterns, model="GPT-5", field="input"), 1.25)
+        self.assertEqual(browser.extract_price(page, patterns, model="o3", field="input"), 9.99)
+        self.assertIsNone(browser.extract_price(page, [r"o4[^$]*?\$([\d.]+)"], model="o4", field="input"))
+        tiers = browser.extraction_tiers()
+        self.assertEqual(tiers[(page.url, "GPT-5", "input")], "structured")
+        self.assertEqual(tiers[(page.url, "o3", "input")], "regex")
+        self.assertEqual(tiers[(page.url, "o4", "input")], "none")
+
+
+class TestStructuredPlans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        logging.disable(logging.NOTSET)
+
+    def test_plus_plan_is_not_the_base_plan(self):
+        spec = engine.load_spec("github_copilot")
+        tools = {t.name: t for t in engine.scrape_plans(spec, fetch=_fetch(_COPILOT_PAGE))}
+        self.assertEqual((tools["Pro"].monthly, tools["Pro"].scrape_status), (10.0, "success"))
+        self.assertEqual((tools["Pro+"].monthly, tools["Pro+"].scrape_status), (39.0, "success"))
+
+    def test_monthly_price_over_annual(self):
+        spec = engine.load_spec("cursor")
+        tools = {t.name: t for t in engine.scrape_plans(spec, fetch=_fetch(_CURSOR_PAGE))}
+        self.assertEqual((tools["Pro"].monthly, tools["Pro"].scrape_status), (20.0, "success"))
+        self.assertEqual(tools["Ultra"].monthly, 200.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
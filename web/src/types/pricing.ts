@@ -12,6 +12,7 @@ export interface ApiModel {
   sub_ja: string
   sub_en: string
   scrape_status: ScrapeStatus
+  scraped_at?: string | null  // 抽出に成功した値・状態が最後に変わった日時 (ISO 8601)
 }
 
 export interface SubTool {
@@ -24,6 +25,7 @@ export interface SubTool {
   note_ja: string
   note_en: string
   scrape_status: ScrapeStatus
+  scraped_at?: string | null  // 抽出に成功した値・状態が最後に変わった日時 (ISO 8601)
 }
 
 export interface PricingData {